@@ -0,0 +1,126 @@
+"""Size/speed tradeoff of the parquet write settings.
+
+Writes the same synthetic table once per setting with `make_temp_parquet` and reports
+the artifact size, the write time (conversion plus hashing, as in `save`), the time to
+read it back whole, and the time to read one week of dates with a pushed-down filter.
+
+    python benchmarks/parquet_write.py --rows 2000000 --engine pyarrow
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from datashelf.core.hashing import make_temp_parquet
+from datashelf.core.parquet_options import validate_write_options
+
+SETTINGS = {
+    "default (snappy)": {},
+    "none": {"compression": "none"},
+    "lz4": {"compression": "lz4"},
+    "zstd": {"compression": "zstd"},
+    "zstd level 9": {"compression": "zstd", "compression_level": 9},
+    "gzip": {"compression": "gzip"},
+    "no dictionary": {"use_dictionary": False},
+    "no statistics": {"write_statistics": False},
+    "128k row groups": {"row_group_rows": 128_000},
+    "sorted by date": {"sort_by": ["date"], "row_group_rows": 128_000},
+    "sorted + zstd": {
+        "sort_by": ["date"],
+        "row_group_rows": 128_000,
+        "compression": "zstd",
+    },
+    "page index": {"write_page_index": True},
+}
+
+
+def make_data(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    return pd.DataFrame(
+        {
+            "date": pd.Timestamp("2024-01-01")
+            + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+            "user_id": rng.integers(0, 50_000, rows),
+            "country": pd.Series(
+                rng.choice(["US", "DE", "FR", "IN", "BR", "JP"], rows), dtype="string"
+            ),
+            "amount": rng.gamma(2.0, 30.0, rows).round(2),
+            "note": pd.Series(
+                rng.choice([f"note {i}" for i in range(500)], rows), dtype="string"
+            ),
+        }
+    )
+
+
+def run(rows: int, engine: str) -> list[dict]:
+    df = make_data(rows=rows)
+    week = [
+        ("date", ">=", pd.Timestamp("2024-06-01")),
+        ("date", "<", pd.Timestamp("2024-06-08")),
+    ]
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, overrides in SETTINGS.items():
+            try:
+                options = validate_write_options(options=overrides, engine=engine)
+            except ValueError as e:
+                results.append({"setting": label, "skipped": str(e)})
+                continue
+
+            path = Path(tmp) / f"{len(results)}.parquet"
+
+            start = time.perf_counter()
+            make_temp_parquet(data=df, output_path=path, engine=engine, write_options=options)
+            write_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            pd.read_parquet(path, engine=engine)
+            read_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            pd.read_parquet(path, engine=engine, filters=[week])
+            filtered_s = time.perf_counter() - start
+
+            results.append(
+                {
+                    "setting": label,
+                    "size_mb": path.stat().st_size / 1e6,
+                    "write_s": write_s,
+                    "read_s": read_s,
+                    "filtered_read_s": filtered_s,
+                }
+            )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--engine", choices=["pyarrow", "fastparquet"], default="pyarrow")
+    args = parser.parse_args()
+
+    print(f"{args.rows:,} rows, engine={args.engine}\n")
+    print(f"{'Setting':<18} {'Size MB':>8} {'Write s':>8} {'Read s':>8} {'Filter s':>9}")
+
+    for r in run(rows=args.rows, engine=args.engine):
+        if "skipped" in r:
+            print(f"{r['setting']:<18} skipped: {r['skipped']}")
+            continue
+
+        print(
+            f"{r['setting']:<18} {r['size_mb']:>8.2f} {r['write_s']:>8.3f} "
+            f"{r['read_s']:>8.3f} {r['filtered_read_s']:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
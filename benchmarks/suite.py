@@ -0,0 +1,316 @@
+"""Timings of save, load, checkout, ls, show and CLI startup at realistic scale.
+
+Every case runs on a fresh shelf in a temporary directory, repeated `--repeat` times,
+and the results are written as JSON together with the commit and library versions,
+so runs on two commits can be compared:
+
+    python benchmarks/suite.py --output before.json
+    git checkout my-branch
+    python benchmarks/suite.py --output after.json --compare before.json
+
+The defaults finish in about a minute. For release checks, go up to multi-GB tables
+and 1M-entry catalogs (generated tables are kept in --data-dir between runs):
+
+    python benchmarks/suite.py --sizes 1 100 2000 --shapes narrow wide \\
+        --kinds numeric strings --catalog-entries 1000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+import datashelf
+from datashelf.init import init
+from synthetic import KINDS, SHAPES, make_catalog, table_path, write_table
+
+PACKAGE_ROOT = Path(datashelf.__file__).resolve().parent.parent
+CATALOG_BACKENDS = ["json", "sqlite"]
+
+
+def timed(fn: Callable[[], object], repeat: int, setup: Callable[[], None] | None = None) -> list[float]:
+    """Wall times of `repeat` calls to fn, each after an untimed call to setup."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    return times
+
+
+@contextlib.contextmanager
+def quiet():
+    """Discards what the datashelf functions print, which would otherwise dominate ls."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def silenced(fn: Callable[[], object]) -> Callable[[], None]:
+    def run():
+        with quiet():
+            fn()
+
+    return run
+
+
+def result(case: str, params: dict, times: list[float], **extra) -> dict:
+    return {
+        "case": case,
+        "params": params,
+        "times_s": times,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        **extra,
+    }
+
+
+def new_shelf(root: Path, **settings) -> datashelf.Shelf:
+    root.mkdir(parents=True, exist_ok=True)
+    with quiet():
+        init(custom_path=str(root))
+
+    if settings:
+        import yaml
+
+        config_path = root / ".datashelf" / "config.yaml"
+        content = yaml.safe_load(config_path.read_text())
+        content["config"].update(settings)
+        config_path.write_text(yaml.safe_dump(content, sort_keys=False))
+
+    return datashelf.open(root)
+
+
+def bench_data(args, tmp: Path) -> list[dict]:
+    """save, load (path and to_df) and checkout for every table size, shape and kind."""
+    results = []
+
+    for size_mb in args.sizes:
+        for shape in args.shapes:
+            for kind in args.kinds:
+                csv_path = write_table(
+                    path=table_path(data_dir=args.data_dir, size_mb=size_mb, shape=shape, kind=kind),
+                    size_mb=size_mb,
+                    shape=shape,
+                    kind=kind,
+                )
+                params = {
+                    "size_mb": size_mb,
+                    "shape": shape,
+                    "kind": kind,
+                    "stream": args.stream,
+                    "csv_bytes": csv_path.stat().st_size,
+                }
+                label = f"{shape}-{kind}-{size_mb:g}mb"
+                print(f"  {label}", file=sys.stderr)
+
+                shelves = iter(range(args.repeat + 1))
+
+                def save():
+                    with quiet():
+                        shelf.save(data=csv_path, name="data", message="", tag="raw", stream=args.stream)
+
+                def fresh_shelf():
+                    nonlocal shelf
+                    shelf = new_shelf(tmp / label / f"save-{next(shelves)}")
+
+                shelf = None
+                results.append(result("save", params, timed(save, args.repeat, setup=fresh_shelf)))
+
+                artifact = shelf.load("data")
+                params = {**params, "artifact_bytes": artifact.stat().st_size}
+
+                results.append(result("load_path", params, timed(lambda: shelf.load("data"), args.repeat)))
+                results.append(
+                    result("load_df", params, timed(lambda: shelf.load("data", to_df=True), args.repeat))
+                )
+
+                checkouts = iter(range(args.repeat))
+
+                def checkout():
+                    with quiet():
+                        shelf.checkout("data", dest=tmp / label / f"checkout-{next(checkouts)}.parquet")
+
+                results.append(result("checkout", params, timed(checkout, args.repeat)))
+
+    return results
+
+
+def bench_catalog(args, tmp: Path) -> list[dict]:
+    """ls and show on synthetic catalogs, with a cold (newly opened) and warm shelf."""
+    results = []
+
+    for entries in args.catalog_entries:
+        for backend in args.backends:
+            print(f"  {backend} catalog, {entries:,} entries", file=sys.stderr)
+            root = tmp / f"catalog-{backend}-{entries}"
+            shelf = new_shelf(root)
+            hashes = make_catalog(datashelf_path=shelf.path, entries=entries)
+
+            if backend == "sqlite":
+                shelf = new_shelf(root, catalog_backend="sqlite")
+                shelf.catalog  # one-off migration from metadata.json, not timed
+
+            params = {"entries": entries, "backend": backend}
+            lookup = hashes[len(hashes) // 2][:12]
+
+            results.append(
+                result("ls_cold", params, timed(silenced(lambda: datashelf.open(root).ls()), args.repeat))
+            )
+            results.append(result("ls_warm", params, timed(silenced(shelf.ls), args.repeat)))
+            results.append(
+                result(
+                    "show_cold",
+                    params,
+                    timed(silenced(lambda: datashelf.open(root).show(lookup)), args.repeat),
+                )
+            )
+            results.append(result("show_warm", params, timed(silenced(lambda: shelf.show(lookup)), args.repeat)))
+            results.append(
+                result("cli_list", params, timed(lambda: run_cli(root, "list"), args.repeat))
+            )
+
+    return results
+
+
+def bench_cli_startup(args, tmp: Path) -> list[dict]:
+    """Process start to exit for commands that do little work, i.e. mostly imports."""
+    root = tmp / "cli"
+    shelf = new_shelf(root)
+    pd.DataFrame({"id": [1, 2, 3]}).to_csv(root / "small.csv", index=False)
+    with quiet():
+        shelf.save(data=root / "small.csv", name="small", message="", tag="raw")
+
+    return [
+        result(
+            "cli_startup",
+            {"command": " ".join(command)},
+            timed(lambda: run_cli(root, *command), args.repeat),
+        )
+        for command in [["--help"], ["list"], ["show", "small"], ["load", "small"]]
+    ]
+
+
+def run_cli(cwd: Path, *args: str) -> None:
+    env = {**os.environ, "PYTHONPATH": str(PACKAGE_ROOT)}
+    subprocess.run(
+        [sys.executable, "-m", "datashelf.cli", *args],
+        cwd=cwd,
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def environment() -> dict:
+    def git(*args: str) -> str | None:
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    versions = {}
+    for module in ["pandas", "numpy", "pyarrow", "fastparquet"]:
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": versions,
+    }
+
+
+def compare(baseline: dict, current: dict) -> None:
+    """Prints the median time of each case in current relative to baseline."""
+
+    def key(r: dict) -> str:
+        params = {k: v for k, v in r["params"].items() if not k.endswith("_bytes")}
+        return f"{r['case']} {json.dumps(params, sort_keys=True)}"
+
+    before = {key(r): r["median_s"] for r in baseline["results"]}
+
+    print(f"\nvs {(baseline['environment'].get('commit') or '?')[:10]}")
+    print(f"{'Case':<70} {'Before s':>9} {'After s':>9} {'Change':>8}")
+
+    for r in current["results"]:
+        k = key(r)
+        if k not in before:
+            continue
+
+        change = r["median_s"] / before[k] - 1 if before[k] else float("nan")
+        print(f"{k:<70} {before[k]:>9.4f} {r['median_s']:>9.4f} {change:>+8.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 20], help="Table sizes in MB.")
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=["narrow"])
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=["mixed"])
+    parser.add_argument("--stream", action="store_true", help="Save CSVs in streaming mode.")
+    parser.add_argument("--catalog-entries", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--backends", nargs="+", choices=CATALOG_BACKENDS, default=CATALOG_BACKENDS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--only", nargs="+", choices=["data", "catalog", "cli"], default=["data", "catalog", "cli"]
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "datashelf-bench-data",
+        help="Where generated tables are kept between runs.",
+    )
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file.")
+    parser.add_argument("--compare", type=Path, help="Results JSON of an earlier run to compare against.")
+    args = parser.parse_args()
+
+    benches = {"data": bench_data, "catalog": bench_catalog, "cli": bench_cli_startup}
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.only:
+            print(f"{name}:", file=sys.stderr)
+            results.extend(benches[name](args, Path(tmp)))
+
+    report = {
+        "environment": environment(),
+        "args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        "results": results,
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        compare(baseline=json.loads(args.compare.read_text()), current=report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Synthetic tables and catalogs for the benchmarks.
+
+Tables come in two shapes (narrow: 4 columns, wide: 100 columns) and three kinds
+(numeric, strings, mixed) and are written as CSV up to a target size, so the same
+generator covers a 1 MB smoke run and a multi-GB save. Catalogs are written straight
+into `metadata.json` with fake entries, which makes a 1M-entry catalog take seconds
+instead of a million saves.
+
+Everything is seeded, so the same arguments always produce the same bytes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+Shape = Literal["narrow", "wide"]
+Kind = Literal["numeric", "strings", "mixed"]
+
+SHAPES = {"narrow": 4, "wide": 100}
+KINDS = ["numeric", "strings", "mixed"]
+# The tags allowed by a newly initialized shelf
+TAGS = ["raw", "external", "intermediate", "processed"]
+
+# Rows generated per append when writing a table to a target size
+CHUNK_ROWS = 50_000
+
+WORDS = [f"{w}{i}" for w in ["alpha", "bravo", "delta", "omega", "sigma"] for i in range(200)]
+
+
+def make_table(rows: int, shape: Shape = "narrow", kind: Kind = "mixed", seed: int = 0) -> pd.DataFrame:
+    """A DataFrame with the column count of `shape` and column types of `kind`."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+
+    for i in range(SHAPES[shape]):
+        column_kind = kind if kind != "mixed" else ("numeric", "strings")[i % 2]
+
+        if column_kind == "numeric" and i % 3 == 0:
+            columns[f"int_{i}"] = rng.integers(0, 1_000_000, rows)
+        elif column_kind == "numeric":
+            columns[f"float_{i}"] = rng.normal(0, 1_000, rows).round(3)
+        else:
+            words = rng.choice(WORDS, size=(rows, 1 + i % 4))
+            columns[f"text_{i}"] = [" ".join(row) for row in words]
+
+    return pd.DataFrame(columns)
+
+
+def write_table(
+    path: Path,
+    size_mb: float,
+    shape: Shape = "narrow",
+    kind: Kind = "mixed",
+    seed: int = 0,
+) -> Path:
+    """
+    Writes a CSV of about size_mb megabytes (never less) by appending seeded chunks.
+    An existing file is reused, so pass a path that encodes the arguments.
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    target = size_mb * 1e6
+    tmp = path.with_suffix(".partial")
+
+    with open(tmp, "w", newline="") as f:
+        chunk = 0
+        row_bytes = None
+        while f.tell() < target:
+            df = make_table(rows=CHUNK_ROWS, shape=shape, kind=kind, seed=seed + chunk)
+
+            # Trim the chunk to what is still missing, so small targets are not
+            # overshot by a whole chunk
+            if row_bytes is None:
+                row_bytes = len(df.head(1_000).to_csv(index=False, header=False)) / min(len(df), 1_000)
+            df = df.head(max(1, int((target - f.tell()) / row_bytes) + 1))
+
+            df.to_csv(f, index=False, header=chunk == 0)
+            chunk += 1
+
+    tmp.rename(path)
+    return path
+
+
+def table_path(data_dir: Path, size_mb: float, shape: Shape, kind: Kind, seed: int = 0) -> Path:
+    return Path(data_dir) / f"{shape}-{kind}-{size_mb:g}mb-seed{seed}.csv"
+
+
+def make_catalog(datashelf_path: Path, entries: int, seed: int = 0) -> list[str]:
+    """
+    Adds `entries` fake file entries to an initialized shelf's `metadata.json`, spread
+    over 1000 names (so names repeat, as with versioned datasets) and the TAGS. The
+    entries point at artifacts that do not exist, so only metadata commands work on them.
+
+    Returns:
+        list[str]: The file hashes added, in order.
+    """
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    metadata_path = Path(datashelf_path) / "metadata.json"
+    metadata = json.loads(metadata_path.read_text())
+
+    hashes = []
+    for i in range(entries):
+        file_hash = hashlib.sha256(f"{seed}-{i}".encode()).hexdigest()
+        hashes.append(file_hash)
+        metadata["files"].append(
+            {
+                "file_hash": file_hash,
+                "name": f"dataset_{i % 1000}_v{i // 1000}",
+                "stored_path": f"artifacts/{file_hash}.parquet",
+                "message": f"synthetic entry {i}",
+                "tag": TAGS[int(rng.integers(0, len(TAGS)))],
+                "datetime_added": (start + timedelta(seconds=i)).isoformat(),
+                "hash_algorithm": "sha256",
+            }
+        )
+
+    metadata_path.write_text(json.dumps(metadata))
+    return hashes
@@ -1,9 +1,43 @@
 from .init import init
-from .save import save
-from .inspect import ls, show
-from .load import load
-from .checkout import checkout
+from .save import save, save_many
+from .inspect import ls, show, schema, backfill_summaries
+from .load import load, head, cache_info, clear_cache
+from .checkout import checkout, checkout_many
+from .remote import push, pull
+from .maintenance import fsck, gc, migrate_layout
+from .shelf import Shelf, open_shelf as open
+from .core.profiling import profile, add_span_hook, remove_span_hook
+from .aio import AsyncShelf, asave, aload, acheckout, open_async
 
 __version__ = "0.1.2"
 
-__all__ = ["init", "save", "ls", "show", "load", "checkout"]
+__all__ = [
+    "init",
+    "save",
+    "save_many",
+    "ls",
+    "show",
+    "schema",
+    "backfill_summaries",
+    "load",
+    "head",
+    "cache_info",
+    "clear_cache",
+    "checkout",
+    "checkout_many",
+    "push",
+    "pull",
+    "fsck",
+    "gc",
+    "migrate_layout",
+    "Shelf",
+    "open",
+    "profile",
+    "add_span_hook",
+    "remove_span_hook",
+    "AsyncShelf",
+    "asave",
+    "aload",
+    "acheckout",
+    "open_async",
+]
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import functools
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+from datashelf.core.config import get_async_max_concurrency
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+    from concurrent.futures import ThreadPoolExecutor
+    from datashelf.checkout import CheckoutMode
+    from datashelf.core.parquet_options import ParquetWriteOptions
+    from datashelf.save import SaveItem, SaveResult
+    from datashelf.shelf import Shelf
+
+# One AsyncShelf per Shelf for the module-level coroutines, so they share its executor
+_ASYNC_SHELVES: dict[Path, "AsyncShelf"] = {}
+
+
+class AsyncShelf:
+    """
+    asyncio front end of a `Shelf`. Every call runs the blocking work (parsing, parquet
+    encoding and decoding, hashing, copying, catalog reads) in a thread pool of
+    `max_concurrency` threads, so the event loop is never blocked and at most that many
+    operations run at once; further calls wait for a free thread.
+
+    Metadata commits from concurrent calls are serialized by the metadata lock, as with
+    several processes saving to one shelf. Saves never prompt: data already stored under
+    another tag is reported and left unchanged. A cancelled call stops waiting, but an
+    operation that has started runs to completion in its thread.
+
+    The methods take the same arguments as the `Shelf` methods of the same name.
+    """
+
+    def __init__(self, shelf: Shelf, max_concurrency: int | None = None):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.shelf = shelf
+        self.max_concurrency = max_concurrency or get_async_max_concurrency(
+            datashelf_path=shelf.path
+        )
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="datashelf"
+        )
+
+    def __repr__(self) -> str:
+        return f"AsyncShelf({str(self.shelf.path)!r}, max_concurrency={self.max_concurrency})"
+
+    async def __aenter__(self) -> AsyncShelf:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def save(
+        self,
+        data: pd.DataFrame | str | Path,
+        name: str,
+        message: str,
+        tag: str,
+        stream: bool | None = None,
+        write_options: ParquetWriteOptions | None = None,
+        sheets: list[str] | str | None = None,
+    ) -> list[SaveResult] | None:
+        """Save data to the shelf. See `datashelf.save`."""
+        return await self._run(
+            self.shelf.save,
+            data=data,
+            name=name,
+            message=message,
+            tag=tag,
+            stream=stream,
+            write_options=write_options,
+            prompt=False,
+            sheets=sheets,
+        )
+
+    async def save_many(
+        self,
+        items: list[SaveItem],
+        stream: bool | None = None,
+        max_workers: int | None = None,
+        write_options: ParquetWriteOptions | None = None,
+    ) -> list[SaveResult]:
+        """Save several datasets at once. See `datashelf.save_many`."""
+        return await self._run(
+            self.shelf.save_many,
+            items=items,
+            stream=stream,
+            max_workers=max_workers,
+            write_options=write_options,
+        )
+
+    async def load(
+        self,
+        lookup_key: str,
+        to_df: bool = False,
+        as_arrow: bool = False,
+        memory_map: bool = False,
+        columns: list[str] | None = None,
+        filters: list[tuple] | list[list[tuple]] | None = None,
+    ) -> Path | pd.DataFrame | pa.Table:
+        """Load a stored artifact. See `datashelf.load`."""
+        return await self._run(
+            self.shelf.load,
+            lookup_key=lookup_key,
+            to_df=to_df,
+            as_arrow=as_arrow,
+            memory_map=memory_map,
+            columns=columns,
+            filters=filters,
+        )
+
+    async def head(
+        self, lookup_key: str, n: int = 10, columns: list[str] | None = None
+    ) -> pd.DataFrame:
+        """Return the first rows of a stored artifact. See `datashelf.head`."""
+        return await self._run(
+            self.shelf.head, lookup_key=lookup_key, n=n, columns=columns
+        )
+
+    async def checkout(
+        self, lookup_key: str, dest: str | Path, mode: CheckoutMode | None = None
+    ) -> Path:
+        """Copy a stored artifact to a destination. See `datashelf.checkout`."""
+        return await self._run(
+            self.shelf.checkout, lookup_key=lookup_key, dest=dest, mode=mode
+        )
+
+    async def checkout_many(
+        self,
+        lookup_keys: list[str],
+        dest_dir: str | Path,
+        mode: CheckoutMode | None = None,
+        max_workers: int | None = None,
+    ) -> list[Path]:
+        """Check out several artifacts into a directory. See `datashelf.checkout_many`."""
+        return await self._run(
+            self.shelf.checkout_many,
+            lookup_keys=lookup_keys,
+            dest_dir=dest_dir,
+            mode=mode,
+            max_workers=max_workers,
+        )
+
+    async def ls(
+        self,
+        filter_tag: list[str] | None = None,
+        name: str | None = None,
+        name_regex: str | None = None,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+        sort: str | None = None,
+        reverse: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        output_format: str = "table",
+        to_df: bool = False,
+    ) -> pd.DataFrame | None:
+        """List the datasets on the shelf. See `datashelf.ls`."""
+        return await self._run(
+            self.shelf.ls,
+            filter_tag=filter_tag,
+            name=name,
+            name_regex=name_regex,
+            since=since,
+            until=until,
+            sort=sort,
+            reverse=reverse,
+            limit=limit,
+            offset=offset,
+            output_format=output_format,
+            to_df=to_df,
+        )
+
+    async def show(self, lookup_key: str) -> None:
+        """Print detailed metadata for a dataset. See `datashelf.show`."""
+        return await self._run(self.shelf.show, lookup_key=lookup_key)
+
+    async def aclose(self) -> None:
+        """Waits for running operations to finish and stops the worker threads."""
+        await _to_thread(None, self._executor.shutdown)
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    async def _run(self, fn, /, **kwargs):
+        return await _to_thread(self._executor, fn, **kwargs)
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def open_async(
+    path: str | Path | None = None, max_concurrency: int | None = None
+) -> AsyncShelf:
+    """Open a datashelf repository for use from asyncio, available as `datashelf.open_async()`.
+
+    Args:
+        path (str | Path | None, optional): Project directory or .datashelf folder, as for
+            `datashelf.open`. Defaults to the DATASHELF_PATH environment variable, else the
+            nearest .datashelf folder found searching upward from the current directory.
+        max_concurrency (int | None, optional): Operations run at once. Defaults to the
+            'async_max_concurrency' setting in config.yaml.
+
+    Raises:
+        FileNotFoundError: If no datashelf repository is found.
+
+    Returns:
+        AsyncShelf: Handle on the repository. Close it with `await shelf.aclose()` or
+            use it as `async with`.
+    """
+    from datashelf.shelf import open_shelf
+
+    return AsyncShelf(shelf=open_shelf(path=path), max_concurrency=max_concurrency)
+
+
+async def asave(
+    data: pd.DataFrame | str | Path,
+    name: str,
+    message: str,
+    tag: str,
+    stream: bool | None = None,
+    write_options: ParquetWriteOptions | None = None,
+    sheets: list[str] | str | None = None,
+) -> list[SaveResult] | None:
+    """Save data to the datashelf without blocking the event loop. Never prompts: data
+    already stored under another tag is reported and left unchanged. See `datashelf.save`.
+    """
+    return await _default_async_shelf().save(
+        data=data,
+        name=name,
+        message=message,
+        tag=tag,
+        stream=stream,
+        write_options=write_options,
+        sheets=sheets,
+    )
+
+
+async def aload(
+    lookup_key: str,
+    to_df: bool = False,
+    as_arrow: bool = False,
+    memory_map: bool = False,
+    columns: list[str] | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+) -> Path | pd.DataFrame | pa.Table:
+    """Load a stored artifact without blocking the event loop. See `datashelf.load`."""
+    return await _default_async_shelf().load(
+        lookup_key=lookup_key,
+        to_df=to_df,
+        as_arrow=as_arrow,
+        memory_map=memory_map,
+        columns=columns,
+        filters=filters,
+    )
+
+
+async def acheckout(
+    lookup_key: str, dest: str | Path, mode: CheckoutMode | None = None
+) -> Path:
+    """Copy a stored artifact to a destination without blocking the event loop.
+    See `datashelf.checkout`."""
+    return await _default_async_shelf().checkout(
+        lookup_key=lookup_key, dest=dest, mode=mode
+    )
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _default_async_shelf() -> AsyncShelf:
+    from datashelf.shelf import _default_shelf
+
+    shelf = _default_shelf()
+    async_shelf = _ASYNC_SHELVES.get(shelf.path)
+
+    if async_shelf is None:
+        async_shelf = _ASYNC_SHELVES.setdefault(shelf.path, AsyncShelf(shelf=shelf))
+
+    return async_shelf
+
+
+async def _to_thread(executor, fn, *args, **kwargs):
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
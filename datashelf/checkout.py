@@ -1,14 +1,40 @@
-import shutil
+from __future__ import annotations
+
+import os
 from pathlib import Path
-from datashelf.load import load
+from typing import Literal, TYPE_CHECKING
+from datashelf.load import resolve_entry
+from datashelf.core.chunkstore import is_chunked, read_manifest, write_chunked
+from datashelf.core.config import get_checkout_mode
+from datashelf.core.filecopy import place_file
+from datashelf.core.metadata import FileEntry
+from datashelf.core.profiling import span
+from datashelf.core.storage import LocalStorage
+from datashelf.remote import fetch_entry
+
+if TYPE_CHECKING:
+    from datashelf.shelf import Shelf
+
+CheckoutMode = Literal["copy", "reflink", "hardlink"]
 
 
-def checkout(lookup_key: str, dest: str | Path) -> Path:
+def checkout(
+    lookup_key: str, dest: str | Path, mode: CheckoutMode | None = None
+) -> Path:
     """Copy a stored artifact from the datashelf to a user-specified destination.
 
+    Artifacts are immutable, so they can also be checked out as a hardlink or a
+    copy-on-write reflink instead of a full copy. If the filesystem does not support
+    the requested mode (e.g. the destination is on another device), the artifact is
+    copied instead. Files checked out as hardlinks share their bytes with the stored
+    artifact and must not be modified in place. Artifacts kept in the chunked store
+    are always written out as a new file.
+
     Args:
         lookup_key (str): Dataset name, full hash, or unique hash prefix.
         dest (str | Path): Destination file path to copy the artifact to.
+        mode (CheckoutMode | None, optional): 'copy', 'reflink' or 'hardlink'. Defaults
+            to the 'checkout_mode' setting in config.yaml.
     Raises:
         TypeError: If the destination file does not have a .parquet suffix.
         FileExistsError: If the destination file already exists.
@@ -16,7 +42,127 @@ def checkout(lookup_key: str, dest: str | Path) -> Path:
     Returns:
         Path: The path to the copied artifact.
     """
-    src_path = load(lookup_key=lookup_key)
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().checkout(lookup_key=lookup_key, dest=dest, mode=mode)
+
+
+def checkout_many(
+    lookup_keys: list[str],
+    dest_dir: str | Path,
+    mode: CheckoutMode | None = None,
+    max_workers: int | None = None,
+) -> list[Path]:
+    """Check out several artifacts into a directory at once.
+
+    Each artifact is written to `<dest_dir>/<lookup_key>.parquet`, with any path
+    separator in the key replaced by "_", so `sales/2024` becomes `sales_2024.parquet`
+    and nothing is written outside dest_dir. Every key and destination is validated
+    before anything is written, then the files are placed concurrently in a thread
+    pool (the copies run in the kernel, outside the GIL).
+
+    Args:
+        lookup_keys (list[str]): Dataset names, full hashes, or unique hash prefixes.
+        dest_dir (str | Path): Directory to check the artifacts out into.
+        mode (CheckoutMode | None, optional): 'copy', 'reflink' or 'hardlink'. Defaults
+            to the 'checkout_mode' setting in config.yaml.
+        max_workers (int | None, optional): Number of concurrent copies. Defaults to
+            the ThreadPoolExecutor default.
+
+    Raises:
+        ValueError: If the same key is given more than once, or two keys map to the
+            same file name.
+        FileExistsError: If any destination file already exists.
+
+    Returns:
+        list[Path]: The checked out paths, in the order of lookup_keys.
+    """
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().checkout_many(
+        lookup_keys=lookup_keys, dest_dir=dest_dir, mode=mode, max_workers=max_workers
+    )
+
+
+def _checkout(
+    shelf: Shelf, lookup_key: str, dest: str | Path, mode: CheckoutMode | None = None
+) -> Path:
+    mode = mode or get_checkout_mode(datashelf_path=shelf.path)
+    file_entry, dest_path = _resolve_checkout(
+        shelf=shelf, lookup_key=lookup_key, dest=dest
+    )
+
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    _place_entry(
+        storage=shelf.storage, file_entry=file_entry, dest=dest_path, mode=mode
+    )
+
+    print(f"Checked out artifact to {dest_path}")
+    return dest_path
+
+
+def _checkout_many(
+    shelf: Shelf,
+    lookup_keys: list[str],
+    dest_dir: str | Path,
+    mode: CheckoutMode | None = None,
+    max_workers: int | None = None,
+) -> list[Path]:
+    from concurrent.futures import ThreadPoolExecutor
+
+    if len(set(lookup_keys)) != len(lookup_keys):
+        raise ValueError("Each lookup key can only be checked out once.")
+
+    mode = mode or get_checkout_mode(datashelf_path=shelf.path)
+    dest_dir = Path(dest_dir)
+
+    filenames = [_checkout_filename(lookup_key=key) for key in lookup_keys]
+    if len(set(filenames)) != len(filenames):
+        raise ValueError(
+            "Lookup keys that only differ in path separators and '_' cannot be checked "
+            "out into the same directory."
+        )
+
+    pairs = [
+        _resolve_checkout(shelf=shelf, lookup_key=key, dest=dest_dir / filename)
+        for key, filename in zip(lookup_keys, filenames)
+    ]
+
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                _place_entry,
+                storage=shelf.storage,
+                file_entry=file_entry,
+                dest=dest_path,
+                mode=mode,
+            )
+            for file_entry, dest_path in pairs
+        ]
+        for future in futures:
+            future.result()
+
+    dest_paths = [dest_path for _, dest_path in pairs]
+    print(f"Checked out {len(dest_paths)} artifacts to {dest_dir.resolve()}")
+    return dest_paths
+
+
+def _checkout_filename(lookup_key: str) -> str:
+    # Dataset names may contain "/", which must not turn into directories
+    for sep in ("/", os.sep, os.altsep):
+        if sep:
+            lookup_key = lookup_key.replace(sep, "_")
+
+    return f"{lookup_key}.parquet"
+
+
+def _resolve_checkout(
+    shelf: Shelf, lookup_key: str, dest: str | Path
+) -> tuple[FileEntry, Path]:
+    with span("checkout.resolve"):
+        file_entry = resolve_entry(catalog=shelf.catalog, lookup_key=lookup_key)
 
     dest_path: Path = Path(dest).resolve()
 
@@ -26,8 +172,31 @@ def checkout(lookup_key: str, dest: str | Path) -> Path:
     if dest_path.exists():
         raise FileExistsError(f"Destination already exists: {dest_path}")
 
-    dest_path.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(str(src_path), str(dest_path))
+    fetch_entry(shelf=shelf, file_entry=file_entry)
 
-    print(f"Checked out artifact to {dest_path}")
-    return dest_path
+    return file_entry, dest_path
+
+
+def _place_entry(
+    storage: LocalStorage, file_entry: FileEntry, dest: Path, mode: CheckoutMode
+) -> None:
+    datashelf_path = storage.root
+
+    if not is_chunked(file_entry):
+        src = storage.path(storage.locate(file_entry["stored_path"]))
+
+        with span("checkout.place", bytes=src.stat().st_size, mode=mode) as s:
+            s["used"] = place_file(src=src, dest=dest, mode=mode)
+        return
+
+    manifest = read_manifest(datashelf_path=datashelf_path, file_entry=file_entry)
+
+    with span("checkout.place", bytes=manifest["size"], mode=mode, used="chunked"):
+        with open(dest, "xb") as f:
+            try:
+                write_chunked(datashelf_path=datashelf_path, manifest=manifest, out=f)
+
+            except BaseException:
+                f.close()
+                dest.unlink(missing_ok=True)
+                raise
@@ -1,8 +1,36 @@
 import argparse
+import glob
+import os
+import re
 import sys
 from pathlib import Path
 
-from datashelf import init, save, checkout, ls, show, load
+from datashelf import (
+    init,
+    save,
+    save_many,
+    checkout,
+    checkout_many,
+    ls,
+    show,
+    schema,
+    backfill_summaries,
+    load,
+    head,
+    push,
+    pull,
+    fsck,
+    gc,
+    migrate_layout,
+)
+from datashelf.core.catalog import SORT_FIELDS
+from datashelf.core.profiling import profile
+from datashelf.inspect import LS_FORMATS
+
+GLOB_CHARS = "*?["
+WHERE_PATTERN = re.compile(
+    r"^\s*(?P<column>.+?)\s*(?P<op>==|!=|>=|<=|>|<|=|\s+not in\s+|\s+in\s+)\s*(?P<value>.+?)\s*$"
+)
 
 
 def init_command(args):
@@ -28,18 +56,47 @@ def init_command(args):
 
 
 def save_file_command(args):
-    """Save a file to the datashelf.
+    """Save a file, a glob of files, or the datasets listed in a manifest to the datashelf.
 
     Args:
         args (_type_): The arguments passed from the command line. It should contain the following attributes:
-            - file_path (str): The path to the file to be saved.
-            - name (str): The name to save the file as in the datashelf.
+            - file_path (str, optional): The path to the file to be saved, or a glob pattern
+              matching several files. Required unless manifest is given.
+            - name (str, optional): The name to save the file as in the datashelf. For a glob
+              pattern, files are named after their file name (without suffix) and name is
+              used as an optional prefix.
             - message (str, optional): An optional message describing the file being saved.
             - tag (str, optional): An optional tag to associate with the saved file.
+            - stream (bool, optional): If True, convert CSV files in chunks with bounded memory.
+            - manifest (str, optional): Path to a YAML manifest listing datasets to save.
+            - workers (int, optional): Number of worker processes for batch saves.
+            - sheets (list[str], optional): Sheets of an xlsx file to save as separate
+              datasets named "<name>_<sheet>", or ["all"] for every sheet.
 
     Returns:
         int: 0 if the file was saved successfully, 1 otherwise.
     """
+    message = args.message.strip() if args.message else ""
+    tag = args.tag.strip() if args.tag else ""
+    stream = True if args.stream else None
+
+    if args.manifest or (args.file_path and any(c in args.file_path for c in GLOB_CHARS)):
+        try:
+            if args.manifest:
+                items = _read_manifest(Path(args.manifest))
+            else:
+                items = _glob_items(args.file_path, args.name, message, tag)
+
+            results = save_many(items=items, stream=stream, max_workers=args.workers)
+            return 1 if any(r["status"] == "error" for r in results) else 0
+
+        except Exception as e:
+            print(f"Error saving files: {e}", file=sys.stderr)
+            return 1
+
+    if not args.file_path:
+        print("Error: Provide a file path or --manifest.", file=sys.stderr)
+        return 1
 
     filepath_obj = Path(args.file_path)
     if not filepath_obj.exists():
@@ -51,11 +108,25 @@ def save_file_command(args):
         print("Error: Name cannot be empty.", file=sys.stderr)
         return 1
 
-    message = args.message.strip() if args.message else ""
-    tag = args.tag.strip() if args.tag else ""
-
     try:
-        save(data=args.file_path, name=name, message=message, tag=tag)
+        if args.sheets:
+            results = save(
+                data=args.file_path,
+                name=name,
+                message=message,
+                tag=tag,
+                stream=stream,
+                sheets="all" if args.sheets == ["all"] else args.sheets,
+            )
+            return 1 if any(r["status"] == "error" for r in results) else 0
+
+        save(
+            data=args.file_path,
+            name=name,
+            message=message,
+            tag=tag,
+            stream=stream,
+        )
         return 0
 
     except Exception as e:
@@ -71,12 +142,27 @@ def load_command(args):
             - lookup_key (str): Dataset name, full hash, or unique hash prefix.
             - to_df (bool, optional): If True, load and display the artifact as a DataFrame.
               If False, print the resolved stored path.
+            - as_arrow (bool, optional): If True, load and display the artifact as a pyarrow Table.
+            - memory_map (bool, optional): If True, memory-map the artifact when loading it.
+            - columns (list[str], optional): Columns to read. Implies to_df unless as_arrow is set.
+            - where (list[str], optional): Row filters such as "date>=2024-01-01", ANDed together.
+              Implies to_df unless as_arrow is set.
 
     Returns:
         int: 0 if the file was loaded successfully, 1 otherwise.
     """
     try:
-        result = load(lookup_key=args.lookup_key, to_df=args.to_df)
+        filters = [_parse_where(expr) for expr in args.where] if args.where else None
+        reads_data = args.columns is not None or filters is not None
+
+        result = load(
+            lookup_key=args.lookup_key,
+            to_df=args.to_df or (reads_data and not args.as_arrow),
+            as_arrow=args.as_arrow,
+            memory_map=args.memory_map,
+            columns=args.columns,
+            filters=filters,
+        )
         print(result)
 
         return 0
@@ -86,6 +172,29 @@ def load_command(args):
         return 1
 
 
+def head_command(args):
+    """Print the first rows of a file in the datashelf.
+
+    Args:
+        args: The arguments passed from the command line. It should contain:
+            - lookup_key (str): Dataset name, full hash, or unique hash prefix.
+            - n (int, optional): Number of rows to print.
+            - columns (list[str], optional): Columns to read.
+
+    Returns:
+        int: 0 if the rows were printed successfully, 1 otherwise.
+    """
+    try:
+        df = head(lookup_key=args.lookup_key, n=args.n, columns=args.columns)
+        print(df.to_string())
+
+        return 0
+
+    except Exception as e:
+        print(f"Error reading file: {e}", file=sys.stderr)
+        return 1
+
+
 def ls_command(args):
     """List files currently registered in the datashelf.
 
@@ -93,12 +202,34 @@ def ls_command(args):
         args: The arguments passed from the command line. It should contain:
             - filter_tag (list[str] | str | None, optional): Optional tag or tags used to
               filter displayed metadata entries.
+            - name, regex (str | None): Glob and regular expression for dataset names.
+            - since, until (str | None): Range of dates the datasets were added in.
+            - sort (str | None), reverse (bool): Field to sort by and its direction.
+            - limit (int | None), offset (int): Page of entries to show.
+            - format (str): "table", "json" or "csv".
 
     Returns:
         int: 0 if the list command completed successfully, 1 otherwise.
     """
     try:
-        ls(filter_tag=args.filter_tag)
+        ls(
+            filter_tag=args.filter_tag,
+            name=args.name,
+            name_regex=args.regex,
+            since=args.since,
+            until=args.until,
+            sort=args.sort,
+            reverse=args.reverse,
+            limit=args.limit,
+            offset=args.offset,
+            output_format=args.format,
+        )
+        return 0
+
+    except BrokenPipeError:
+        # Output piped into e.g. `head` that stopped reading: not an error. Point
+        # stdout at devnull so the interpreter does not fail flushing it on exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
         return 0
 
     except Exception as e:
@@ -125,19 +256,59 @@ def show_command(args):
         return 1
 
 
+def schema_command(args):
+    """Show the columns of a datashelf entry with their dtypes and statistics.
+
+    Args:
+        args: The arguments passed from the command line. It should contain:
+            - lookup_key (str, optional): Dataset name, full hash, or hash prefix.
+            - backfill (bool, optional): Summarize every dataset saved without a summary first.
+            - workers (int, optional): Number of footers read at once when backfilling.
+
+    Returns:
+        int: 0 if the schema was shown successfully, 1 otherwise.
+    """
+    try:
+        if not args.lookup_key and not args.backfill:
+            print("Error: Provide a dataset to describe, or --backfill.", file=sys.stderr)
+            return 1
+
+        if args.backfill:
+            backfill_summaries(max_workers=args.workers)
+
+        if args.lookup_key:
+            schema(lookup_key=args.lookup_key)
+        return 0
+
+    except Exception as e:
+        print(f"Error showing schema: {e}", file=sys.stderr)
+        return 1
+
+
 def checkout_command(args):
-    """Copy a stored artifact from the datashelf to a user-specified destination.
+    """Copy stored artifacts from the datashelf to a user-specified destination.
 
     Args:
         args: The arguments passed from the command line. It should contain:
-            - lookup_key (str): Dataset name, full hash, or unique hash prefix.
-            - dest (str): Destination file path to copy the artifact to.
+            - lookup_keys (list[str]): Dataset names, full hashes, or unique hash prefixes.
+            - dest (str): Destination file path, or a directory when several keys are given
+              or dest has no .parquet suffix.
+            - mode (str, optional): 'copy', 'reflink' or 'hardlink'.
+            - workers (int, optional): Number of concurrent copies.
 
     Returns:
         int: 0 if the checkout completed successfully, 1 otherwise.
     """
     try:
-        checkout(lookup_key=args.lookup_key, dest=args.dest)
+        if len(args.lookup_keys) == 1 and args.dest.endswith(".parquet"):
+            checkout(lookup_key=args.lookup_keys[0], dest=args.dest, mode=args.mode)
+        else:
+            checkout_many(
+                lookup_keys=args.lookup_keys,
+                dest_dir=args.dest,
+                mode=args.mode,
+                max_workers=args.workers,
+            )
         return 0
 
     except Exception as e:
@@ -145,10 +316,242 @@ def checkout_command(args):
         return 1
 
 
+def push_command(args):
+    """Upload datasets to the remote store.
+
+    Args:
+        args: The arguments passed from the command line. It should contain:
+            - lookup_keys (list[str], optional): Dataset names or hash prefixes. Defaults to all.
+            - remote (str, optional): Remote store directory, overriding 'remote_path'.
+            - workers (int, optional): Number of parts transferred at once.
+
+    Returns:
+        int: 0 if the push completed successfully, 1 otherwise.
+    """
+    try:
+        push(lookup_keys=args.lookup_keys, remote=args.remote, max_workers=args.workers)
+        return 0
+
+    except Exception as e:
+        print(f"Error pushing datasets: {e}", file=sys.stderr)
+        return 1
+
+
+def pull_command(args):
+    """Download datasets from the remote store into the datashelf.
+
+    Args:
+        args: The arguments passed from the command line. It should contain:
+            - lookup_keys (list[str], optional): Dataset names or hash prefixes. Defaults to all.
+            - remote (str, optional): Remote store directory, overriding 'remote_path'.
+            - workers (int, optional): Number of parts transferred at once.
+
+    Returns:
+        int: 0 if the pull completed successfully, 1 otherwise.
+    """
+    try:
+        pull(lookup_keys=args.lookup_keys, remote=args.remote, max_workers=args.workers)
+        return 0
+
+    except Exception as e:
+        print(f"Error pulling datasets: {e}", file=sys.stderr)
+        return 1
+
+
+def fsck_command(args):
+    """Verify stored artifacts against their recorded hashes.
+
+    Args:
+        args: The arguments passed from the command line. It should contain:
+            - full (bool, optional): If True, re-hash files verified by earlier runs too.
+            - workers (int, optional): Number of files hashed at once.
+
+    Returns:
+        int: 0 if every artifact is present and intact, 1 otherwise.
+    """
+    try:
+        result = fsck(full=args.full, max_workers=args.workers)
+        return 1 if result["problems"] else 0
+
+    except Exception as e:
+        print(f"Error checking artifacts: {e}", file=sys.stderr)
+        return 1
+
+
+def gc_command(args):
+    """Remove unreferenced artifacts and leftover temporary files from the datashelf.
+
+    Args:
+        args: The arguments passed from the command line. It should contain:
+            - dry_run (bool, optional): If True, only report what would be removed.
+            - min_age_hours (float, optional): Only remove files older than this.
+
+    Returns:
+        int: 0 if garbage collection completed successfully, 1 otherwise.
+    """
+    try:
+        gc(dry_run=args.dry_run, min_age_hours=args.min_age_hours)
+        return 0
+
+    except Exception as e:
+        print(f"Error collecting garbage: {e}", file=sys.stderr)
+        return 1
+
+
+def migrate_layout_command(args):
+    """Move stored artifacts to the 'artifact_layout' set in config.yaml.
+
+    Args:
+        args: The arguments passed from the command line. It should contain:
+            - workers (int, optional): Number of artifacts moved at once.
+
+    Returns:
+        int: 0 if the artifacts were moved successfully, 1 otherwise.
+    """
+    try:
+        migrate_layout(max_workers=args.workers)
+        return 0
+
+    except Exception as e:
+        print(f"Error migrating artifacts: {e}", file=sys.stderr)
+        return 1
+
+
+def _parse_where(expression: str) -> tuple:
+    """Parse a --where expression such as "date>=2024-01-01", "id in 1,2,3" or
+    "name != 'Bob'" into a (column, op, value) filter tuple."""
+    match = WHERE_PATTERN.match(expression)
+    if not match:
+        raise ValueError(
+            f"Invalid --where expression '{expression}'. Use <column><op><value> with one of "
+            "==, !=, >, >=, <, <=, in, not in."
+        )
+
+    column, value = match.group("column"), match.group("value")
+    op = match.group("op").strip()
+    op = "==" if op == "=" else op
+
+    if op in ("in", "not in"):
+        return column, op, [_parse_value(v) for v in value.split(",")]
+
+    return column, op, _parse_value(value)
+
+
+def _parse_value(text: str):
+    text = text.strip()
+
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            continue
+
+    return text
+
+
+def _read_manifest(manifest_path: Path) -> list[dict]:
+    """Read a YAML manifest of the form
+
+        message: optional default message
+        tag: optional default tag
+        datasets:
+          - path: data/raw/events.csv
+            name: events_raw
+            message: optional
+            tag: optional
+            sheet: optional, for xlsx files (defaults to the first sheet)
+
+    Relative paths are resolved against the manifest's directory.
+    """
+    import yaml
+
+    with open(manifest_path, "r") as manifest_file:
+        content = yaml.safe_load(manifest_file) or {}
+
+    datasets = content.get("datasets")
+    if not isinstance(datasets, list) or not datasets:
+        raise ValueError(f"Manifest {manifest_path} must contain a non-empty 'datasets' list.")
+
+    items = []
+    for dataset in datasets:
+        if not dataset.get("path") or not dataset.get("name"):
+            raise ValueError(f"Every dataset in {manifest_path} needs a 'path' and a 'name'.")
+
+        items.append(
+            {
+                "data": manifest_path.parent / dataset["path"],
+                "name": str(dataset["name"]).strip(),
+                "message": str(dataset.get("message", content.get("message")) or "").strip(),
+                "tag": str(dataset.get("tag", content.get("tag")) or "").strip(),
+                "sheet": str(dataset["sheet"]) if dataset.get("sheet") else None,
+            }
+        )
+
+    return items
+
+
+def _glob_items(pattern: str, prefix: str | None, message: str, tag: str) -> list[dict]:
+    paths = sorted(p for p in glob.glob(pattern, recursive=True) if Path(p).is_file())
+    if not paths:
+        raise FileNotFoundError(f"No files match {pattern}.")
+
+    prefix = prefix.strip() if prefix else ""
+    return [
+        {
+            "data": path,
+            "name": f"{prefix}{Path(path).stem}",
+            "message": message,
+            "tag": tag,
+        }
+        for path in paths
+    ]
+
+
+def run_command(args):
+    """Run the selected command, timing its phases if --profile or --trace was given.
+
+    The phase breakdown is printed to stderr so the command's own output is unchanged.
+
+    Returns:
+        int: The exit code of the command.
+    """
+    if not (getattr(args, "profile", False) or getattr(args, "trace", None)):
+        return args.func(args)
+
+    with profile() as p:
+        exit_code = args.func(args)
+
+    if p.spans:
+        print(f"\n{p.summary()}", file=sys.stderr)
+
+    if args.trace:
+        p.write_chrome_trace(args.trace)
+        print(f"Wrote trace to {args.trace}", file=sys.stderr)
+
+    return exit_code
+
+
 def main():
     parser = argparse.ArgumentParser(description="Datashelf CLI")
     subparsers = parser.add_subparsers(title="Commands", dest="command")
 
+    # Options shared by the commands that read or write data
+    profile_parser = argparse.ArgumentParser(add_help=False)
+    profile_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a breakdown of the time spent in each phase to stderr.",
+    )
+    profile_parser.add_argument(
+        "--trace",
+        type=str,
+        metavar="FILE",
+        help="Write the phase timings as Chrome trace-event JSON (open in Perfetto or chrome://tracing).",
+    )
+
     # Init command
     init_parser = subparsers.add_parser(
         "init", help="Initialize a Datashelf directory."
@@ -161,12 +564,20 @@ def main():
     init_parser.set_defaults(func=init_command)
 
     # Save command
-    save_parser = subparsers.add_parser("save", help="Save a file to the Datashelf.")
+    save_parser = subparsers.add_parser(
+        "save", help="Save a file to the Datashelf.", parents=[profile_parser]
+    )
     save_parser.add_argument(
-        "file_path", type=str, help="The path to the file to be saved."
+        "file_path",
+        type=str,
+        nargs="?",
+        help="The path to the file to be saved, or a quoted glob pattern such as 'data/raw/*.csv'.",
     )
     save_parser.add_argument(
-        "name", type=str, help="The name to save the file as in the datashelf."
+        "name",
+        type=str,
+        nargs="?",
+        help="The name to save the file as in the datashelf. For a glob pattern, an optional prefix for names derived from file names.",
     )
     save_parser.add_argument(
         "--message",
@@ -176,10 +587,33 @@ def main():
     save_parser.add_argument(
         "--tag", type=str, help="An optional tag to associate with the saved file."
     )
+    save_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="If set, convert CSV files in chunks within the configured memory budget.",
+    )
+    save_parser.add_argument(
+        "--manifest",
+        type=str,
+        help="Path to a YAML manifest listing datasets to save in one batch.",
+    )
+    save_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes used to convert files in a batch save.",
+    )
+    save_parser.add_argument(
+        "--sheets",
+        type=str,
+        nargs="+",
+        help="Save these sheets of an xlsx file (or 'all') as separate datasets named <name>_<sheet>, converted in parallel.",
+    )
     save_parser.set_defaults(func=save_file_command)
 
     # Load command
-    load_parser = subparsers.add_parser("load", help="Load a file from the datashelf.")
+    load_parser = subparsers.add_parser(
+        "load", help="Load a file from the datashelf.", parents=[profile_parser]
+    )
     load_parser.add_argument(
         "lookup_key", type=str, help="Dataset name, full hash, or unique hash prefix."
     )
@@ -189,11 +623,60 @@ def main():
         dest="to_df",
         help="If set, load and display the artifact as a DataFrame.",
     )
+    load_parser.add_argument(
+        "--arrow",
+        action="store_true",
+        dest="as_arrow",
+        help="If set, load and display the artifact as a pyarrow Table (requires pyarrow).",
+    )
+    load_parser.add_argument(
+        "--mmap",
+        action="store_true",
+        dest="memory_map",
+        help="If set, memory-map the artifact when loading it (requires pyarrow).",
+    )
+    load_parser.add_argument(
+        "--columns",
+        type=str,
+        nargs="+",
+        help="Only read these columns (implies --df unless --arrow is set).",
+    )
+    load_parser.add_argument(
+        "--where",
+        type=str,
+        action="append",
+        help="Row filter such as 'date>=2024-01-01' or 'id in 1,2,3'. Repeat to AND several filters.",
+    )
     load_parser.set_defaults(func=load_command)
 
+    # Head command
+    head_parser = subparsers.add_parser(
+        "head",
+        help="Print the first rows of a file, reading only the row groups they are in.",
+        parents=[profile_parser],
+    )
+    head_parser.add_argument(
+        "lookup_key", type=str, help="Dataset name, full hash, or unique hash prefix."
+    )
+    head_parser.add_argument(
+        "-n",
+        type=int,
+        default=10,
+        help="Number of rows to print (default: 10).",
+    )
+    head_parser.add_argument(
+        "--columns",
+        type=str,
+        nargs="+",
+        help="Only read these columns.",
+    )
+    head_parser.set_defaults(func=head_command)
+
     # List command
     ls_parser = subparsers.add_parser(
-        "list", help="List files currently registered in the datashelf."
+        "list",
+        help="List files currently registered in the datashelf.",
+        parents=[profile_parser],
     )
     ls_parser.add_argument(
         "--filter_tag",
@@ -201,11 +684,47 @@ def main():
         nargs="+",
         help="Optional tag or tags used to filter displayed metadata entries.",
     )
+    ls_parser.add_argument(
+        "--name", type=str, help="Only datasets whose name matches this glob, e.g. 'sales_*'."
+    )
+    ls_parser.add_argument(
+        "--regex",
+        type=str,
+        help="Only datasets whose name contains a match of this regular expression.",
+    )
+    ls_parser.add_argument(
+        "--since", type=str, help="Only datasets added at or after this ISO date or time."
+    )
+    ls_parser.add_argument(
+        "--until",
+        type=str,
+        help="Only datasets added at or before this ISO date or time (a date includes the whole day).",
+    )
+    ls_parser.add_argument(
+        "--sort",
+        choices=SORT_FIELDS,
+        help="Field to sort by. Defaults to the order datasets were added in.",
+    )
+    ls_parser.add_argument(
+        "--reverse",
+        action="store_true",
+        help="Sort in descending order (newest first without --sort).",
+    )
+    ls_parser.add_argument("--limit", type=int, help="Show at most this many datasets.")
+    ls_parser.add_argument("--offset", type=int, default=0, help="Skip this many datasets first.")
+    ls_parser.add_argument(
+        "--format",
+        choices=LS_FORMATS,
+        default="table",
+        help="Output format; json prints one object per line. Defaults to table.",
+    )
     ls_parser.set_defaults(func=ls_command)
 
     # Show command
     show_parser = subparsers.add_parser(
-        "show", help="Show metadata for a specific datashelf entry."
+        "show",
+        help="Show metadata for a specific datashelf entry.",
+        parents=[profile_parser],
     )
     show_parser.add_argument(
         "lookup_key",
@@ -214,22 +733,142 @@ def main():
     )
     show_parser.set_defaults(func=show_command)
 
+    # Schema command
+    schema_parser = subparsers.add_parser(
+        "schema",
+        help="Show the columns of a datashelf entry with their dtypes and statistics.",
+        parents=[profile_parser],
+    )
+    schema_parser.add_argument(
+        "lookup_key",
+        type=str,
+        nargs="?",
+        help="Dataset name, full hash, or hash prefix to describe.",
+    )
+    schema_parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Summarize every dataset saved without a summary, reading only parquet footers.",
+    )
+    schema_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of footers read at once with --backfill.",
+    )
+    schema_parser.set_defaults(func=schema_command)
+
     # Checkout command
     checkout_parser = subparsers.add_parser(
         "checkout",
         help="Copy a stored artifact from the datashelf to a user-specified destination.",
+        parents=[profile_parser],
     )
     checkout_parser.add_argument(
-        "lookup_key", type=str, help="Dataset name, full hash, or unique hash prefix."
+        "lookup_keys",
+        type=str,
+        nargs="+",
+        help="Dataset names, full hashes, or unique hash prefixes.",
+    )
+    checkout_parser.add_argument(
+        "dest",
+        type=str,
+        help=(
+            "Destination .parquet file, or a directory to check several artifacts "
+            "out into as <key>.parquet."
+        ),
+    )
+    checkout_parser.add_argument(
+        "--mode",
+        type=str,
+        choices=["copy", "reflink", "hardlink"],
+        help="How to place the files. Defaults to 'checkout_mode' in config.yaml.",
     )
     checkout_parser.add_argument(
-        "dest", type=str, help="Destination file path to copy the artifact to."
+        "--workers",
+        type=int,
+        help="Number of concurrent copies when checking out several artifacts.",
     )
     checkout_parser.set_defaults(func=checkout_command)
 
+    # Push and pull commands
+    for command, func, help_text in [
+        ("push", push_command, "Upload datasets the remote store does not have yet."),
+        ("pull", pull_command, "Download datasets from the remote store that are missing locally."),
+    ]:
+        transfer_parser = subparsers.add_parser(
+            command, help=help_text, parents=[profile_parser]
+        )
+        transfer_parser.add_argument(
+            "lookup_keys",
+            type=str,
+            nargs="*",
+            help="Dataset names or hash prefixes. Defaults to all datasets.",
+        )
+        transfer_parser.add_argument(
+            "--remote",
+            type=str,
+            help="Remote store directory. Defaults to 'remote_path' in config.yaml.",
+        )
+        transfer_parser.add_argument(
+            "--workers",
+            type=int,
+            help="Number of parts transferred at once. Defaults to 'transfer_workers' in config.yaml.",
+        )
+        transfer_parser.set_defaults(func=func)
+
+    # Fsck command
+    fsck_parser = subparsers.add_parser(
+        "fsck",
+        help="Verify stored artifacts against their recorded hashes.",
+        parents=[profile_parser],
+    )
+    fsck_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-hash every file, including the ones unchanged since they were last verified.",
+    )
+    fsck_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of files hashed at once. Defaults to the number of CPUs.",
+    )
+    fsck_parser.set_defaults(func=fsck_command)
+
+    # Gc command
+    gc_parser = subparsers.add_parser(
+        "gc",
+        help="Remove unreferenced artifacts and leftover temporary files.",
+        parents=[profile_parser],
+    )
+    gc_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report what would be removed and how many bytes it would reclaim.",
+    )
+    gc_parser.add_argument(
+        "--min-age-hours",
+        type=float,
+        default=1.0,
+        help="Only remove files older than this, to spare those of saves still running (default: 1).",
+    )
+    gc_parser.set_defaults(func=gc_command)
+
+    # Migrate-layout command
+    migrate_parser = subparsers.add_parser(
+        "migrate-layout",
+        help="Move stored artifacts to the 'artifact_layout' set in config.yaml.",
+        parents=[profile_parser],
+    )
+    migrate_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of artifacts moved at once.",
+    )
+    migrate_parser.set_defaults(func=migrate_layout_command)
+
     args = parser.parse_args()
     if hasattr(args, "func"):
-        exit_code = args.func(args)
+        exit_code = run_command(args)
         sys.exit(exit_code)
     else:
         parser.print_help()
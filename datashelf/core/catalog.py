@@ -0,0 +1,597 @@
+from __future__ import annotations
+
+import fnmatch
+import functools
+import heapq
+import itertools
+import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Iterator, TypedDict
+from tempfile import NamedTemporaryFile
+from datashelf.core.config import get_catalog_backend, get_journal_compact_bytes
+from datashelf.core.profiling import span
+from datashelf.core.metadata import (
+    FileEntry,
+    JOURNAL_FILE,
+    load_metadata,
+    metadata_lock,
+    append_journal,
+    read_journal,
+    apply_journal_event,
+    hash_index,
+    make_add_event,
+    make_update_event,
+    entry_hash_algorithm,
+    _load_metadata_unlocked,
+    _compact_metadata_unlocked,
+    _get_current_timestamp,
+    _atomic_write_json,
+)
+
+CATALOG_DB = "catalog.sqlite"
+SUPPORTED_SCHEMA_VERSIONS = ["1.0"]
+# Seconds a writer waits for another process's transaction to finish
+SQLITE_TIMEOUT = 60
+
+# Matches (name_matches, hash_approx_match, hash_exact_match)
+LookupMatches = tuple[list[FileEntry], list[FileEntry], list[FileEntry]]
+
+# Entry fields results can be sorted by; each is an indexed column of the SQLite catalog
+SORT_FIELDS = ["name", "tag", "datetime_added", "file_hash"]
+# Rows fetched from SQLite at a time while streaming query results
+FETCH_ROWS = 1000
+
+
+class EntryQuery(TypedDict, total=False):
+    tags: list[str]  # any of these tags
+    name_glob: str  # whole name matches, e.g. "sales_*"
+    name_regex: str  # matches anywhere in the name
+    since: str  # datetime_added on or after, ISO 8601
+    until: str  # datetime_added on or before, ISO 8601
+    sort: str  # one of SORT_FIELDS; registration order if not set
+    reverse: bool
+    limit: int
+    offset: int
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def open_catalog(datashelf_path: Path) -> JsonCatalog | SqliteCatalog:
+    """
+    Open the catalog backend configured by 'catalog_backend' in config.yaml.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory.
+
+    Returns:
+        JsonCatalog | SqliteCatalog: Catalog used to look up and register file entries.
+    """
+    backend = get_catalog_backend(datashelf_path=datashelf_path)
+
+    if backend == "sqlite":
+        return SqliteCatalog(datashelf_path=datashelf_path)
+
+    return JsonCatalog(datashelf_path=datashelf_path)
+
+
+class JsonCatalog:
+    """
+    Catalog backed by the `metadata.json` snapshot plus the append-only
+    `metadata.journal`. Lookups by name scan the full list of file entries, lookups
+    by hash use an index; commits append events to the journal under the metadata
+    lock, so they do not rewrite the snapshot and cost the same whatever the size of
+    the catalog. Once the journal grows past 'journal_compact_kb' it is folded back
+    into the snapshot.
+    """
+
+    def __init__(self, datashelf_path: Path):
+        self.datashelf_path = datashelf_path
+        self._metadata: dict | None = None
+        # hash -> entries of self._metadata, kept in step with it
+        self._index: dict[str, list[FileEntry]] = {}
+        self._journal_offset = 0
+        self._snapshot_mtime_ns = 0
+
+    @property
+    def metadata(self) -> dict:
+        # A long-lived catalog picks up commits from other processes on the next read
+        if self._metadata is None or self._is_stale():
+            with metadata_lock(datashelf_path=self.datashelf_path, shared=True):
+                self._refresh()
+
+        return self._metadata
+
+    def match(self, lookup_key: str) -> LookupMatches:
+        files = self.metadata["files"]
+
+        name_matches = [
+            file_entry for file_entry in files if file_entry["name"] == lookup_key
+        ]
+        hash_approx_match = [
+            file_entry
+            for file_entry in files
+            if file_entry["file_hash"].startswith(lookup_key)
+            and file_entry["file_hash"] != lookup_key
+        ]
+        hash_exact_match = [
+            file_entry for file_entry in files if file_entry["file_hash"] == lookup_key
+        ]
+
+        return name_matches, hash_approx_match, hash_exact_match
+
+    def find_by_hash(self, file_hash: str) -> list[FileEntry]:
+        # Reading the metadata refreshes it, and the index with it
+        self.metadata
+        return list(self._index.get(file_hash, []))
+
+    def hash_algorithms(self) -> set[str]:
+        """Hash algorithms used by the entries on the shelf."""
+        return {entry_hash_algorithm(f) for f in self.metadata["files"]}
+
+    def entries(self, tags: list[str] | None = None) -> list[FileEntry]:
+        files = self.metadata["files"]
+
+        if tags:
+            files = [f for f in files if f["tag"] in tags]
+
+        return files
+
+    def query(self, query: EntryQuery) -> Iterator[FileEntry]:
+        """
+        Entries matching query, lazily. With a sort and a limit only the first
+        offset + limit entries are kept in a heap instead of sorting them all.
+        """
+        patterns = _name_patterns(query=query)
+        files = (
+            f for f in self.metadata["files"] if _matches(entry=f, query=query, patterns=patterns)
+        )
+        sort = query.get("sort")
+        reverse = query.get("reverse", False)
+        offset = query.get("offset", 0)
+        limit = query.get("limit")
+
+        if sort:
+            key = functools.partial(_sort_value, field=sort)
+
+            if limit is None:
+                files = iter(sorted(files, key=key, reverse=reverse))
+            elif reverse:
+                files = iter(heapq.nlargest(offset + limit, files, key=key))
+            else:
+                files = iter(heapq.nsmallest(offset + limit, files, key=key))
+
+        elif reverse:
+            files = reversed(list(files))
+
+        return itertools.islice(files, offset, None if limit is None else offset + limit)
+
+    def add(self, entry: FileEntry) -> None:
+        self.add_many(entries=[entry])
+
+    def add_many(self, entries: list[FileEntry]) -> None:
+        """
+        Appends entries to the journal. Entries whose hash was registered in the meantime
+        by another process are skipped, so concurrent saves never duplicate an artifact.
+        """
+        with metadata_lock(datashelf_path=self.datashelf_path):
+            self._refresh()
+
+            batch: set[str] = set()
+            events = []
+            for entry in entries:
+                file_hash = entry["file_hash"]
+                if file_hash not in self._index and file_hash not in batch:
+                    batch.add(file_hash)
+                    events.append(make_add_event(entry=entry))
+
+            self._commit(events=events)
+
+    def update(self, file_hash: str, **fields) -> None:
+        with metadata_lock(datashelf_path=self.datashelf_path):
+            self._refresh()
+            self._commit(events=[make_update_event(file_hash=file_hash, fields=fields)])
+
+    def update_many(self, updates: dict[str, dict]) -> None:
+        """
+        Updates the fields of several entries, by hash, all at once. The updates are
+        folded into a new snapshot, which replaces `metadata.json` atomically, rather
+        than appended to the journal, so a crash never leaves only some of them applied.
+        """
+        if not updates:
+            return
+
+        with metadata_lock(datashelf_path=self.datashelf_path):
+            self._refresh()
+
+            with span("metadata.commit", events=len(updates)):
+                for file_hash, fields in updates.items():
+                    apply_journal_event(
+                        metadata=self._metadata,
+                        event=make_update_event(file_hash=file_hash, fields=fields),
+                        index=self._index,
+                    )
+
+                # As in compaction, replaying the old journal on the new snapshot is harmless
+                _atomic_write_json(
+                    path=self.datashelf_path / "metadata.json", obj=self._metadata
+                )
+                (self.datashelf_path / JOURNAL_FILE).write_bytes(b"")
+
+            self._reload()
+
+    def close(self) -> None:
+        """Nothing to release; entries are read from files on each refresh."""
+
+    def _commit(self, events: list[dict]) -> None:
+        if not events:
+            return
+
+        with span("metadata.commit", events=len(events)):
+            append_journal(datashelf_path=self.datashelf_path, events=events)
+            for event in events:
+                apply_journal_event(metadata=self._metadata, event=event, index=self._index)
+
+        journal_path = self.datashelf_path / JOURNAL_FILE
+        compact_bytes = get_journal_compact_bytes(datashelf_path=self.datashelf_path)
+
+        if journal_path.stat().st_size > compact_bytes:
+            with span("metadata.compact", bytes=journal_path.stat().st_size):
+                _compact_metadata_unlocked(datashelf_path=self.datashelf_path)
+            self._reload()
+        else:
+            self._journal_offset = journal_path.stat().st_size
+
+    def _reload(self) -> None:
+        self._snapshot_mtime_ns = _snapshot_mtime_ns(datashelf_path=self.datashelf_path)
+
+        with span("metadata.read") as s:
+            self._metadata, self._journal_offset = _load_metadata_unlocked(
+                datashelf_path=self.datashelf_path
+            )
+            self._index = hash_index(metadata=self._metadata)
+            s["rows"] = len(self._metadata["files"])
+            s["bytes"] = (self.datashelf_path / "metadata.json").stat().st_size + (
+                self._journal_offset
+            )
+
+    def _is_stale(self) -> bool:
+        journal_path = self.datashelf_path / JOURNAL_FILE
+        journal_size = journal_path.stat().st_size if journal_path.exists() else 0
+
+        return (
+            journal_size != self._journal_offset
+            or _snapshot_mtime_ns(datashelf_path=self.datashelf_path)
+            != self._snapshot_mtime_ns
+        )
+
+    def _refresh(self) -> None:
+        """
+        Brings the in-memory document up to date with commits made by other
+        processes, replaying only the journal events appended since the last read.
+        Must be called while holding the metadata lock (shared is enough).
+        """
+        journal_path = self.datashelf_path / JOURNAL_FILE
+        journal_size = journal_path.stat().st_size if journal_path.exists() else 0
+
+        if (
+            self._metadata is None
+            or _snapshot_mtime_ns(datashelf_path=self.datashelf_path)
+            != self._snapshot_mtime_ns
+            or journal_size < self._journal_offset
+        ):
+            self._reload()
+            return
+
+        with span("metadata.replay") as s:
+            start = self._journal_offset
+            events, self._journal_offset = read_journal(
+                datashelf_path=self.datashelf_path, offset=self._journal_offset
+            )
+            for event in events:
+                apply_journal_event(metadata=self._metadata, event=event, index=self._index)
+
+            s["events"] = len(events)
+            s["bytes"] = self._journal_offset - start
+
+
+class SqliteCatalog:
+    """
+    Catalog backed by an indexed SQLite database at `.datashelf/catalog.sqlite`.
+    Lookups by name, hash prefix and tag use indexes and commits only touch the
+    affected rows. The full file entry is stored as JSON next to the indexed columns.
+
+    The first time the catalog is opened it is migrated from `metadata.json`.
+    """
+
+    def __init__(self, datashelf_path: Path):
+        self.datashelf_path = datashelf_path
+        self.db_path = datashelf_path / CATALOG_DB
+
+        if not self.db_path.exists():
+            with span("metadata.migrate"):
+                migrate_json_to_sqlite(datashelf_path=datashelf_path)
+
+        self._conn = sqlite3.connect(self.db_path, timeout=SQLITE_TIMEOUT)
+        # "X REGEXP Y" calls regexp(Y, X)
+        self._conn.create_function("regexp", 2, _regexp, deterministic=True)
+
+    def match(self, lookup_key: str) -> LookupMatches:
+        name_matches = self._select("WHERE name = ?", (lookup_key,))
+        hash_approx_match = self._select(
+            "WHERE file_hash >= ? AND file_hash < ? AND file_hash != ?",
+            (*_prefix_range(lookup_key), lookup_key),
+        )
+        hash_exact_match = self.find_by_hash(file_hash=lookup_key)
+
+        return name_matches, hash_approx_match, hash_exact_match
+
+    def find_by_hash(self, file_hash: str) -> list[FileEntry]:
+        return self._select("WHERE file_hash = ?", (file_hash,))
+
+    def hash_algorithms(self) -> set[str]:
+        """Hash algorithms used by the entries on the shelf."""
+        rows = self._conn.execute(
+            "SELECT DISTINCT json_extract(entry, '$.hash_algorithm') FROM files"
+        ).fetchall()
+
+        return {row[0] or "sha256" for row in rows}
+
+    def entries(self, tags: list[str] | None = None) -> list[FileEntry]:
+        if tags:
+            placeholders = ", ".join("?" for _ in tags)
+            return self._select(f"WHERE tag IN ({placeholders})", tuple(tags))
+
+        return self._select("", ())
+
+    def query(self, query: EntryQuery) -> Iterator[FileEntry]:
+        """
+        Entries matching query. Filters, sorting and paging run in SQL on the indexed
+        columns, and rows are streamed from the cursor rather than fetched all at once.
+        """
+        clauses = []
+        params: list = []
+
+        if query.get("tags"):
+            clauses.append(f"tag IN ({', '.join('?' for _ in query['tags'])})")
+            params.extend(query["tags"])
+
+        for pattern in _name_patterns(query=query):
+            clauses.append("name REGEXP ?")
+            params.append(pattern.pattern)
+
+        if query.get("since"):
+            clauses.append("datetime_added >= ?")
+            params.append(query["since"])
+
+        if query.get("until"):
+            clauses.append("datetime_added <= ?")
+            params.append(query["until"])
+
+        direction = "DESC" if query.get("reverse") else "ASC"
+        # Validated by the caller against SORT_FIELDS, the columns of the table
+        order = f"{query['sort']} {direction}, id ASC" if query.get("sort") else f"id {direction}"
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        cursor = self._conn.execute(
+            f"SELECT entry FROM files {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            (*params, -1 if query.get("limit") is None else query["limit"], query.get("offset", 0)),
+        )
+
+        while rows := cursor.fetchmany(FETCH_ROWS):
+            for row in rows:
+                yield json.loads(row[0])
+
+    def add(self, entry: FileEntry) -> None:
+        self.add_many(entries=[entry])
+
+    def add_many(self, entries: list[FileEntry]) -> None:
+        """
+        Inserts entries in one transaction. Entries whose hash was registered in the
+        meantime by another process are skipped, so concurrent saves never duplicate
+        an artifact.
+        """
+        with self._conn, span("metadata.commit", events=len(entries)):
+            # Take the write lock before checking so the check and insert are atomic
+            self._conn.execute("BEGIN IMMEDIATE")
+
+            known = set()
+            new_entries = []
+            for entry in entries:
+                if entry["file_hash"] in known or self.find_by_hash(entry["file_hash"]):
+                    continue
+
+                known.add(entry["file_hash"])
+                new_entries.append(entry)
+
+            _insert_entries(conn=self._conn, entries=new_entries)
+            _set_last_modified(conn=self._conn)
+
+    def update(self, file_hash: str, **fields) -> None:
+        self.update_many(updates={file_hash: fields})
+
+    def update_many(self, updates: dict[str, dict]) -> None:
+        """Updates the fields of several entries, by hash, in one transaction."""
+        with self._conn:
+            for file_hash, fields in updates.items():
+                # Rows are updated one by one, as legacy catalogs can hold several
+                # entries with the same hash
+                rows = self._conn.execute(
+                    "SELECT id, entry FROM files WHERE file_hash = ? ORDER BY id", (file_hash,)
+                ).fetchall()
+
+                for row_id, entry in rows:
+                    file_entry = json.loads(entry)
+                    file_entry.update(fields)
+                    self._conn.execute(
+                        "UPDATE files SET name = ?, tag = ?, datetime_added = ?, entry = ? "
+                        "WHERE id = ?",
+                        (
+                            file_entry["name"],
+                            file_entry["tag"],
+                            file_entry["datetime_added"],
+                            json.dumps(file_entry, ensure_ascii=False),
+                            row_id,
+                        ),
+                    )
+
+            _set_last_modified(conn=self._conn)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._conn.close()
+
+    def _select(self, where: str, params: tuple) -> list[FileEntry]:
+        with span("metadata.query") as s:
+            rows = self._conn.execute(
+                f"SELECT entry FROM files {where} ORDER BY id", params
+            ).fetchall()
+            s["rows"] = len(rows)
+
+            return [json.loads(row[0]) for row in rows]
+
+
+def migrate_json_to_sqlite(datashelf_path: Path) -> Path:
+    """
+    One-shot migration of the entries in `metadata.json` into a new SQLite catalog.
+    The database is built in a temporary file and moved into place once complete so
+    an interrupted migration never leaves a partial catalog behind.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory.
+
+    Raises:
+        ValueError: If the metadata schema version is not supported.
+
+    Returns:
+        Path: Path to the created catalog database.
+    """
+    metadata = load_metadata(datashelf_path=datashelf_path)
+
+    if metadata.get("schema_version") not in SUPPORTED_SCHEMA_VERSIONS:
+        raise ValueError(
+            f"Cannot migrate metadata with schema_version {metadata.get('schema_version')}. "
+            f"Supported versions: {', '.join(SUPPORTED_SCHEMA_VERSIONS)}"
+        )
+
+    db_path = datashelf_path / CATALOG_DB
+
+    with NamedTemporaryFile(dir=str(datashelf_path), suffix=".sqlite", delete=False) as f:
+        tmp = Path(f.name)
+
+    try:
+        conn = sqlite3.connect(tmp)
+        with conn:
+            _create_schema(conn=conn)
+            _insert_entries(conn=conn, entries=metadata["files"])
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('schema_version', ?), ('last_modified', ?)",
+                (metadata["schema_version"], metadata.get("last_modified")),
+            )
+        conn.close()
+        os.replace(tmp, db_path)
+
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    return db_path
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE files (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_hash TEXT NOT NULL,
+            name TEXT NOT NULL,
+            tag TEXT,
+            datetime_added TEXT,
+            entry TEXT NOT NULL
+        );
+        CREATE INDEX idx_files_file_hash ON files (file_hash);
+        CREATE INDEX idx_files_name ON files (name);
+        CREATE INDEX idx_files_tag ON files (tag);
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        """
+    )
+
+
+def _insert_entries(conn: sqlite3.Connection, entries: list[FileEntry]) -> None:
+    conn.executemany(
+        "INSERT INTO files (file_hash, name, tag, datetime_added, entry) VALUES (?, ?, ?, ?, ?)",
+        [
+            (
+                entry["file_hash"],
+                entry["name"],
+                entry["tag"],
+                entry["datetime_added"],
+                json.dumps(entry, ensure_ascii=False),
+            )
+            for entry in entries
+        ],
+    )
+
+
+def _set_last_modified(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_modified', ?)",
+        (_get_current_timestamp(),),
+    )
+
+
+def _name_patterns(query: EntryQuery) -> list[re.Pattern]:
+    # Globs are matched as regular expressions too, so both catalogs agree on them
+    patterns = []
+
+    if query.get("name_glob"):
+        patterns.append(re.compile(fnmatch.translate(query["name_glob"])))
+
+    if query.get("name_regex"):
+        patterns.append(re.compile(query["name_regex"]))
+
+    return patterns
+
+
+def _matches(entry: FileEntry, query: EntryQuery, patterns: list[re.Pattern]) -> bool:
+    if query.get("tags") and entry["tag"] not in query["tags"]:
+        return False
+
+    if query.get("since") and entry["datetime_added"] < query["since"]:
+        return False
+
+    if query.get("until") and entry["datetime_added"] > query["until"]:
+        return False
+
+    return all(pattern.search(entry["name"]) for pattern in patterns)
+
+
+def _sort_value(entry: FileEntry, field: str) -> str:
+    # Missing tags sort first, as NULLs do in SQLite
+    return entry.get(field) or ""
+
+
+@functools.lru_cache(maxsize=64)
+def _compiled(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def _regexp(pattern: str, value: str | None) -> bool:
+    return value is not None and _compiled(pattern).search(value) is not None
+
+
+def _snapshot_mtime_ns(datashelf_path: Path) -> int:
+    return (datashelf_path / "metadata.json").stat().st_mtime_ns
+
+
+def _prefix_range(prefix: str) -> tuple[str, str]:
+    """
+    Returns the half-open range [prefix, upper) containing every string that
+    starts with prefix, so prefix lookups can use the file_hash index.
+    """
+    return prefix, prefix + "\U0010ffff"
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import io
+import itertools
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterator, TypedDict
+from tempfile import NamedTemporaryFile
+from datashelf.core.metadata import FileEntry, _atomic_write_json, _read_json
+from datashelf.core.storage import LocalStorage, artifact_key
+
+CHUNKS_DIR = "chunks"
+# Reassembled copies of chunked artifacts, for callers that need a file path
+MATERIALIZED_DIR = "materialized"
+MANIFEST_SUFFIX = ".manifest.json"
+
+# Bytes covered by the rolling hash. A boundary depends only on the bytes in this
+# window, so an insertion or deletion only moves the boundaries right next to it.
+WINDOW = 48
+
+# Bytes read from the artifact per pass of the boundary search
+READ_BLOCK = 16 * 1024 * 1024
+
+
+class ChunkManifest(TypedDict):
+    version: int
+    file_hash: str  # content hash of the whole reassembled artifact (see hash_algorithm)
+    size: int
+    chunks: list[tuple[str, int]]  # (sha256, length) in file order
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def store_chunked(
+    datashelf_path: Path,
+    file_path: Path,
+    file_hash: str,
+    avg_chunk_kb: int,
+    layout: str = "flat",
+) -> str:
+    """
+    Stores a file as content-defined chunks plus a manifest.
+
+    Chunk boundaries are placed where a rolling hash of the last WINDOW bytes matches a
+    bit mask, so they follow the content rather than fixed offsets: when a new version
+    of a dataset only differs in a few places, most of its chunks are identical to the
+    previous version's and are not written again. Chunks are content addressed at
+    `chunks/<aa>/<sha256>`.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory.
+        file_path (Path): File to store.
+        file_hash (str): Content hash of the whole file.
+        avg_chunk_kb (int): Approximate average chunk size, in KB.
+        layout (str, optional): 'artifact_layout' the manifest is stored in. Defaults to 'flat'.
+
+    Returns:
+        str: Path of the manifest, relative to datashelf_path, to be used as stored_path.
+    """
+    chunks: list[tuple[str, int]] = []
+    size = 0
+
+    for chunk in iter_chunks(file_path=file_path, avg_chunk_kb=avg_chunk_kb):
+        chunk_hash = hashlib.sha256(chunk).hexdigest()
+        _write_chunk(datashelf_path=datashelf_path, chunk_hash=chunk_hash, chunk=chunk)
+        chunks.append((chunk_hash, len(chunk)))
+        size += len(chunk)
+
+    manifest: ChunkManifest = {
+        "version": 1,
+        "file_hash": file_hash,
+        "size": size,
+        "chunks": chunks,
+    }
+
+    stored_path = artifact_key(filename=f"{file_hash}{MANIFEST_SUFFIX}", layout=layout)
+    _atomic_write_json(path=datashelf_path / stored_path, obj=manifest)
+
+    return stored_path
+
+
+def is_chunked(file_entry: FileEntry) -> bool:
+    return file_entry["stored_path"].endswith(MANIFEST_SUFFIX)
+
+
+def read_manifest(datashelf_path: Path, file_entry: FileEntry) -> ChunkManifest:
+    storage = LocalStorage(root=datashelf_path)
+
+    return _read_json(path=storage.path(storage.locate(file_entry["stored_path"])))
+
+
+def chunk_key(chunk_hash: str) -> str:
+    """Path of a chunk relative to the .datashelf directory."""
+    return f"{CHUNKS_DIR}/{chunk_hash[:2]}/{chunk_hash}"
+
+
+def write_chunked(datashelf_path: Path, manifest: ChunkManifest, out: BinaryIO) -> None:
+    """
+    Reassembles a chunked artifact by writing its chunks in order to a binary file object.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory.
+        manifest (ChunkManifest): Manifest of the artifact.
+        out (BinaryIO): File object to write the artifact to.
+    """
+    for chunk_hash, _ in manifest["chunks"]:
+        chunk_path = _chunk_path(datashelf_path=datashelf_path, chunk_hash=chunk_hash)
+        out.write(chunk_path.read_bytes())
+
+
+def open_chunked(datashelf_path: Path, manifest: ChunkManifest) -> io.BytesIO:
+    """
+    Reassembles a chunked artifact in memory, for readers that accept file objects.
+    """
+    buffer = io.BytesIO()
+    write_chunked(datashelf_path=datashelf_path, manifest=manifest, out=buffer)
+    buffer.seek(0)
+
+    return buffer
+
+
+def read_range(
+    datashelf_path: Path, manifest: ChunkManifest, offset: int, length: int
+) -> bytes:
+    """
+    Reads length bytes at offset of a chunked artifact, opening only the chunks that
+    overlap them, e.g. to read a parquet footer without reassembling the artifact.
+    """
+    with ChunkedFile(datashelf_path=datashelf_path, manifest=manifest) as f:
+        f.seek(offset)
+        return f.read(length)
+
+
+class ChunkedFile(io.RawIOBase):
+    """
+    Read-only, seekable file object over a chunked artifact. Chunks are only opened as
+    their bytes are read, so readers that seek (e.g. to a parquet footer and then to a
+    few column chunks) touch only the chunks they need instead of reassembling the
+    whole artifact like `open_chunked`.
+    """
+
+    def __init__(self, datashelf_path: Path, manifest: ChunkManifest):
+        super().__init__()
+        self._datashelf_path = datashelf_path
+        self._chunks = manifest["chunks"]
+        self._size = manifest["size"]
+        # Offset of each chunk in the artifact
+        self._starts = list(
+            itertools.accumulate((length for _, length in self._chunks[:-1]), initial=0)
+        )
+        self._pos = 0
+        # The last chunk read, as readers often read one region in several calls
+        self._cached: tuple[int, bytes] | None = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+
+        self._pos = max(offset, 0)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        written = 0
+
+        while written < len(view) and self._pos < self._size:
+            index = bisect.bisect_right(self._starts, self._pos) - 1
+            chunk = self._read_chunk(index=index)
+            start = self._pos - self._starts[index]
+            piece = chunk[start : start + len(view) - written]
+
+            view[written : written + len(piece)] = piece
+            written += len(piece)
+            self._pos += len(piece)
+
+        return written
+
+    def _read_chunk(self, index: int) -> bytes:
+        if self._cached is None or self._cached[0] != index:
+            chunk_hash = self._chunks[index][0]
+            chunk_path = _chunk_path(
+                datashelf_path=self._datashelf_path, chunk_hash=chunk_hash
+            )
+            self._cached = (index, chunk_path.read_bytes())
+
+        return self._cached[1]
+
+
+def materialize_chunked(datashelf_path: Path, manifest: ChunkManifest) -> Path:
+    """
+    Reassembles a chunked artifact into `materialized/<hash>.parquet`, atomically, and
+    returns its path. An existing copy is reused. These copies can be deleted at any time.
+    """
+    dest = datashelf_path / MATERIALIZED_DIR / f"{manifest['file_hash']}.parquet"
+
+    if dest.exists():
+        return dest
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    with NamedTemporaryFile(dir=str(dest.parent), prefix=".", delete=False) as f:
+        tmp = Path(f.name)
+        write_chunked(datashelf_path=datashelf_path, manifest=manifest, out=f)
+
+    os.replace(tmp, dest)
+    return dest
+
+
+def iter_chunks(file_path: Path, avg_chunk_kb: int) -> Iterator[bytes]:
+    """
+    Splits a file into content-defined chunks between avg/4 and avg*4 bytes long.
+    The chunks do not depend on READ_BLOCK, only on the bytes of the file.
+
+    Args:
+        file_path (Path): File to split.
+        avg_chunk_kb (int): Approximate average chunk size, in KB.
+
+    Yields:
+        bytes: The chunks, in file order.
+    """
+    avg = avg_chunk_kb * 1024
+    min_size, max_size = max(avg // 4, WINDOW), avg * 4
+    # Boundaries are candidates with mask bits clear, i.e. on average every avg - min_size bytes
+    mask = (1 << max((avg - min_size).bit_length() - 1, 1)) - 1
+
+    pending = b""
+
+    with open(file_path, "rb") as f:
+        while block := f.read(READ_BLOCK):
+            pending += block
+            cuts = _find_cuts(data=pending, min_size=min_size, max_size=max_size, mask=mask)
+
+            start = 0
+            for cut in cuts:
+                yield pending[start:cut]
+                start = cut
+
+            pending = pending[start:]
+
+            # No candidate was accepted in what is left, so a whole-file pass would
+            # also force cuts every max_size bytes here. Keeps memory bounded.
+            while len(pending) > max_size:
+                yield pending[:max_size]
+                pending = pending[max_size:]
+
+    if pending:
+        yield pending
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _find_cuts(data: bytes, min_size: int, max_size: int, mask: int) -> list[int]:
+    """
+    Returns the chunk end offsets in data, which starts at a chunk boundary. The
+    rolling hash is the wrapping sum of _gear_table()[b] over the last WINDOW bytes,
+    computed for every offset at once from a cumulative sum. Only offsets at least
+    min_size into a chunk are considered, so the whole window always lies inside data.
+    """
+    import numpy as np
+
+    if len(data) <= min_size:
+        return []
+
+    values = _gear_table()[np.frombuffer(data, dtype=np.uint8)]
+    cumulative = np.cumsum(values, dtype=np.uint64)
+
+    # rolling[i] covers data[i - WINDOW + 1 : i + 1]
+    rolling = cumulative[WINDOW - 1 :].copy()
+    rolling[1:] -= cumulative[: len(cumulative) - WINDOW]
+
+    # +WINDOW maps a position in rolling to the end offset of the chunk
+    hits = ((rolling >> np.uint64(16)) & np.uint64(mask)) == 0
+    candidates = np.flatnonzero(hits) + WINDOW
+
+    cuts = []
+    start = 0
+    for candidate in candidates.tolist():
+        while candidate - start > max_size:
+            start += max_size
+            cuts.append(start)
+
+        if candidate - start >= min_size:
+            cuts.append(candidate)
+            start = candidate
+
+    return cuts
+
+
+_GEAR_TABLE = None
+
+
+def _gear_table():
+    global _GEAR_TABLE
+
+    if _GEAR_TABLE is None:
+        import numpy as np
+
+        # Pseudo-random 64-bit value per byte value. Derived from sha256 rather than a
+        # seeded RNG so it can never change between library versions: the same bytes
+        # have to produce the same chunks on every save.
+        _GEAR_TABLE = np.array(
+            [
+                int.from_bytes(hashlib.sha256(bytes([b])).digest()[:8], "little")
+                for b in range(256)
+            ],
+            dtype=np.uint64,
+        )
+
+    return _GEAR_TABLE
+
+
+def _chunk_path(datashelf_path: Path, chunk_hash: str) -> Path:
+    return datashelf_path / chunk_key(chunk_hash)
+
+
+def _write_chunk(datashelf_path: Path, chunk_hash: str, chunk: bytes) -> None:
+    path = _chunk_path(datashelf_path=datashelf_path, chunk_hash=chunk_hash)
+
+    # Chunks are immutable, so one that is already stored is shared as is. Its mtime is
+    # refreshed so `gc` does not sweep it before the new manifest is registered.
+    if path.exists():
+        os.utime(path)
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with NamedTemporaryFile(dir=str(path.parent), prefix=".", delete=False) as f:
+        tmp = Path(f.name)
+        f.write(chunk)
+
+    os.replace(tmp, path)
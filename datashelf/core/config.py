@@ -1,18 +1,59 @@
-import yaml
+import copy
 from pathlib import Path
 from typing import Literal
+from datashelf.core.parquet_options import (
+    DEFAULT_WRITE_OPTIONS,
+    ParquetWriteOptions,
+    validate_write_options,
+)
 
 Tags = list[str]
 Config = dict[str, dict[str, bool | Tags | str]]
 
+CATALOG_BACKENDS = ["json", "sqlite"]
+CHECKOUT_MODES = ["copy", "reflink", "hardlink"]
+HASH_ALGORITHMS = ["sha256", "blake2b", "blake2b-tree"]
+STORAGE_BACKENDS = ["local", "remote"]
+DF_CACHE_MODES = ["copy", "readonly"]
+ARTIFACT_LAYOUTS = ["flat", "sharded"]
+DEFAULT_INGEST_MEMORY_BUDGET_MB = 512
+DEFAULT_HASH_BUFFER_MB = 4
+DEFAULT_JOURNAL_COMPACT_KB = 1024
+DEFAULT_CHUNK_AVG_KB = 1024
+DEFAULT_ASYNC_MAX_CONCURRENCY = 4
+DEFAULT_TRANSFER_WORKERS = 8
+DEFAULT_TRANSFER_PART_MB = 8
+
 
 def init_config(datashelf_path: Path):
+    import yaml
+
     config: Config = {}
 
     config["config"] = {
         "enforce_ccds_tags": True,
         "allowed_tags": ["raw", "external", "intermediate", "processed"],
         "parquet_engine": "fastparquet",
+        **{f"parquet_{key}": value for key, value in DEFAULT_WRITE_OPTIONS.items()},
+        "catalog_backend": "json",
+        "stream_csv": False,
+        "ingest_memory_budget_mb": DEFAULT_INGEST_MEMORY_BUDGET_MB,
+        "hash_algorithm": "sha256",
+        "hash_buffer_mb": DEFAULT_HASH_BUFFER_MB,
+        "fingerprint_cache": True,
+        "fingerprint_fast_hash": False,
+        "journal_compact_kb": DEFAULT_JOURNAL_COMPACT_KB,
+        "checkout_mode": "copy",
+        "chunked_storage": False,
+        "chunk_avg_kb": DEFAULT_CHUNK_AVG_KB,
+        "artifact_layout": "flat",
+        "async_max_concurrency": DEFAULT_ASYNC_MAX_CONCURRENCY,
+        "storage_backend": "local",
+        "remote_path": None,
+        "transfer_workers": DEFAULT_TRANSFER_WORKERS,
+        "transfer_part_mb": DEFAULT_TRANSFER_PART_MB,
+        "df_cache_mb": 0,
+        "df_cache_mode": "copy",
     }
 
     with open(datashelf_path / "config.yaml", "w") as config_file:
@@ -20,10 +61,7 @@ def init_config(datashelf_path: Path):
 
 
 def get_config_tags_settings(datashelf_path: Path) -> tuple[bool, list]:
-    with open(datashelf_path / "config.yaml", "r") as config_file:
-        content = yaml.safe_load(config_file)
-
-    config = content["config"]
+    config = _read_config(datashelf_path=datashelf_path)
 
     if config["enforce_ccds_tags"]:
         return True, config["allowed_tags"]
@@ -37,10 +75,7 @@ def validate_tags(tag: str, allowed_tags: list[str]):
 
 
 def get_parquet_engine(datashelf_path: Path) -> Literal["pyarrow", "fastparquet"]:
-    with open(datashelf_path / "config.yaml", "r") as config_file:
-        content = yaml.safe_load(config_file)
-
-    config = content["config"]
+    config = _read_config(datashelf_path=datashelf_path)
 
     if config["parquet_engine"] not in ["pyarrow", "fastparquet"]:
         msg = (
@@ -50,3 +85,284 @@ def get_parquet_engine(datashelf_path: Path) -> Literal["pyarrow", "fastparquet"
         raise ValueError(msg)
 
     return config["parquet_engine"]
+
+
+def get_parquet_write_options(datashelf_path: Path) -> ParquetWriteOptions:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    # Each option is stored as 'parquet_<option>'; missing ones keep their defaults
+    options = {
+        key: config[f"parquet_{key}"]
+        for key in DEFAULT_WRITE_OPTIONS
+        if f"parquet_{key}" in config
+    }
+
+    return validate_write_options(
+        options=options,
+        engine=get_parquet_engine(datashelf_path=datashelf_path),
+        source=" in config.yaml file",
+    )
+
+
+def get_catalog_backend(datashelf_path: Path) -> Literal["json", "sqlite"]:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    # Shelves created before the catalog setting existed keep using metadata.json
+    backend = config.get("catalog_backend", "json")
+
+    if backend not in CATALOG_BACKENDS:
+        msg = (
+            f"{backend} is an invalid value for 'catalog_backend' in config.yaml file. "
+            "Please change to either 'json' or 'sqlite'"
+        )
+        raise ValueError(msg)
+
+    return backend
+
+
+def get_ingest_settings(datashelf_path: Path) -> tuple[bool, int]:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    stream_csv = config.get("stream_csv", False)
+    memory_budget_mb = config.get(
+        "ingest_memory_budget_mb", DEFAULT_INGEST_MEMORY_BUDGET_MB
+    )
+
+    if not isinstance(memory_budget_mb, int) or memory_budget_mb <= 0:
+        msg = (
+            f"{memory_budget_mb} is an invalid value for 'ingest_memory_budget_mb' in config.yaml file. "
+            "Please change to a positive whole number of megabytes."
+        )
+        raise ValueError(msg)
+
+    return bool(stream_csv), memory_budget_mb
+
+
+def get_hash_algorithm(
+    datashelf_path: Path,
+) -> Literal["sha256", "blake2b", "blake2b-tree"]:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    algorithm = config.get("hash_algorithm", "sha256")
+
+    if algorithm not in HASH_ALGORITHMS:
+        msg = (
+            f"{algorithm} is an invalid value for 'hash_algorithm' in config.yaml file. "
+            "Please change to either 'sha256', 'blake2b' or 'blake2b-tree'"
+        )
+        raise ValueError(msg)
+
+    return algorithm
+
+
+def get_hash_buffer_size(datashelf_path: Path) -> int:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    buffer_mb = config.get("hash_buffer_mb", DEFAULT_HASH_BUFFER_MB)
+
+    if not isinstance(buffer_mb, (int, float)) or buffer_mb <= 0:
+        msg = (
+            f"{buffer_mb} is an invalid value for 'hash_buffer_mb' in config.yaml file. "
+            "Please change to a positive number of megabytes."
+        )
+        raise ValueError(msg)
+
+    return int(buffer_mb * 1024 * 1024)
+
+
+def get_fingerprint_settings(datashelf_path: Path) -> tuple[bool, bool]:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    return (
+        bool(config.get("fingerprint_cache", True)),
+        bool(config.get("fingerprint_fast_hash", False)),
+    )
+
+
+def get_journal_compact_bytes(datashelf_path: Path) -> int:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    compact_kb = config.get("journal_compact_kb", DEFAULT_JOURNAL_COMPACT_KB)
+
+    if not isinstance(compact_kb, int) or compact_kb < 0:
+        msg = (
+            f"{compact_kb} is an invalid value for 'journal_compact_kb' in config.yaml file. "
+            "Please change to a whole number of kilobytes (0 compacts after every commit)."
+        )
+        raise ValueError(msg)
+
+    return compact_kb * 1024
+
+
+def get_checkout_mode(datashelf_path: Path) -> Literal["copy", "reflink", "hardlink"]:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    mode = config.get("checkout_mode", "copy")
+
+    if mode not in CHECKOUT_MODES:
+        msg = (
+            f"{mode} is an invalid value for 'checkout_mode' in config.yaml file. "
+            "Please change to either 'copy', 'reflink' or 'hardlink'"
+        )
+        raise ValueError(msg)
+
+    return mode
+
+
+def get_chunk_settings(datashelf_path: Path) -> tuple[bool, int]:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    chunked = config.get("chunked_storage", False)
+    avg_kb = config.get("chunk_avg_kb", DEFAULT_CHUNK_AVG_KB)
+
+    if not isinstance(avg_kb, int) or avg_kb < 4:
+        msg = (
+            f"{avg_kb} is an invalid value for 'chunk_avg_kb' in config.yaml file. "
+            "Please change to a whole number of kilobytes of at least 4."
+        )
+        raise ValueError(msg)
+
+    return bool(chunked), avg_kb
+
+
+def get_artifact_layout(datashelf_path: Path) -> Literal["flat", "sharded"]:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    # Shelves created before the layout setting existed keep every artifact in one directory
+    layout = config.get("artifact_layout", "flat")
+
+    if layout not in ARTIFACT_LAYOUTS:
+        msg = (
+            f"{layout} is an invalid value for 'artifact_layout' in config.yaml file. "
+            "Please change to either 'flat' or 'sharded'"
+        )
+        raise ValueError(msg)
+
+    return layout
+
+
+def get_async_max_concurrency(datashelf_path: Path) -> int:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    limit = config.get("async_max_concurrency", DEFAULT_ASYNC_MAX_CONCURRENCY)
+
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+        msg = (
+            f"{limit} is an invalid value for 'async_max_concurrency' in config.yaml file. "
+            "Please change to a positive whole number."
+        )
+        raise ValueError(msg)
+
+    return limit
+
+
+def get_storage_backend(datashelf_path: Path) -> Literal["local", "remote"]:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    backend = config.get("storage_backend", "local")
+
+    if backend not in STORAGE_BACKENDS:
+        msg = (
+            f"{backend} is an invalid value for 'storage_backend' in config.yaml file. "
+            "Please change to either 'local' or 'remote'"
+        )
+        raise ValueError(msg)
+
+    if backend == "remote" and not config.get("remote_path"):
+        msg = (
+            "'storage_backend' is 'remote' but no 'remote_path' is set in config.yaml file. "
+            "Please set 'remote_path' to the remote store directory."
+        )
+        raise ValueError(msg)
+
+    return backend
+
+
+def get_remote_path(datashelf_path: Path) -> Path | None:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    remote_path = config.get("remote_path")
+
+    if remote_path is None:
+        return None
+
+    if not isinstance(remote_path, str) or not remote_path.strip():
+        msg = (
+            f"{remote_path} is an invalid value for 'remote_path' in config.yaml file. "
+            "Please change to the path of the remote store directory."
+        )
+        raise ValueError(msg)
+
+    # Relative paths are relative to the project directory holding .datashelf
+    return (datashelf_path.parent / Path(remote_path).expanduser()).resolve()
+
+
+def get_transfer_settings(datashelf_path: Path) -> tuple[int, int]:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    workers = config.get("transfer_workers", DEFAULT_TRANSFER_WORKERS)
+    part_mb = config.get("transfer_part_mb", DEFAULT_TRANSFER_PART_MB)
+
+    if not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+        msg = (
+            f"{workers} is an invalid value for 'transfer_workers' in config.yaml file. "
+            "Please change to a positive whole number."
+        )
+        raise ValueError(msg)
+
+    if not isinstance(part_mb, (int, float)) or isinstance(part_mb, bool) or part_mb <= 0:
+        msg = (
+            f"{part_mb} is an invalid value for 'transfer_part_mb' in config.yaml file. "
+            "Please change to a positive number of megabytes."
+        )
+        raise ValueError(msg)
+
+    return workers, int(part_mb * 1024 * 1024)
+
+
+def get_df_cache_settings(datashelf_path: Path) -> tuple[int, Literal["copy", "readonly"]]:
+    config = _read_config(datashelf_path=datashelf_path)
+
+    cache_mb = config.get("df_cache_mb", 0)
+    mode = config.get("df_cache_mode", "copy")
+
+    if not isinstance(cache_mb, (int, float)) or isinstance(cache_mb, bool) or cache_mb < 0:
+        msg = (
+            f"{cache_mb} is an invalid value for 'df_cache_mb' in config.yaml file. "
+            "Please change to a number of megabytes (0 turns the cache off)."
+        )
+        raise ValueError(msg)
+
+    if mode not in DF_CACHE_MODES:
+        msg = (
+            f"{mode} is an invalid value for 'df_cache_mode' in config.yaml file. "
+            "Please change to either 'copy' or 'readonly'"
+        )
+        raise ValueError(msg)
+
+    return int(cache_mb * 1024 * 1024), mode
+
+
+# Parsed config.yaml per path, with the (mtime_ns, size, inode) it was parsed at
+_CONFIG_CACHE: dict[Path, tuple[tuple[int, int, int], dict]] = {}
+
+
+def _read_config(datashelf_path: Path) -> dict:
+    config_path = datashelf_path / "config.yaml"
+    stat = config_path.stat()
+    key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    # Re-parse only when the file changed, so repeated getters cost a stat() call
+    cached = _CONFIG_CACHE.get(config_path)
+    # Callers get a copy, so mutating a returned value cannot change the cache
+    if cached is not None and cached[0] == key:
+        return copy.deepcopy(cached[1])
+
+    # YAML is imported on first use so commands that never touch config.yaml stay fast
+    import yaml
+
+    with open(config_path, "r") as config_file:
+        content = yaml.safe_load(config_file)
+
+    _CONFIG_CACHE[config_path] = (key, content["config"])
+    return copy.deepcopy(content["config"])
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Literal, TYPE_CHECKING, TypedDict
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DataFrameCacheMode = Literal["copy", "readonly"]
+
+
+class CacheInfo(TypedDict):
+    hits: int
+    misses: int
+    evictions: int  # DataFrames dropped to stay within max_bytes
+    entries: int
+    bytes: int  # memory held by the cached DataFrames
+    max_bytes: int
+
+
+class DataFrameCache:
+    """
+    LRU cache of decoded DataFrames, bounded by the memory they hold. Artifacts are
+    immutable, so a DataFrame keyed by its artifact hash (and the columns and filters
+    it was read with) never goes stale.
+
+    Cached DataFrames are never handed out directly. In 'copy' mode every hit returns
+    a deep copy, which callers may modify freely. In 'readonly' mode the cached data is
+    marked read-only and hits return a shallow copy sharing it: columns can be added or
+    dropped, but writing to existing values raises instead of corrupting the cache.
+    """
+
+    def __init__(self, max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self._frames: OrderedDict[Hashable, tuple[pd.DataFrame, int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def get(self, key: Hashable, mode: DataFrameCacheMode) -> pd.DataFrame | None:
+        with self._lock:
+            cached = self._frames.get(key)
+
+            if cached is None:
+                self._misses += 1
+                return None
+
+            self._frames.move_to_end(key)
+            self._hits += 1
+
+        return _hand_out(df=cached[0], mode=mode)
+
+    def put(self, key: Hashable, df: pd.DataFrame, mode: DataFrameCacheMode) -> pd.DataFrame:
+        """Caches a freshly read DataFrame and returns what the caller should get."""
+        size = int(df.memory_usage(index=True, deep=True).sum())
+
+        # Larger than the whole budget: caching it would only evict everything else
+        if size > self.max_bytes:
+            return df
+
+        if mode == "readonly":
+            _freeze(df=df)
+
+        with self._lock:
+            if key not in self._frames:
+                self._frames[key] = (df, size)
+                self._bytes += size
+                self._evict()
+
+        return _hand_out(df=df, mode=mode)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._frames),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        """Drops every cached DataFrame and resets the counters."""
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._frames:
+            _, (_, size) = self._frames.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+
+
+# Shared by every shelf in the process: keys start with the artifact hash, so
+# artifacts stored on several shelves are cached once
+DF_CACHE = DataFrameCache()
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _hand_out(df: pd.DataFrame, mode: DataFrameCacheMode) -> pd.DataFrame:
+    if mode == "readonly":
+        # Frames cached in 'copy' mode are frozen the first time they are shared
+        _freeze(df=df)
+        return df.copy(deep=False)
+
+    return df.copy(deep=True)
+
+
+def _freeze(df: pd.DataFrame) -> None:
+    import numpy as np
+
+    # The block arrays themselves: flags set on a column view would not stop
+    # writes through the block. Extension arrays (e.g. Arrow-backed) are left as is.
+    for array in df._mgr.arrays:
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
@@ -1,5 +1,9 @@
+import os
 from pathlib import Path
 
+# Environment variable pointing at a project directory or its .datashelf directory
+DATASHELF_PATH_ENV = "DATASHELF_PATH"
+
 
 def init_datashelf_directory(datashelf_path: Path) -> bool:
     """
@@ -21,12 +25,20 @@ def init_datashelf_directory(datashelf_path: Path) -> bool:
 
 def find_datashelf_path() -> Path:
     """
-    Walk up from current working directory and check for a
+    Returns the .datashelf directory named by the DATASHELF_PATH environment variable
+    if it is set, else walks up from the current working directory and checks for a
     .datashelf directory.
 
+    Raises:
+        FileNotFoundError: If no .datashelf directory is found.
+
     Returns:
-        Path | None: Path of .datashelf directory or None
+        Path: Path of .datashelf directory
     """
+    env_path = os.environ.get(DATASHELF_PATH_ENV)
+    if env_path:
+        return resolve_datashelf_path(path=env_path)
+
     curr_path = Path().cwd()
 
     while curr_path != curr_path.parent:
@@ -44,3 +56,29 @@ def find_datashelf_path() -> Path:
     )
 
     raise FileNotFoundError(msg)
+
+
+def resolve_datashelf_path(path: str | Path) -> Path:
+    """
+    Returns the .datashelf directory for a path that is either a project directory
+    containing one or the .datashelf directory itself.
+
+    Args:
+        path (str | Path): Project directory or .datashelf directory.
+
+    Raises:
+        FileNotFoundError: If there is no .datashelf directory at path.
+
+    Returns:
+        Path: Resolved path of the .datashelf directory.
+    """
+    path = Path(path).expanduser()
+    datashelf_path = path if path.name == ".datashelf" else path / ".datashelf"
+
+    if not datashelf_path.is_dir():
+        raise FileNotFoundError(
+            f"No Datashelf repository found at {path}. "
+            "Run `datashelf init` there or point to an existing .datashelf folder."
+        )
+
+    return datashelf_path.resolve()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+from pathlib import Path
+from typing import Literal
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux ioctl that makes the destination share the source's extents (copy-on-write).
+# Supported by btrfs, XFS (reflink=1), bcachefs and recent overlayfs/NFS setups.
+FICLONE = 0x40049409
+
+# Bytes requested per copy_file_range call
+COPY_CHUNK = 64 * 1024 * 1024
+
+# Errors meaning "this filesystem/kernel cannot do that", as opposed to real I/O errors
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EPERM,
+    errno.EOPNOTSUPP,
+    errno.EMLINK,
+}
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def place_file(
+    src: Path, dest: Path, mode: Literal["copy", "reflink", "hardlink"] = "copy"
+) -> Literal["copy", "reflink", "hardlink"]:
+    """
+    Materializes src at dest without going through Python buffers where possible.
+
+    'hardlink' links dest to the same inode as src, 'reflink' creates a copy-on-write
+    clone, and 'copy' copies the bytes in the kernel with copy_file_range (or sendfile).
+    When the requested method is not supported, e.g. across filesystems, the next
+    cheapest one is used. dest must not exist.
+
+    Args:
+        src (Path): File to copy.
+        dest (Path): Destination file path.
+        mode (Literal["copy", "reflink", "hardlink"], optional): Preferred method. Defaults to "copy".
+
+    Raises:
+        FileExistsError: If dest already exists.
+
+    Returns:
+        Literal["copy", "reflink", "hardlink"]: The method that was actually used.
+    """
+    if mode == "hardlink":
+        try:
+            os.link(src, dest)
+            return "hardlink"
+
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+
+    with open(src, "rb") as fsrc, open(dest, "xb") as fdst:
+        try:
+            if mode == "reflink" and _reflink(fsrc=fsrc, fdst=fdst):
+                used = "reflink"
+            else:
+                _copy_contents(fsrc=fsrc, fdst=fdst)
+                used = "copy"
+
+        except BaseException:
+            fdst.close()
+            dest.unlink(missing_ok=True)
+            raise
+
+    shutil.copystat(src, dest)
+    return used
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _reflink(fsrc, fdst) -> bool:
+    if fcntl is None:
+        return False
+
+    try:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        return True
+
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED:
+            raise
+        return False
+
+
+def _copy_contents(fsrc, fdst) -> None:
+    # Both kernel paths fall back only before any byte was written, so a partial
+    # copy is never continued by another method
+    if _copy_file_range(fsrc=fsrc, fdst=fdst) or _sendfile(fsrc=fsrc, fdst=fdst):
+        return
+
+    shutil.copyfileobj(fsrc, fdst, COPY_CHUNK)
+
+
+def _copy_file_range(fsrc, fdst) -> bool:
+    """
+    Copies the whole file with copy_file_range, which stays in the kernel and lets the
+    filesystem clone or offload the copy. Returns False if it is unavailable here.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return False
+
+    return _kernel_copy(
+        fsrc=fsrc,
+        fdst=fdst,
+        copy=lambda in_fd, out_fd, offset: os.copy_file_range(in_fd, out_fd, COPY_CHUNK),
+    )
+
+
+def _sendfile(fsrc, fdst) -> bool:
+    if not hasattr(os, "sendfile"):
+        return False
+
+    return _kernel_copy(
+        fsrc=fsrc,
+        fdst=fdst,
+        copy=lambda in_fd, out_fd, offset: os.sendfile(out_fd, in_fd, offset, COPY_CHUNK),
+    )
+
+
+def _kernel_copy(fsrc, fdst, copy) -> bool:
+    in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+    copied = 0
+
+    while True:
+        try:
+            n = copy(in_fd, out_fd, copied)
+
+        except OSError as e:
+            if e.errno in _UNSUPPORTED and copied == 0:
+                return False
+            raise
+
+        if n == 0:
+            # Some filesystems (e.g. procfs-like or FUSE ones) report a size but copy
+            # nothing, which looks like end of file on the first call
+            return copied > 0 or os.fstat(in_fd).st_size == 0
+
+        copied += n
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import TypedDict, Optional
+from datashelf.core.metadata import metadata_lock, _atomic_write_json, _read_json
+
+FINGERPRINT_CACHE = "fingerprints.json"
+FAST_HASH_BUFFER = 4 * 1024 * 1024
+
+
+class Fingerprint(TypedDict):
+    path: str  # resolved source path
+    size: int
+    mtime_ns: int
+    inode: int
+    raw_hash: Optional[str]  # only set when fast hashing is enabled
+    # Only present for a sheet of an xlsx workbook saved on its own, since every sheet
+    # of a workbook is a different artifact produced from the same file
+    sheet: str
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def source_fingerprint(
+    data_path: Path, fast_hash: bool = False, sheet: str | None = None
+) -> Fingerprint:
+    """
+    Fingerprints a source file by its resolved path, size, modification time and inode.
+    With fast_hash, a blake2b digest of the raw bytes is added so edits that preserve
+    size and mtime are also detected.
+
+    Args:
+        data_path (Path): Path to the source data file.
+        fast_hash (bool, optional): Whether to also hash the raw bytes. Defaults to False.
+        sheet (str | None, optional): Sheet of an xlsx file the artifact is made from.
+            Defaults to None (the whole file, or its first sheet).
+
+    Returns:
+        Fingerprint: The fingerprint of the source file.
+    """
+    resolved = Path(data_path).resolve()
+    stat = resolved.stat()
+
+    fingerprint: Fingerprint = {
+        "path": str(resolved),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "inode": stat.st_ino,
+        "raw_hash": _fast_hash(path=resolved) if fast_hash else None,
+    }
+
+    if sheet is not None:
+        fingerprint["sheet"] = sheet
+
+    return fingerprint
+
+
+def lookup_fingerprint(
+    datashelf_path: Path, fingerprint: Fingerprint, conversion: dict
+) -> str | None:
+    """
+    Returns the artifact hash recorded for a source file if every fingerprint field and
+    the conversion settings used to produce the artifact are unchanged, else None.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory.
+        fingerprint (Fingerprint): Current fingerprint of the source file.
+        conversion (dict): Settings that affect the artifact bytes (e.g. parquet engine).
+
+    Returns:
+        str | None: The cached artifact hash, or None on a cache miss.
+    """
+    cached = _read_cache(datashelf_path=datashelf_path).get(_cache_key(fingerprint))
+
+    if cached is None:
+        return None
+
+    if cached["fingerprint"] != fingerprint or cached["conversion"] != conversion:
+        return None
+
+    return cached["artifact_hash"]
+
+
+def record_fingerprint(
+    datashelf_path: Path, fingerprint: Fingerprint, conversion: dict, artifact_hash: str
+) -> None:
+    """
+    Records the artifact hash produced from a source file. Nothing is recorded if the
+    file changed since it was fingerprinted, since the artifact may reflect either version.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory.
+        fingerprint (Fingerprint): Fingerprint taken before the source file was converted.
+        conversion (dict): Settings that affect the artifact bytes (e.g. parquet engine).
+        artifact_hash (str): Hash of the artifact produced from the source file.
+    """
+    record_fingerprints(
+        datashelf_path=datashelf_path,
+        records=[(fingerprint, conversion, artifact_hash)],
+    )
+
+
+def record_fingerprints(
+    datashelf_path: Path, records: list[tuple[Fingerprint, dict, str]]
+) -> None:
+    """
+    Batch version of record_fingerprint that writes the cache once. The cache is
+    updated under the metadata lock so concurrent saves do not drop each other's records.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory.
+        records (list[tuple[Fingerprint, dict, str]]): (fingerprint, conversion, artifact_hash)
+            for each converted source file.
+    """
+    # Fingerprints are re-taken first, outside the lock, since fast_hash reads the file
+    unchanged = [
+        (fingerprint, conversion, artifact_hash)
+        for fingerprint, conversion, artifact_hash in records
+        if source_fingerprint(
+            data_path=Path(fingerprint["path"]),
+            fast_hash=fingerprint["raw_hash"] is not None,
+            sheet=fingerprint.get("sheet"),
+        )
+        == fingerprint
+    ]
+
+    if not unchanged:
+        return
+
+    with metadata_lock(datashelf_path=datashelf_path):
+        cache = _read_cache(datashelf_path=datashelf_path)
+
+        for fingerprint, conversion, artifact_hash in unchanged:
+            cache[_cache_key(fingerprint)] = {
+                "fingerprint": fingerprint,
+                "conversion": conversion,
+                "artifact_hash": artifact_hash,
+            }
+
+        _atomic_write_json(
+            path=datashelf_path / FINGERPRINT_CACHE,
+            obj={"version": 1, "entries": cache},
+        )
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _cache_key(fingerprint: Fingerprint) -> str:
+    if "sheet" in fingerprint:
+        return f"{fingerprint['path']}#{fingerprint['sheet']}"
+
+    return fingerprint["path"]
+
+
+def _read_cache(datashelf_path: Path) -> dict:
+    cache_path = datashelf_path / FINGERPRINT_CACHE
+
+    if not cache_path.exists():
+        return {}
+
+    # The cache is only an accelerator, so an unreadable file is treated as empty
+    try:
+        return _read_json(path=cache_path).get("entries", {})
+    except (ValueError, OSError, AttributeError):
+        return {}
+
+
+def _fast_hash(path: Path) -> str:
+    file_hash = hashlib.blake2b(digest_size=16)
+
+    with open(path, "rb", buffering=0) as f:
+        while chunk := f.read(FAST_HASH_BUFFER):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
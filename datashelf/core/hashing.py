@@ -1,35 +1,259 @@
+from __future__ import annotations
+
 import hashlib
-import pandas as pd
+import io
+import os
+from collections import deque
 from pathlib import Path
-from typing import Literal
+from typing import Literal, TYPE_CHECKING
+from datashelf.core.config import (
+    DEFAULT_INGEST_MEMORY_BUDGET_MB,
+    DEFAULT_HASH_BUFFER_MB,
+    HASH_ALGORITHMS,
+)
+from datashelf.core.parquet_options import (
+    DEFAULT_WRITE_OPTIONS,
+    ParquetWriteOptions,
+    pandas_write_kwargs,
+)
+from datashelf.core.profiling import span
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+HashAlgorithm = Literal["sha256", "blake2b", "blake2b-tree"]
+
+# Leaf size of the "blake2b-tree" mode. Part of the hash definition: changing it
+# changes every tree hash, so it is a constant rather than a setting.
+TREE_SEGMENT_SIZE = 8 * 1024 * 1024
+DIGEST_SIZE = 32
+
+
+class TreeHasher:
+    """
+    hashlib-style hasher for the "blake2b-tree" algorithm: the input is split into
+    TREE_SEGMENT_SIZE segments, each hashed as a BLAKE2b leaf node on a thread pool
+    (hashlib releases the GIL while hashing), and the leaf digests are combined by a
+    BLAKE2b root node. Uses BLAKE2b's own tree parameters (fanout, depth, node
+    offset), so it is a standard BLAKE2b tree and never equals a plain BLAKE2b hash.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self._buffer = bytearray()
+        self._leaves = []
+        # Leaves not known to be hashed yet, oldest first
+        self._pending = deque()
+        self._max_workers = max_workers or min(32, os.cpu_count() or 1)
+        self._executor = None
+        self._digest = None
+
+    def update(self, data) -> None:
+        self._buffer += data
+
+        # A segment is only hashed once more data follows it, so the last leaf (which
+        # is flagged as such) is always still in the buffer when the digest is taken
+        while len(self._buffer) > TREE_SEGMENT_SIZE:
+            segment = bytes(self._buffer[:TREE_SEGMENT_SIZE])
+            del self._buffer[:TREE_SEGMENT_SIZE]
+            self._submit(segment)
+
+    def hexdigest(self) -> str:
+        if self._digest is None:
+            leaves = [leaf.result() for leaf in self._leaves]
+            leaves.append(
+                _tree_leaf(data=bytes(self._buffer), index=len(leaves), last=True)
+            )
+            self._digest = _tree_root(leaves=leaves)
+            self.close()
+
+        return self._digest
+
+    def close(self) -> None:
+        """Stops the hashing threads. Segments not hashed yet are dropped."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, segment: bytes) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+
+        # Bound the segments held in memory while waiting to be hashed. The pool hashes
+        # them in order, so the oldest leaf is the one to wait for.
+        pending = self._pending
+        while pending and pending[0].done():
+            pending.popleft()
 
+        if len(pending) >= 2 * self._max_workers:
+            pending.popleft().result()
 
-def sha256_hex(data_path: Path, chunk_size=8192):
+        leaf = self._executor.submit(
+            _tree_leaf, data=segment, index=len(self._leaves), last=False
+        )
+        self._leaves.append(leaf)
+        pending.append(leaf)
+
+
+def new_hasher(algorithm: HashAlgorithm = "sha256"):
+    """
+    Returns an object with `update()` and `hexdigest()` for the given content hash algorithm.
+
+    Args:
+        algorithm (HashAlgorithm, optional): "sha256", "blake2b" or "blake2b-tree". Defaults to "sha256".
+
+    Raises:
+        ValueError: If the algorithm is not supported.
+    """
+    if algorithm == "sha256":
+        return hashlib.sha256()
+
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+    if algorithm == "blake2b-tree":
+        return TreeHasher()
+
+    raise ValueError(
+        f"Unsupported hash algorithm '{algorithm}'. Supported: {', '.join(HASH_ALGORITHMS)}"
+    )
+
+
+class HashingSink(io.RawIOBase):
+    """
+    Write-only file object that forwards bytes to an underlying binary file and
+    feeds them to a digest on the way, so a file's hash is known as soon as
+    it has been written. Seeking is not supported since rewritten bytes would no
+    longer match the digest.
+    """
+
+    def __init__(self, raw, algorithm: HashAlgorithm = "sha256"):
+        self._raw = raw
+        self._hash = new_hasher(algorithm=algorithm)
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._hash.update(b)
+        written = self._raw.write(b)
+        self._position += len(b)
+        return written
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        self._raw.flush()
+
+    def close(self) -> None:
+        if not self.closed:
+            super().close()
+            self._raw.close()
+
+    def __exit__(self, exc_type, exc, tb):
+        # The digest of a failed write is never taken, so stop hashing it right away
+        if exc_type is not None and isinstance(self._hash, TreeHasher):
+            self._hash.close()
+
+        return super().__exit__(exc_type, exc, tb)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def sha256_hex(data_path: Path, chunk_size: int = DEFAULT_HASH_BUFFER_MB * 1024 * 1024):
     """Given a file path, open the file, read its bytes in chunks of
-    8192, hash each chunk with sha256, update the hash until all chunks
-    have been read.
+    chunk_size into a reused buffer, hash each chunk with sha256, update
+    the hash until all chunks have been read.
 
     Args:
-        tmpdata (Path): Path to temporary data file
-        chunk_size (int, optional): Size of chunks to read in file. Defaults to 8192.
+        data_path (Path): Path to the data file
+        chunk_size (int, optional): Size of chunks to read in file, in bytes. Defaults to
+            DEFAULT_HASH_BUFFER_MB (see 'hash_buffer_mb' in config.yaml).
 
     Returns:
         str: The sha256 hex of the file hash.
     """
-    with open(data_path, "rb") as f:
-        file_hash = hashlib.sha256()
+    return hash_file(data_path=data_path, algorithm="sha256", chunk_size=chunk_size)
+
+
+def hash_file(
+    data_path: Path,
+    algorithm: HashAlgorithm = "sha256",
+    chunk_size: int = DEFAULT_HASH_BUFFER_MB * 1024 * 1024,
+) -> str:
+    """Hash a file with the given content hash algorithm. In "blake2b-tree" mode the
+    segments are read and hashed in parallel threads.
+
+    Args:
+        data_path (Path): Path to the data file.
+        algorithm (HashAlgorithm, optional): "sha256", "blake2b" or "blake2b-tree". Defaults to "sha256".
+        chunk_size (int, optional): Read buffer size in bytes for sequential hashing. Defaults to
+            DEFAULT_HASH_BUFFER_MB (see 'hash_buffer_mb' in config.yaml).
+
+    Returns:
+        str: The hex digest of the file.
+    """
+    with span("hash", algorithm=algorithm, bytes=Path(data_path).stat().st_size):
+        if algorithm == "blake2b-tree":
+            return _tree_hash_file(data_path=Path(data_path))
+
+        file_hash = new_hasher(algorithm=algorithm)
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
 
-        while chunk := f.read(chunk_size):
-            file_hash.update(chunk)
+        with open(data_path, "rb", buffering=0) as f:
+            while n := f.readinto(buffer):
+                file_hash.update(view[:n])
 
-    return file_hash.hexdigest()
+        return file_hash.hexdigest()
 
 
 def make_temp_parquet(
     data: Path | str | pd.DataFrame,
     output_path: Path,
     engine: Literal["pyarrow", "fastparquet"],
-) -> Path:
+    stream: bool = False,
+    memory_budget_mb: int = DEFAULT_INGEST_MEMORY_BUDGET_MB,
+    write_options: ParquetWriteOptions = DEFAULT_WRITE_OPTIONS,
+    hash_algorithm: HashAlgorithm = "sha256",
+    sheet: str | None = None,
+) -> tuple[Path, str]:
+    """Normalize a DataFrame or supported data file to a parquet file at output_path.
+    The hash of the written file is computed while it is being written, so the
+    file does not have to be read back to be hashed.
+
+    Rows are sorted by write_options["sort_by"] (stably) before writing, which keeps
+    artifacts with the same rows in a different order identical and gives the row
+    groups tight min/max statistics on the sort columns.
+
+    xlsx sheets are always streamed: their rows are read in openpyxl's read-only mode
+    and written as row groups within memory_budget_mb, unless they have to be sorted.
+
+    Args:
+        data (Path | str | pd.DataFrame): The data to convert.
+        output_path (Path): Path to write the parquet file to.
+        engine (Literal["pyarrow", "fastparquet"]): Parquet engine used to write the file.
+        stream (bool, optional): Convert CSV files in chunks with bounded memory instead of
+            reading them whole. Defaults to False.
+        memory_budget_mb (int, optional): Memory budget for streaming conversion, in MB.
+        write_options (ParquetWriteOptions, optional): Validated parquet write options
+            (see `validate_write_options`). Defaults to DEFAULT_WRITE_OPTIONS.
+        hash_algorithm (HashAlgorithm, optional): Content hash algorithm. Defaults to "sha256".
+        sheet (str | None, optional): Sheet of an xlsx file to convert. Defaults to the first sheet.
+
+    Raises:
+        ValueError: If a sort_by column is missing, sort_by is used with stream, or a
+            sheet is given for a file that is not an xlsx workbook.
+
+    Returns:
+        tuple[Path, str]: The resolved path to the written parquet file and its hex digest.
+    """
+    import pandas as pd
+
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     if isinstance(data, (Path, str)):
@@ -40,17 +264,80 @@ def make_temp_parquet(
 
         suffix = data_path.suffix.lower()
 
-        if suffix == ".csv":
-            df = pd.read_csv(data_path)
+        if sheet is not None and suffix != ".xlsx":
+            raise ValueError(
+                f"A sheet can only be selected for .xlsx files, not {data_path.name}."
+            )
+
+        if suffix == ".xlsx" and not write_options["sort_by"]:
+            from datashelf.core.streaming import (
+                STREAM_ROW_GROUP_ROWS,
+                stream_xlsx_to_parquet,
+            )
+
+            try:
+                with span("convert.stream", bytes=data_path.stat().st_size):
+                    return stream_xlsx_to_parquet(
+                        data_path=data_path,
+                        output_path=output_path,
+                        engine=engine,
+                        memory_budget_mb=memory_budget_mb,
+                        sheet=sheet,
+                        row_group_size=write_options["row_group_rows"]
+                        or STREAM_ROW_GROUP_ROWS,
+                        write_options=write_options,
+                        hash_algorithm=hash_algorithm,
+                    )
+
+            except Exception as e:
+                raise _conversion_error(data=data) from e
+
+        if suffix == ".csv" and stream:
+            from datashelf.core.streaming import (
+                STREAM_ROW_GROUP_ROWS,
+                stream_csv_to_parquet,
+            )
+
+            if write_options["sort_by"]:
+                raise ValueError(
+                    "'sort_by' cannot be used when streaming CSV files, since sorting "
+                    "needs the whole file in memory."
+                )
+
+            try:
+                with span("convert.stream", bytes=data_path.stat().st_size):
+                    return stream_csv_to_parquet(
+                        data_path=data_path,
+                        output_path=output_path,
+                        engine=engine,
+                        memory_budget_mb=memory_budget_mb,
+                        row_group_size=write_options["row_group_rows"]
+                        or STREAM_ROW_GROUP_ROWS,
+                        write_options=write_options,
+                        hash_algorithm=hash_algorithm,
+                    )
+
+            except Exception as e:
+                raise _conversion_error(data=data) from e
 
-        elif suffix == ".parquet":
-            df = pd.read_parquet(data_path, engine=engine)
+        with span(
+            "convert.read", format=suffix.lstrip("."), bytes=data_path.stat().st_size
+        ) as s:
+            if suffix == ".csv":
+                df = pd.read_csv(data_path)
 
-        elif suffix == ".xlsx":
-            df = pd.read_excel(data_path)
+            elif suffix == ".parquet":
+                df = pd.read_parquet(data_path, engine=engine)
 
-        elif suffix == ".json":
-            df = pd.read_json(data_path)
+            elif suffix == ".xlsx":
+                from datashelf.core.streaming import read_xlsx
+
+                df = read_xlsx(data_path=data_path, sheet=sheet)
+
+            elif suffix == ".json":
+                df = pd.read_json(data_path)
+
+            s["rows"] = len(df)
 
     else:
         if not isinstance(data, pd.DataFrame):
@@ -58,20 +345,106 @@ def make_temp_parquet(
                 "Instance must be a dataframe of type pd.DataFrame or a file path of type str or Path."
             )
 
-        df = data.copy()
+        with span("convert.copy", rows=len(data)):
+            df = data.copy()
+
+    sort_by = write_options["sort_by"]
+    missing = [col for col in sort_by if col not in df.columns]
+    if missing:
+        raise ValueError(f"sort_by column(s) not found in data: {', '.join(missing)}")
+
+    if sort_by:
+        with span("convert.sort", rows=len(df)):
+            df = df.sort_values(sort_by, kind="stable", ignore_index=True)
 
     try:
         object_cols = df.select_dtypes(include=["object"]).columns
         if len(object_cols) > 0:
-            df[object_cols] = df[object_cols].astype("string")
+            with span("convert.cast", rows=len(df), columns=len(object_cols)):
+                df[object_cols] = df[object_cols].astype("string")
+
+        # Covers encoding and hashing, which happen together as the file is written
+        with span("convert.write", engine=engine, rows=len(df)) as s:
+            with HashingSink(open(output_path, "wb"), algorithm=hash_algorithm) as sink:
+                df.to_parquet(
+                    sink,
+                    engine=engine,
+                    index=False,
+                    **pandas_write_kwargs(
+                        options=write_options, engine=engine, columns=list(df.columns)
+                    ),
+                )
 
-        df.to_parquet(output_path, engine=engine, index=False)
+            s["bytes"] = output_path.stat().st_size
 
     except Exception as e:
-        msg = (
-            f"Something went wrong when trying to convert {data} to parquet."
-            "\n\nCurrently, the loading function works best with unambigous tabluar data."
-        )
-        raise RuntimeError(msg) from e
+        raise _conversion_error(data=data) from e
+
+    return output_path.resolve(), sink.hexdigest()
+
+
+def _conversion_error(data) -> RuntimeError:
+    msg = (
+        f"Something went wrong when trying to convert {data} to parquet."
+        "\n\nCurrently, the loading function works best with unambigous tabluar data."
+    )
+    return RuntimeError(msg)
+
+
+def _tree_leaf(data: bytes, index: int, last: bool) -> bytes:
+    return hashlib.blake2b(
+        data,
+        digest_size=DIGEST_SIZE,
+        fanout=0,
+        depth=2,
+        leaf_size=TREE_SEGMENT_SIZE,
+        inner_size=DIGEST_SIZE,
+        node_offset=index,
+        node_depth=0,
+        last_node=last,
+    ).digest()
+
+
+def _tree_root(leaves: list[bytes]) -> str:
+    root = hashlib.blake2b(
+        digest_size=DIGEST_SIZE,
+        fanout=0,
+        depth=2,
+        leaf_size=TREE_SEGMENT_SIZE,
+        inner_size=DIGEST_SIZE,
+        node_offset=0,
+        node_depth=1,
+        last_node=True,
+    )
+    for leaf in leaves:
+        root.update(leaf)
+
+    return root.hexdigest()
+
+
+def _tree_hash_file(data_path: Path) -> str:
+    from concurrent.futures import ThreadPoolExecutor
+
+    size = data_path.stat().st_size
+    count = max(1, -(-size // TREE_SEGMENT_SIZE))
+
+    with open(data_path, "rb", buffering=0) as f:
+        fd = f.fileno()
+
+        def leaf(index: int) -> bytes:
+            offset = index * TREE_SEGMENT_SIZE
+
+            if hasattr(os, "pread"):
+                data = os.pread(fd, TREE_SEGMENT_SIZE, offset)
+            else:
+                # Windows has no pread, so each read seeks a handle of its own
+                with open(data_path, "rb") as segment_file:
+                    segment_file.seek(offset)
+                    data = segment_file.read(TREE_SEGMENT_SIZE)
+
+            return _tree_leaf(data=data, index=index, last=index == count - 1)
+
+        with ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 1)) as executor:
+            leaves = list(executor.map(leaf, range(count)))
 
-    return output_path.resolve()
+    return _tree_root(leaves=leaves)
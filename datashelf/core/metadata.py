@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from datashelf.core.config import get_config_tags_settings, validate_tags
@@ -8,6 +10,18 @@ from datashelf.core.hashing import sha256_hex
 from typing import TypedDict, Optional
 from tempfile import NamedTemporaryFile
 
+try:
+    import fcntl
+except ImportError:  # Windows: commits are not serialized across processes
+    fcntl = None
+
+JOURNAL_FILE = "metadata.journal"
+LOCK_FILE = "metadata.lock"
+
+# In-process writer locks per .datashelf path. flock already serializes threads that
+# open the lock file separately, but these also cover platforms without fcntl.
+_WRITER_LOCKS: dict[str, threading.Lock] = {}
+
 
 class FileEntry(TypedDict):
     file_hash: str
@@ -16,6 +30,7 @@ class FileEntry(TypedDict):
     message: Optional[str]
     tag: Optional[str]
     datetime_added: str  # ISO 8601
+    hash_algorithm: str  # absent on entries saved before it was recorded (sha256)
 
 
 class Metadata(TypedDict):
@@ -49,7 +64,12 @@ def init_metadata(datashelf_path: Path):
 
 
 def create_file_entry(
-    file_hash: str, name: str, stored_path: str, message: str, tag: str
+    file_hash: str,
+    name: str,
+    stored_path: str,
+    message: str,
+    tag: str,
+    hash_algorithm: str = "sha256",
 ):
     file_entry: FileEntry = {
         "file_hash": file_hash,
@@ -58,14 +78,21 @@ def create_file_entry(
         "message": message,
         "tag": tag,
         "datetime_added": _get_current_timestamp(),
+        "hash_algorithm": hash_algorithm,
     }
 
     return file_entry
 
 
+def entry_hash_algorithm(file_entry: FileEntry) -> str:
+    """Algorithm of an entry's file_hash. Entries from before it was recorded are sha256."""
+    return file_entry.get("hash_algorithm", "sha256")
+
+
 def load_metadata(datashelf_path: Path) -> dict:
     """
-    Reads `metadata.json` from datashelf_path / 'metadata.json'
+    Reads the `metadata.json` snapshot from datashelf_path / 'metadata.json',
+    replays any events in the `metadata.journal` on top of it
     and returns the document as a dictionary with keys:
         - schema_version: str
         - last_modified: str
@@ -83,7 +110,167 @@ def load_metadata(datashelf_path: Path) -> dict:
     Returns:
         dict: Dictionary containing content of 'metadata.json'
     """
+    # A shared lock keeps compaction from swapping the snapshot between reads
+    with metadata_lock(datashelf_path=datashelf_path, shared=True):
+        metadata, _ = _load_metadata_unlocked(datashelf_path=datashelf_path)
+
+    return metadata
+
+
+@contextmanager
+def metadata_lock(datashelf_path: Path, shared: bool = False):
+    """
+    Holds an advisory lock on `.datashelf/metadata.lock` for the duration of the
+    block. Writers take an exclusive lock, readers a shared one. Locks are taken with
+    fcntl.flock, so they serialize processes on one host, and writers in one process
+    also hold a thread lock; they are not re-entrant.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory
+        shared (bool, optional): Take a shared (read) lock. Defaults to False.
+    """
+    if shared:
+        with _flock(datashelf_path=datashelf_path, shared=True):
+            yield
+        return
+
+    writer_lock = _WRITER_LOCKS.setdefault(str(datashelf_path), threading.Lock())
+
+    with writer_lock, _flock(datashelf_path=datashelf_path, shared=False):
+        yield
+
+
+def append_journal(datashelf_path: Path, events: list[dict]) -> None:
+    """
+    Appends events to `metadata.journal` as JSON lines. Must be called while
+    holding the exclusive metadata_lock.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory
+        events (list[dict]): Events created by make_add_event/make_update_event
+    """
+    lines = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+
+    with open(datashelf_path / JOURNAL_FILE, "a", encoding="utf-8") as journal:
+        journal.write(lines)
+
+
+def read_journal(datashelf_path: Path, offset: int = 0) -> tuple[list[dict], int]:
+    """
+    Reads the events appended to `metadata.journal` after byte offset. A trailing
+    line without a newline (an interrupted append) is ignored.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory
+        offset (int, optional): Byte offset to start reading from. Defaults to 0.
+
+    Returns:
+        tuple[list[dict], int]: The events and the offset just past the last one read
+    """
+    journal_path = datashelf_path / JOURNAL_FILE
+
+    if not journal_path.exists():
+        return [], 0
+
+    with open(journal_path, "rb") as journal:
+        journal.seek(offset)
+        data = journal.read()
+
+    complete = data[: data.rfind(b"\n") + 1]
+    events = [json.loads(line) for line in complete.splitlines() if line.strip()]
+
+    return events, offset + len(complete)
+
+
+def hash_index(metadata: dict) -> dict[str, list[FileEntry]]:
+    """Entries of a metadata document by hash, for applying events without scanning it."""
+    index: dict[str, list[FileEntry]] = {}
+
+    for file_entry in metadata["files"]:
+        index.setdefault(file_entry["file_hash"], []).append(file_entry)
+
+    return index
 
+
+def apply_journal_event(
+    metadata: dict, event: dict, index: dict[str, list[FileEntry]] | None = None
+) -> None:
+    """
+    Applies a journal event to a metadata document in place. Replaying an add
+    for a hash that is already present is a no-op, so replay is idempotent.
+
+    Args:
+        metadata (dict): Metadata document
+        event (dict): Journal event
+        index (dict[str, list[FileEntry]] | None, optional): hash_index of the document,
+            kept up to date. Pass it when applying several events, so each one costs
+            the same whatever the size of the catalog. Built for this event if None.
+    """
+    if index is None:
+        index = hash_index(metadata=metadata)
+
+    if event["op"] == "add":
+        entry = event["entry"]
+        if entry["file_hash"] not in index:
+            metadata["files"].append(entry)
+            index[entry["file_hash"]] = [entry]
+
+    elif event["op"] == "update":
+        for file_entry in index.get(event["file_hash"], []):
+            file_entry.update(event["fields"])
+
+    metadata["last_modified"] = event["ts"]
+
+
+def make_add_event(entry: FileEntry) -> dict:
+    return {"op": "add", "ts": _get_current_timestamp(), "entry": entry}
+
+
+def make_update_event(file_hash: str, fields: dict) -> dict:
+    return {
+        "op": "update",
+        "ts": _get_current_timestamp(),
+        "file_hash": file_hash,
+        "fields": fields,
+    }
+
+
+def compact_metadata(datashelf_path: Path) -> None:
+    """
+    Folds the events in `metadata.journal` into the `metadata.json` snapshot
+    and empties the journal.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory
+    """
+    with metadata_lock(datashelf_path=datashelf_path):
+        _compact_metadata_unlocked(datashelf_path=datashelf_path)
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _load_metadata_unlocked(datashelf_path: Path) -> tuple[dict, int]:
+    metadata = _load_snapshot(datashelf_path=datashelf_path)
+    events, offset = read_journal(datashelf_path=datashelf_path)
+    index = hash_index(metadata=metadata)
+
+    for event in events:
+        apply_journal_event(metadata=metadata, event=event, index=index)
+
+    return metadata, offset
+
+
+def _compact_metadata_unlocked(datashelf_path: Path) -> None:
+    metadata, _ = _load_metadata_unlocked(datashelf_path=datashelf_path)
+
+    # If this is interrupted after the snapshot is written, replaying the
+    # journal again on the next read is harmless since replay is idempotent
+    _atomic_write_json(path=datashelf_path / "metadata.json", obj=metadata)
+    (datashelf_path / JOURNAL_FILE).write_bytes(b"")
+
+
+def _load_snapshot(datashelf_path: Path) -> dict:
     metadata_path = datashelf_path / "metadata.json"
 
     if not metadata_path.exists():
@@ -103,9 +290,6 @@ def load_metadata(datashelf_path: Path) -> dict:
     return metadata_json
 
 
-# =============================================================
-# HELPER FUNCTIONS
-# =============================================================
 def _get_current_timestamp() -> str:
     """
     Returns the current datetime in ISO 8601 format
@@ -127,7 +311,7 @@ def _atomic_write_text(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
     with NamedTemporaryFile(
-        "w", dir=str(path.parent), delete=False, encoding="utf-8"
+        "w", dir=str(path.parent), prefix=".", delete=False, encoding="utf-8"
     ) as tempfile:
         tempfile.write(text)
         tmp = Path(tempfile.name)
@@ -150,3 +334,17 @@ def _atomic_write_json(path: Path, obj: dict) -> None:
 def _read_json(path: Path):
     with open(path, "r", encoding="utf8") as file:
         return json.load(file)
+
+
+@contextmanager
+def _flock(datashelf_path: Path, shared: bool):
+    if fcntl is None:
+        yield
+        return
+
+    with open(datashelf_path / LOCK_FILE, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
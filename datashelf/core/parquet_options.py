@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from typing import Literal, Optional, TypedDict
+
+COMPRESSION_CODECS = ["snappy", "zstd", "lz4", "gzip", "none"]
+
+
+class ParquetWriteOptions(TypedDict, total=False):
+    compression: str  # one of COMPRESSION_CODECS
+    compression_level: Optional[int]  # None uses the codec's default level
+    row_group_rows: Optional[int]  # None uses the engine's default
+    use_dictionary: bool
+    sort_by: list[str]  # columns to sort rows by before writing
+    write_statistics: bool
+    write_page_index: bool
+
+
+# Matches what `df.to_parquet(..., index=False)` wrote before these options existed,
+# so artifacts (and their hashes) are unchanged unless a setting is changed
+DEFAULT_WRITE_OPTIONS: ParquetWriteOptions = {
+    "compression": "snappy",
+    "compression_level": None,
+    "row_group_rows": None,
+    "use_dictionary": True,
+    "sort_by": [],
+    "write_statistics": True,
+    "write_page_index": False,
+}
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def validate_write_options(
+    options: ParquetWriteOptions,
+    engine: Literal["pyarrow", "fastparquet"],
+    source: str = "",
+) -> ParquetWriteOptions:
+    """
+    Fills in defaults for missing parquet write options and checks their values.
+
+    Args:
+        options (ParquetWriteOptions): Options to validate. Unknown keys are rejected.
+        engine (Literal["pyarrow", "fastparquet"]): Parquet engine the options are for.
+        source (str, optional): Where the options came from, used in error messages
+            (e.g. " in config.yaml file"). Defaults to "".
+
+    Raises:
+        ValueError: If an option is unknown, has an invalid value or is not supported
+            by the engine.
+
+    Returns:
+        ParquetWriteOptions: The complete set of options.
+    """
+    unknown = set(options) - set(DEFAULT_WRITE_OPTIONS)
+    if unknown:
+        raise ValueError(
+            f"Unknown parquet write option(s): {', '.join(sorted(unknown))}. "
+            f"Valid options are: {', '.join(DEFAULT_WRITE_OPTIONS)}"
+        )
+
+    options = {**DEFAULT_WRITE_OPTIONS, **options}
+
+    def invalid(key: str, expected: str) -> ValueError:
+        return ValueError(
+            f"{options[key]} is an invalid value for '{key}'{source}. Please change to {expected}."
+        )
+
+    if options["compression"] not in COMPRESSION_CODECS:
+        raise invalid("compression", f"one of {', '.join(COMPRESSION_CODECS)}")
+
+    level = options["compression_level"]
+    if level is not None and (not isinstance(level, int) or isinstance(level, bool)):
+        raise invalid("compression_level", "a whole number or null")
+
+    rows = options["row_group_rows"]
+    if rows is not None and (not isinstance(rows, int) or rows <= 0):
+        raise invalid("row_group_rows", "a positive whole number or null")
+
+    if not isinstance(options["sort_by"], list):
+        raise invalid("sort_by", "a list of column names")
+
+    if options["write_page_index"] and engine != "pyarrow":
+        raise ValueError(
+            "'write_page_index' is only supported with the pyarrow parquet engine."
+        )
+
+    return options
+
+
+def pandas_write_kwargs(
+    options: ParquetWriteOptions,
+    engine: Literal["pyarrow", "fastparquet"],
+    columns: list[str],
+) -> dict:
+    """
+    Translates write options into keyword arguments for `DataFrame.to_parquet`. Only
+    settings that differ from the engine's defaults are passed.
+
+    Args:
+        options (ParquetWriteOptions): Validated write options.
+        engine (Literal["pyarrow", "fastparquet"]): Parquet engine used to write the file.
+        columns (list[str]): Columns of the DataFrame being written.
+
+    Returns:
+        dict: Keyword arguments for `to_parquet`.
+    """
+    if engine == "pyarrow":
+        kwargs = pyarrow_writer_kwargs(options=options, columns=columns)
+
+        if options["row_group_rows"] is not None:
+            kwargs["row_group_size"] = options["row_group_rows"]
+
+        return kwargs
+
+    kwargs = fastparquet_writer_kwargs(options=options)
+
+    if options["row_group_rows"] is not None:
+        kwargs["row_group_offsets"] = options["row_group_rows"]
+
+    return kwargs
+
+
+def pyarrow_writer_kwargs(options: ParquetWriteOptions, columns: list[str]) -> dict:
+    """Keyword arguments shared by `pq.write_table` and `pq.ParquetWriter`."""
+    kwargs = {"compression": _codec(options["compression"])}
+
+    if options["compression_level"] is not None:
+        kwargs["compression_level"] = options["compression_level"]
+
+    if not options["use_dictionary"]:
+        kwargs["use_dictionary"] = False
+
+    if not options["write_statistics"]:
+        kwargs["write_statistics"] = False
+
+    if options["write_page_index"]:
+        kwargs["write_page_index"] = True
+
+    if options["sort_by"]:
+        import pyarrow.parquet as pq
+
+        # Records the sort order in the row group metadata for downstream readers
+        kwargs["sorting_columns"] = [
+            pq.SortingColumn(columns.index(col)) for col in options["sort_by"]
+        ]
+
+    return kwargs
+
+
+def fastparquet_writer_kwargs(options: ParquetWriteOptions) -> dict:
+    """
+    Keyword arguments shared by `fastparquet.write` and `fastparquet.writer.write_simple`.
+    fastparquet only dictionary-encodes categorical columns, so 'use_dictionary' has no
+    effect, and with 'write_statistics' it keeps its own choice of columns ("auto").
+    """
+    codec = _codec(options["compression"])
+
+    if codec is not None and options["compression_level"] is not None:
+        codec = {
+            "_default": {
+                "type": codec.upper(),
+                "args": {"level": options["compression_level"]},
+            }
+        }
+
+    return {
+        "compression": codec,
+        "stats": "auto" if options["write_statistics"] else False,
+    }
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _codec(compression: str) -> str | None:
+    return None if compression == "none" else compression
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, TypedDict
+
+
+class Span(TypedDict):
+    name: str  # phase, e.g. "save.convert"
+    start: float  # time.perf_counter() seconds
+    duration: float  # seconds
+    parent: str | None  # name of the enclosing span on the same thread
+    depth: int
+    pid: int
+    thread_id: int
+    attrs: dict  # bytes, rows and other details of the phase
+
+
+SpanHook = Callable[[Span], None]
+
+# Called with every finished span. Spans are only timed while at least one hook is set.
+_HOOKS: list[SpanHook] = []
+_LOCAL = threading.local()
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def add_span_hook(hook: SpanHook) -> SpanHook:
+    """
+    Registers a function to be called with every finished timing span (see `Span`)
+    of save, load, checkout and metadata I/O, from whichever thread ran the phase.
+    Spans of the worker processes used by `save_many` are not reported.
+
+    Args:
+        hook (SpanHook): Function taking a Span. It should return quickly.
+
+    Returns:
+        SpanHook: The hook, so it can be used as a decorator.
+    """
+    _HOOKS.append(hook)
+    return hook
+
+
+def remove_span_hook(hook: SpanHook) -> None:
+    if hook in _HOOKS:
+        _HOOKS.remove(hook)
+
+
+@contextmanager
+def span(name: str, /, **attrs) -> Iterator[dict]:
+    """
+    Times the enclosed block as phase `name`. Yields the span's attrs so details only
+    known at the end (e.g. rows read) can be added. Costs next to nothing without hooks.
+    """
+    if not _HOOKS:
+        yield attrs
+        return
+
+    stack = _LOCAL.__dict__.setdefault("stack", [])
+    parent = stack[-1] if stack else None
+    stack.append(name)
+    start = time.perf_counter()
+
+    try:
+        yield attrs
+    finally:
+        duration = time.perf_counter() - start
+        stack.pop()
+
+        record: Span = {
+            "name": name,
+            "start": start,
+            "duration": duration,
+            "parent": parent,
+            "depth": len(stack),
+            "pid": os.getpid(),
+            "thread_id": threading.get_ident(),
+            "attrs": attrs,
+        }
+        for hook in list(_HOOKS):
+            hook(record)
+
+
+class Profile:
+    """
+    Collects the spans finished while it is active. Use with `datashelf.profile()`:
+
+        with datashelf.profile() as p:
+            datashelf.save("big.csv", "big", "", "raw")
+        print(p.summary())
+        p.write_chrome_trace("save.trace.json")
+    """
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Profile:
+        add_span_hook(self._record)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        remove_span_hook(self._record)
+
+    def _record(self, record: Span) -> None:
+        with self._lock:
+            self.spans.append(record)
+
+    def summary(self) -> str:
+        """
+        Phase breakdown: calls, total and self time (total minus child phases),
+        share of the profiled time, and the bytes and rows processed per phase.
+        """
+        phases: dict[str, dict] = {}
+        child_time: dict[str, float] = {}
+
+        for s in self.spans:
+            phase = phases.setdefault(
+                s["name"], {"calls": 0, "total": 0.0, "bytes": 0, "rows": 0}
+            )
+            phase["calls"] += 1
+            phase["total"] += s["duration"]
+            phase["bytes"] += s["attrs"].get("bytes") or 0
+            phase["rows"] += s["attrs"].get("rows") or 0
+
+            if s["parent"] is not None:
+                child_time[s["parent"]] = child_time.get(s["parent"], 0.0) + s["duration"]
+
+        for name, phase in phases.items():
+            phase["self"] = max(phase["total"] - child_time.get(name, 0.0), 0.0)
+
+        wall = sum(s["duration"] for s in self.spans if s["depth"] == 0) or 1.0
+        name_width = max([len("Phase")] + [len(name) for name in phases])
+
+        lines = [
+            f"{'Phase':<{name_width}}  {'Calls':>5}  {'Total s':>9}  {'Self s':>9}  "
+            f"{'%':>5}  {'MB':>9}  {'Rows':>11}",
+            "-" * (name_width + 62),
+        ]
+        for name, p in sorted(phases.items(), key=lambda item: -item[1]["total"]):
+            mb = f"{p['bytes'] / 1e6:.1f}" if p["bytes"] else ""
+            lines.append(
+                f"{name:<{name_width}}  {p['calls']:>5}  {p['total']:>9.3f}  "
+                f"{p['self']:>9.3f}  {100 * p['total'] / wall:>5.1f}  "
+                f"{mb:>9}  {p['rows'] or '':>11}"
+            )
+
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        """The spans as Chrome trace events (chrome://tracing, Perfetto, speedscope)."""
+        origin = min((s["start"] for s in self.spans), default=0.0)
+
+        return {
+            "traceEvents": [
+                {
+                    "name": s["name"],
+                    "cat": "datashelf",
+                    "ph": "X",
+                    "ts": (s["start"] - origin) * 1e6,
+                    "dur": s["duration"] * 1e6,
+                    "pid": s["pid"],
+                    "tid": s["thread_id"],
+                    "args": {k: _json_safe(v) for k, v in s["attrs"].items()},
+                }
+                for s in self.spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_chrome_trace(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        return path
+
+
+def profile() -> Profile:
+    """Collect timing spans within a `with` block. See `Profile`."""
+    return Profile()
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _json_safe(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+
+    return str(value)
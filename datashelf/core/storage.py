@@ -0,0 +1,569 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Iterator, TYPE_CHECKING
+from tempfile import NamedTemporaryFile
+from datashelf.core.config import ARTIFACT_LAYOUTS, get_remote_path, get_storage_backend
+from datashelf.core.metadata import FileEntry, _atomic_write_json, _read_json
+from datashelf.core.profiling import span
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+ARTIFACTS_DIR = "artifacts"
+REMOTE_OBJECTS_DIR = "objects"
+REMOTE_ENTRIES_DIR = "entries"
+REMOTE_UPLOADS_DIR = "uploads"
+
+# Bytes per part of a multipart upload or ranged download
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+# Downloads are written to a hidden sibling of the object and renamed into place when
+# complete. The parts already written are listed, one per line, in PARTS_SUFFIX.
+PARTIAL_SUFFIX = ".partial"
+PARTS_SUFFIX = ".parts"
+
+
+class LocalStorage:
+    """
+    The object store inside a .datashelf directory. Objects live at their key relative
+    to the directory, e.g. `artifacts/<hash>.parquet` or `chunks/<aa>/<sha256>`, which is
+    the layout every shelf has always used, so keys double as `stored_path` values.
+    Objects are immutable and appear atomically.
+
+    It shares exists/size/list/read_range/put/get with RemoteStorage, and in addition
+    exposes each object as a file with `path`, which parquet readers need to memory-map
+    and seek into artifacts.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def __repr__(self) -> str:
+        return f"LocalStorage({str(self.root)!r})"
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def size(self, key: str) -> int:
+        return self.path(key).stat().st_size
+
+    def put(self, key: str, src: Path, move: bool = False) -> None:
+        """Stores src under key, moving it instead of copying if move is set."""
+        dest = self.path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        if move:
+            shutil.move(str(src), str(dest))
+            return
+
+        with NamedTemporaryFile(dir=str(dest.parent), prefix=".", delete=False) as f:
+            tmp = Path(f.name)
+
+        tmp.unlink()
+        try:
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dest)
+
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def locate(self, key: str) -> str:
+        """
+        Key an artifact is actually stored under. This is its stored_path, unless a
+        `migrate-layout` was interrupted after moving the artifact but before updating
+        the catalog: the artifact is then found under the same name in the other layout.
+        """
+        if self.exists(key) or not key.startswith(f"{ARTIFACTS_DIR}/"):
+            return key
+
+        for candidate in layout_keys(key):
+            if candidate != key and self.exists(candidate):
+                return candidate
+
+        return key
+
+    def get(self, key: str, dest: Path) -> None:
+        from datashelf.core.filecopy import place_file
+
+        place_file(src=self.path(key), dest=dest)
+
+    def list(self, prefix: str = "") -> Iterator[str]:
+        """Keys starting with prefix. In-progress writes are not listed."""
+        yield from _walk_keys(root=self.root, prefix=prefix)
+
+    def read_range(self, key: str, offset: int, length: int) -> bytes:
+        with open(self.path(key), "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+
+class RemoteBackedStorage(LocalStorage):
+    """
+    Store of a shelf with 'storage_backend: remote'. The .datashelf directory acts as a
+    local cache of the RemoteStorage in `remote`: saves are written through to it, and
+    artifacts missing locally are fetched from it on first use (see `datashelf.remote`).
+
+    Objects are still read from local files, because parquet readers memory-map and
+    seek into them, which an object store only offers as ranged reads over the network.
+    """
+
+    def __init__(self, root: Path, remote: RemoteStorage):
+        super().__init__(root=root)
+        self.remote = remote
+
+    def __repr__(self) -> str:
+        return f"RemoteBackedStorage({str(self.root)!r}, remote={str(self.remote.root)!r})"
+
+
+class RemoteStorage:
+    """
+    Object-store-like directory shared between machines, e.g. on a network mount. It
+    behaves like an S3-style bucket: an object is only visible once it is complete,
+    large objects are uploaded as numbered parts that are joined when the upload is
+    completed, and objects can be read by byte range. Layout:
+
+        objects/<key>                  artifacts and chunks, keyed as in LocalStorage
+        entries/<file_hash>.json       catalog entry of each pushed artifact
+        uploads/<upload_id>/<part>     parts of uploads that were not completed yet
+
+    The id of an upload depends only on its key and part size, so an interrupted upload
+    of the same object is resumed from the parts that already arrived.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def __repr__(self) -> str:
+        return f"RemoteStorage({str(self.root)!r})"
+
+    def exists(self, key: str) -> bool:
+        return self._object_path(key).is_file()
+
+    def size(self, key: str) -> int:
+        return self._object_path(key).stat().st_size
+
+    def list(self, prefix: str = "") -> Iterator[str]:
+        yield from _walk_keys(root=self.root / REMOTE_OBJECTS_DIR, prefix=prefix)
+
+    def read_range(self, key: str, offset: int, length: int) -> bytes:
+        with open(self._object_path(key), "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def put(self, key: str, src: Path, part_size: int = DEFAULT_PART_SIZE) -> None:
+        """Uploads src under key, one part after the other. See `upload_objects`."""
+        upload_objects(
+            local=LocalStorage(root=src.parent),
+            remote=self,
+            keys=[key],
+            part_size=part_size,
+            max_workers=1,
+            src_keys={key: src.name},
+        )
+
+    def get(self, key: str, dest: Path, part_size: int = DEFAULT_PART_SIZE) -> None:
+        """Downloads key to dest, one part after the other. See `download_objects`."""
+        download_objects(
+            remote=self,
+            local=LocalStorage(root=dest.parent),
+            keys=[key],
+            part_size=part_size,
+            max_workers=1,
+            dest_keys={key: dest.name},
+        )
+
+    def start_upload(self, key: str, part_size: int) -> str:
+        upload_id = hashlib.sha256(f"{key}:{part_size}".encode("utf-8")).hexdigest()[:32]
+        (self.root / REMOTE_UPLOADS_DIR / upload_id).mkdir(parents=True, exist_ok=True)
+
+        return upload_id
+
+    def uploaded_parts(self, upload_id: str) -> set[int]:
+        upload_dir = self.root / REMOTE_UPLOADS_DIR / upload_id
+
+        return {int(p.name) for p in upload_dir.iterdir() if p.name.isdigit()}
+
+    def upload_part(self, upload_id: str, part_number: int, data: bytes) -> None:
+        part_path = self.root / REMOTE_UPLOADS_DIR / upload_id / str(part_number)
+        _write_atomic(path=part_path, data=data)
+
+    def complete_upload(self, upload_id: str, key: str, part_count: int) -> None:
+        """Joins parts 1..part_count into the object and removes the upload."""
+        upload_dir = self.root / REMOTE_UPLOADS_DIR / upload_id
+        dest = self._object_path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        with NamedTemporaryFile(dir=str(dest.parent), prefix=".", delete=False) as f:
+            tmp = Path(f.name)
+
+            for part_number in range(1, part_count + 1):
+                with open(upload_dir / str(part_number), "rb") as part:
+                    shutil.copyfileobj(part, f)
+
+        os.replace(tmp, dest)
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+    def entries(self) -> list[FileEntry]:
+        entries_dir = self.root / REMOTE_ENTRIES_DIR
+
+        if not entries_dir.is_dir():
+            return []
+
+        return [
+            _read_json(path=p)
+            for p in sorted(entries_dir.iterdir())
+            if p.suffix == ".json" and not p.name.startswith(".")
+        ]
+
+    def entry_hashes(self) -> set[str]:
+        entries_dir = self.root / REMOTE_ENTRIES_DIR
+
+        if not entries_dir.is_dir():
+            return set()
+
+        return {p.stem for p in entries_dir.iterdir() if p.suffix == ".json"}
+
+    def put_entry(self, entry: FileEntry) -> None:
+        path = self.root / REMOTE_ENTRIES_DIR / f"{entry['file_hash']}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write_json(path=path, obj=entry)
+
+    def _object_path(self, key: str) -> Path:
+        return self.root / REMOTE_OBJECTS_DIR / key
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def open_storage(datashelf_path: Path) -> LocalStorage | RemoteBackedStorage:
+    """
+    Open the store configured by 'storage_backend' in config.yaml.
+
+    Args:
+        datashelf_path (Path): Path to the .datashelf directory.
+
+    Returns:
+        LocalStorage | RemoteBackedStorage: Store artifacts are saved to and read from.
+    """
+    if get_storage_backend(datashelf_path=datashelf_path) == "remote":
+        remote = RemoteStorage(root=get_remote_path(datashelf_path=datashelf_path))
+        return RemoteBackedStorage(root=datashelf_path, remote=remote)
+
+    return LocalStorage(root=datashelf_path)
+
+
+def artifact_key(filename: str, layout: str = "flat") -> str:
+    """
+    Key of an artifact file (`<hash>.parquet`, or `<hash>.manifest.json` for a chunked
+    one) in an 'artifact_layout'. 'flat' keeps every artifact directly in artifacts/;
+    'sharded' fans them out over two levels of directories named after the first four
+    hex digits of the hash, e.g. `artifacts/ab/cd/<hash>.parquet`, so no directory
+    holds more than a small fraction of a large shelf.
+    """
+    if layout == "sharded":
+        return f"{ARTIFACTS_DIR}/{filename[:2]}/{filename[2:4]}/{filename}"
+
+    return f"{ARTIFACTS_DIR}/{filename}"
+
+
+def layout_keys(key: str) -> list[str]:
+    """Keys the artifact stored at key has in each layout, key itself included."""
+    filename = Path(key).name
+
+    return [artifact_key(filename=filename, layout=layout) for layout in ARTIFACT_LAYOUTS]
+
+
+def upload_objects(
+    local: LocalStorage,
+    remote: RemoteStorage,
+    keys: list[str],
+    part_size: int,
+    max_workers: int,
+    src_keys: dict[str, str] | None = None,
+) -> int:
+    """
+    Uploads objects as multipart uploads. The parts of all objects share one pool of
+    max_workers threads, so small objects and the parts of a large one go up at the
+    same time, and at most max_workers parts are held in memory. Each object is
+    completed, in order, as soon as all of its parts have arrived, so the caller can
+    rely on keys earlier in the list being visible before later ones. Parts left by
+    an interrupted upload of the same key are not sent again.
+
+    Args:
+        local (LocalStorage): Store to read the objects from.
+        remote (RemoteStorage): Store to upload to.
+        keys (list[str]): Keys of the objects to upload.
+        part_size (int): Bytes per part.
+        max_workers (int): Number of parts transferred at once.
+        src_keys (dict[str, str] | None, optional): Local key to read a remote key from,
+            if not the same key.
+
+    Returns:
+        int: Bytes uploaded.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    src_keys = src_keys or {}
+    sent = 0
+
+    with (
+        span("transfer.upload", objects=len(keys)) as s,
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+    ):
+        uploads: list[tuple[str, str, int, list[Future]]] = []
+
+        for key in keys:
+            src = local.path(src_keys.get(key, key))
+            upload_id = remote.start_upload(key=key, part_size=part_size)
+            done = remote.uploaded_parts(upload_id)
+            part_count = _part_count(size=src.stat().st_size, part_size=part_size)
+
+            futures = [
+                executor.submit(
+                    _upload_part,
+                    remote=remote,
+                    upload_id=upload_id,
+                    src=src,
+                    part_number=part_number,
+                    part_size=part_size,
+                )
+                for part_number in range(1, part_count + 1)
+                if part_number not in done
+            ]
+            uploads.append((key, upload_id, part_count, futures))
+
+        try:
+            for key, upload_id, part_count, futures in uploads:
+                sent += sum(future.result() for future in futures)
+                remote.complete_upload(upload_id=upload_id, key=key, part_count=part_count)
+
+        finally:
+            for *_, futures in uploads:
+                for future in futures:
+                    future.cancel()
+
+        s["bytes"] = sent
+
+    return sent
+
+
+def download_objects(
+    remote: RemoteStorage,
+    local: LocalStorage,
+    keys: list[str],
+    part_size: int,
+    max_workers: int,
+    dest_keys: dict[str, str] | None = None,
+    expected: dict[str, tuple[str, str]] | None = None,
+) -> int:
+    """
+    Downloads objects with ranged reads of part_size bytes, run max_workers at a time
+    across all objects. Each object is written in place into a hidden `.partial` file
+    next to its destination, and renamed over the destination once every part is
+    there, in the order of keys. The parts written so far are recorded alongside, so
+    an interrupted download picks up where it stopped instead of starting over.
+
+    An object with an expected hash is hashed before it is renamed into place. If it
+    does not match, its partial download is discarded and an error is raised, so a
+    corrupt remote object never lands in the local store.
+
+    Args:
+        remote (RemoteStorage): Store to download from.
+        local (LocalStorage): Store to write the objects to.
+        keys (list[str]): Keys of the objects to download.
+        part_size (int): Bytes per ranged read.
+        max_workers (int): Number of parts transferred at once.
+        dest_keys (dict[str, str] | None, optional): Local key to write a remote key to,
+            if not the same key.
+        expected (dict[str, tuple[str, str]] | None, optional): (algorithm, hex digest)
+            a key's object must hash to. Objects without one are not checked.
+
+    Raises:
+        ValueError: If a downloaded object does not match its expected hash.
+
+    Returns:
+        int: Bytes downloaded.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    dest_keys = dest_keys or {}
+    expected = expected or {}
+    received = 0
+
+    with (
+        span("transfer.download", objects=len(keys)) as s,
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+    ):
+        downloads: list[tuple[str, Path, Path, Path, int, list[Future]]] = []
+        open_fds: set[int] = set()
+
+        try:
+            for key in keys:
+                dest = local.path(dest_keys.get(key, key))
+                partial = dest.with_name(f".{dest.name}{PARTIAL_SUFFIX}")
+                parts_log = dest.with_name(f".{dest.name}{PARTIAL_SUFFIX}{PARTS_SUFFIX}")
+                size = remote.size(key)
+
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                done = _read_parts_log(partial=partial, parts_log=parts_log, size=size)
+
+                fd = os.open(partial, os.O_RDWR | os.O_CREAT, 0o644)
+                open_fds.add(fd)
+                os.ftruncate(fd, size)
+
+                futures = [
+                    executor.submit(
+                        _download_part,
+                        remote=remote,
+                        key=key,
+                        fd=fd,
+                        partial=partial,
+                        parts_log=parts_log,
+                        part_number=part_number,
+                        part_size=part_size,
+                    )
+                    for part_number in range(1, _part_count(size, part_size) + 1)
+                    if part_number not in done
+                ]
+                downloads.append((key, dest, partial, parts_log, fd, futures))
+
+            for key, dest, partial, parts_log, fd, futures in downloads:
+                received += sum(future.result() for future in futures)
+
+                os.close(fd)
+                open_fds.discard(fd)
+                if key in expected:
+                    _check_download(
+                        key=key, partial=partial, parts_log=parts_log, expected=expected[key]
+                    )
+                os.replace(partial, dest)
+                parts_log.unlink(missing_ok=True)
+
+        finally:
+            # Parts already written stay recorded, for the next attempt to skip
+            for *_, futures in downloads:
+                for future in futures:
+                    future.cancel()
+
+            executor.shutdown(wait=True)
+            for fd in open_fds:
+                os.close(fd)
+
+        s["bytes"] = received
+
+    return received
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _part_count(size: int, part_size: int) -> int:
+    # An empty object is still uploaded as one (empty) part
+    return max(-(-size // part_size), 1)
+
+
+def _upload_part(
+    remote: RemoteStorage, upload_id: str, src: Path, part_number: int, part_size: int
+) -> int:
+    with open(src, "rb") as f:
+        f.seek((part_number - 1) * part_size)
+        data = f.read(part_size)
+
+    remote.upload_part(upload_id=upload_id, part_number=part_number, data=data)
+    return len(data)
+
+
+def _download_part(
+    remote: RemoteStorage,
+    key: str,
+    fd: int,
+    partial: Path,
+    parts_log: Path,
+    part_number: int,
+    part_size: int,
+) -> int:
+    offset = (part_number - 1) * part_size
+    data = remote.read_range(key=key, offset=offset, length=part_size)
+
+    if hasattr(os, "pwrite"):
+        os.pwrite(fd, data, offset)
+    else:
+        # Windows has no pwrite, so each part seeks a handle of its own
+        with open(partial, "r+b") as f:
+            f.seek(offset)
+            f.write(data)
+
+    # A single short O_APPEND write, so concurrent parts never interleave their lines
+    with open(parts_log, "a") as log:
+        log.write(f"{part_number}\n")
+
+    return len(data)
+
+
+def _check_download(
+    key: str, partial: Path, parts_log: Path, expected: tuple[str, str]
+) -> None:
+    from datashelf.core.hashing import hash_file
+
+    algorithm, file_hash = expected
+    actual = hash_file(data_path=partial, algorithm=algorithm)
+
+    if actual != file_hash:
+        # Not resumed next time, since the parts already on disk are the corrupt ones
+        partial.unlink(missing_ok=True)
+        parts_log.unlink(missing_ok=True)
+        raise ValueError(
+            f"{key} downloaded from the remote store hashes to {actual[:8]} instead of "
+            f"{file_hash[:8]}. The remote copy is corrupt; push it again from a "
+            "machine that has it intact."
+        )
+
+
+def _read_parts_log(partial: Path, parts_log: Path, size: int) -> set[int]:
+    """Parts of an interrupted download of the same object that are already on disk."""
+    if not (partial.exists() and parts_log.exists()) or partial.stat().st_size != size:
+        parts_log.unlink(missing_ok=True)
+        return set()
+
+    # The last line may be cut short if the process died while writing it
+    return {
+        int(line) for line in parts_log.read_text().splitlines() if line.strip().isdigit()
+    }
+
+
+def _walk_keys(root: Path, prefix: str) -> Iterator[str]:
+    # Start from the deepest directory named in prefix, e.g. "chunks/ab" for "chunks/ab12"
+    base = prefix.rsplit("/", 1)[0] if "/" in prefix else ""
+    start = root / base
+
+    if not start.is_dir():
+        return
+
+    for dirpath, dirnames, filenames in os.walk(start):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+
+        for filename in filenames:
+            # Temporary and partial files are hidden
+            if filename.startswith("."):
+                continue
+
+            key = filename if rel_dir == "." else f"{rel_dir}/{filename}"
+            if key.startswith(prefix):
+                yield key
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    with NamedTemporaryFile(dir=str(path.parent), prefix=".", delete=False) as f:
+        tmp = Path(f.name)
+        f.write(data)
+
+    os.replace(tmp, path)
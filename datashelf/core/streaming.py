@@ -0,0 +1,526 @@
+from __future__ import annotations
+
+import itertools
+import pickle
+from pathlib import Path
+from typing import Iterable, Iterator, Literal, TYPE_CHECKING
+from datashelf.core.parquet_options import (
+    DEFAULT_WRITE_OPTIONS,
+    ParquetWriteOptions,
+    pyarrow_writer_kwargs,
+    fastparquet_writer_kwargs,
+)
+from datashelf.core.profiling import span
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Rows per parquet row group written in streaming mode. This is deliberately
+# independent of the memory budget so the artifact (and its hash) does not
+# depend on how many rows were read per chunk.
+STREAM_ROW_GROUP_ROWS = 100_000
+
+# Rows read up front to estimate the in-memory size of a single row
+SAMPLE_ROWS = 1_000
+
+# Rough multiplier for the copies alive at once while a chunk is parsed,
+# re-batched and encoded
+MEMORY_OVERHEAD = 4
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def stream_csv_to_parquet(
+    data_path: Path,
+    output_path: Path,
+    engine: Literal["pyarrow", "fastparquet"],
+    memory_budget_mb: int,
+    row_group_size: int = STREAM_ROW_GROUP_ROWS,
+    write_options: ParquetWriteOptions = DEFAULT_WRITE_OPTIONS,
+    hash_algorithm: str = "sha256",
+) -> tuple[Path, str]:
+    """Convert a CSV file to parquet without loading it into memory at once.
+
+    The CSV is read twice in chunks sized to fit `memory_budget_mb`. The first pass
+    infers one dtype per column across every chunk so the parquet schema is consistent,
+    the second pass reads the data with that schema and writes it as row groups of
+    `row_group_size` rows. The resulting file is identical for any memory budget.
+
+    Args:
+        data_path (Path): Path to the CSV file.
+        output_path (Path): Path to write the parquet file to.
+        engine (Literal["pyarrow", "fastparquet"]): Parquet engine used to write the file.
+        memory_budget_mb (int): Approximate memory available for reading chunks, in MB.
+        row_group_size (int, optional): Rows per row group. Defaults to STREAM_ROW_GROUP_ROWS.
+        write_options (ParquetWriteOptions, optional): Validated parquet write options.
+            sort_by and row_group_rows are not used. Defaults to DEFAULT_WRITE_OPTIONS.
+        hash_algorithm (str, optional): Content hash algorithm. Defaults to "sha256".
+
+    Returns:
+        tuple[Path, str]: The resolved path to the written parquet file and its hex digest.
+    """
+    import pandas as pd
+
+    chunk_rows = _estimate_chunk_rows(
+        data_path=data_path, memory_budget_mb=memory_budget_mb
+    )
+    with span("convert.infer_dtypes", bytes=data_path.stat().st_size):
+        dtypes = _infer_csv_dtypes(data_path=data_path, chunk_rows=chunk_rows)
+
+    chunks = pd.read_csv(data_path, chunksize=chunk_rows, dtype=dtypes)
+    data_hash = write_row_groups(
+        row_groups=_rebatch(chunks=chunks, rows=row_group_size),
+        output_path=output_path,
+        engine=engine,
+        write_options=write_options,
+        hash_algorithm=hash_algorithm,
+    )
+
+    return output_path.resolve(), data_hash
+
+
+def stream_xlsx_to_parquet(
+    data_path: Path,
+    output_path: Path,
+    engine: Literal["pyarrow", "fastparquet"],
+    memory_budget_mb: int,
+    sheet: str | None = None,
+    row_group_size: int = STREAM_ROW_GROUP_ROWS,
+    write_options: ParquetWriteOptions = DEFAULT_WRITE_OPTIONS,
+    hash_algorithm: str = "sha256",
+) -> tuple[Path, str]:
+    """Convert one sheet of an xlsx workbook to parquet without loading the workbook.
+
+    The sheet is read with openpyxl's read-only mode, which parses the worksheet XML
+    as its rows are iterated, in chunks sized to fit `memory_budget_mb`. As with CSV
+    files, one dtype per column is inferred over every chunk before anything is
+    written, so the schema is consistent. Parsing the XML is by far the slowest part,
+    so the sheet is parsed only once: the parsed chunks are spilled to a temporary file
+    next to output_path while the dtypes are inferred, then read back from it and
+    written as row groups of `row_group_size` rows. The first non-blank row is the
+    header, and blank rows are skipped.
+
+    Args:
+        data_path (Path): Path to the xlsx file.
+        output_path (Path): Path to write the parquet file to.
+        engine (Literal["pyarrow", "fastparquet"]): Parquet engine used to write the file.
+        memory_budget_mb (int): Approximate memory available for reading chunks, in MB.
+        sheet (str | None, optional): Name of the sheet to convert. Defaults to the first sheet.
+        row_group_size (int, optional): Rows per row group. Defaults to STREAM_ROW_GROUP_ROWS.
+        write_options (ParquetWriteOptions, optional): Validated parquet write options.
+            sort_by and row_group_rows are not used. Defaults to DEFAULT_WRITE_OPTIONS.
+        hash_algorithm (str, optional): Content hash algorithm. Defaults to "sha256".
+
+    Returns:
+        tuple[Path, str]: The resolved path to the written parquet file and its hex digest.
+    """
+    spill_path = output_path.with_name(f"{output_path.name}.rows")
+
+    try:
+        with span("convert.infer_dtypes", bytes=data_path.stat().st_size):
+            dtypes = _infer_xlsx_dtypes(
+                data_path=data_path,
+                sheet=sheet,
+                memory_budget_mb=memory_budget_mb,
+                spill_path=spill_path,
+            )
+
+        data_hash = write_row_groups(
+            row_groups=_rebatch(
+                chunks=_spilled_chunks(spill_path=spill_path, dtypes=dtypes),
+                rows=row_group_size,
+            ),
+            output_path=output_path,
+            engine=engine,
+            write_options=write_options,
+            hash_algorithm=hash_algorithm,
+        )
+
+    finally:
+        spill_path.unlink(missing_ok=True)
+
+    return output_path.resolve(), data_hash
+
+
+def read_xlsx(data_path: Path, sheet: str | None = None) -> pd.DataFrame:
+    """Read a whole sheet of an xlsx workbook into a DataFrame, in one pass over its
+    rows in openpyxl's read-only mode. Used when the rows have to be sorted before
+    they are written.
+
+    Args:
+        data_path (Path): Path to the xlsx file.
+        sheet (str | None, optional): Name of the sheet to read. Defaults to the first sheet.
+
+    Returns:
+        pd.DataFrame: The sheet, with the first non-blank row as its header.
+    """
+    rows = _xlsx_rows(data_path=data_path, sheet=sheet)
+    header = next(rows, ())
+    df = _positional_frame(rows=list(rows), width=len(header))
+    df.columns = _column_names(header=header, width=df.shape[1])
+
+    return df
+
+
+def xlsx_sheet_names(data_path: Path) -> list[str]:
+    """Names of the worksheets in an xlsx workbook, in workbook order."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(data_path, read_only=True)
+    try:
+        return [worksheet.title for worksheet in workbook.worksheets]
+    finally:
+        workbook.close()
+
+
+def write_row_groups(
+    row_groups: Iterable[pd.DataFrame],
+    output_path: Path,
+    engine: Literal["pyarrow", "fastparquet"],
+    write_options: ParquetWriteOptions = DEFAULT_WRITE_OPTIONS,
+    hash_algorithm: str = "sha256",
+) -> str:
+    """Write an iterable of DataFrames sharing one schema to a single parquet file,
+    one row group per DataFrame. Only one row group is held in memory at a time.
+
+    Args:
+        row_groups (Iterable[pd.DataFrame]): DataFrames to write, in order.
+        output_path (Path): Path to write the parquet file to.
+        engine (Literal["pyarrow", "fastparquet"]): Parquet engine used to write the file.
+        write_options (ParquetWriteOptions, optional): Validated parquet write options.
+            row_group_rows is ignored, since each DataFrame is one row group.
+        hash_algorithm (str, optional): Content hash algorithm. Defaults to "sha256".
+
+    Returns:
+        str: The hex digest of the written file, computed as it was written.
+    """
+    from datashelf.core.hashing import HashingSink
+
+    row_groups = iter(row_groups)
+    first = next(row_groups)
+
+    # Covers reading the remaining row groups too, since they are produced lazily
+    with span("convert.write", engine=engine) as s:
+        with HashingSink(open(output_path, "wb"), algorithm=hash_algorithm) as sink:
+            if engine == "pyarrow":
+                _write_row_groups_pyarrow(
+                    first=first, rest=row_groups, sink=sink, write_options=write_options
+                )
+            else:
+                _write_row_groups_fastparquet(
+                    first=first, rest=row_groups, sink=sink, write_options=write_options
+                )
+
+        s["bytes"] = output_path.stat().st_size
+
+    return sink.hexdigest()
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _estimate_chunk_rows(data_path: Path, memory_budget_mb: int) -> int:
+    import pandas as pd
+
+    sample = pd.read_csv(data_path, nrows=SAMPLE_ROWS)
+
+    return _chunk_rows(sample=sample, memory_budget_mb=memory_budget_mb)
+
+
+def _chunk_rows(sample: pd.DataFrame, memory_budget_mb: int) -> int:
+    if len(sample) == 0:
+        return SAMPLE_ROWS
+
+    bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+    budget_bytes = memory_budget_mb * 1024 * 1024
+
+    return max(1, int(budget_bytes // (bytes_per_row * MEMORY_OVERHEAD)))
+
+
+def _infer_csv_dtypes(data_path: Path, chunk_rows: int) -> dict[str, str]:
+    import pandas as pd
+
+    dtypes: dict[str, str] = {}
+
+    for chunk in pd.read_csv(data_path, chunksize=chunk_rows):
+        for col, dtype in chunk.dtypes.items():
+            dtype = _normalize_dtype(dtype)
+            dtypes[col] = _merge_dtypes(dtypes[col], dtype) if col in dtypes else dtype
+
+    return dtypes
+
+
+def _infer_xlsx_dtypes(
+    data_path: Path, sheet: str | None, memory_budget_mb: int, spill_path: Path
+) -> dict[str, str]:
+    """
+    Dtype of every column of a sheet, by name in column order. The parsed rows are
+    pickled chunk by chunk to spill_path on the way. Unlike a CSV, the sheet's rows can
+    have different lengths, so its width is only known once every row was seen.
+    """
+    rows = _xlsx_rows(data_path=data_path, sheet=sheet)
+    header = next(rows, ())
+    sample = list(itertools.islice(rows, SAMPLE_ROWS))
+    chunk_rows = _chunk_rows(
+        sample=_positional_frame(rows=sample, width=len(header)),
+        memory_budget_mb=memory_budget_mb,
+    )
+
+    dtypes: dict[int, str] = {}
+    # Columns with a missing value somewhere
+    null_columns: set[int] = set()
+    width = narrowest = len(header)
+
+    with open(spill_path, "wb") as spill:
+        for chunk in _batched(itertools.chain(sample, rows), size=chunk_rows):
+            pickle.dump(chunk, spill, protocol=pickle.HIGHEST_PROTOCOL)
+            _merge_chunk_dtypes(
+                df=_positional_frame(rows=chunk, width=len(header)),
+                dtypes=dtypes,
+                null_columns=null_columns,
+            )
+            width = max([width, *(len(row) for row in chunk)])
+            narrowest = min([narrowest, *(len(row) for row in chunk)])
+
+    null_columns.update(range(narrowest, width))
+    names = _column_names(header=header, width=width)
+
+    return {
+        name: (
+            _nullable_dtype(dtypes.get(col, "float64"))
+            if col in null_columns
+            else dtypes.get(col, "float64")
+        )
+        for col, name in enumerate(names)
+    }
+
+
+def _merge_chunk_dtypes(
+    df: pd.DataFrame, dtypes: dict[int, str], null_columns: set[int]
+) -> None:
+    from pandas.api.types import infer_dtype
+
+    for col in df.columns:
+        nulls = df[col].isna()
+
+        # An empty chunk of a column says nothing about its type
+        if nulls.all():
+            null_columns.add(col)
+            continue
+
+        if nulls.any():
+            null_columns.add(col)
+
+        # Cells are typed, so an object column of True/False is a bool column with gaps,
+        # which _nullable_dtype then turns to floats
+        if df[col].dtype == object and infer_dtype(df[col], skipna=True) == "boolean":
+            dtype = "bool"
+        else:
+            dtype = _normalize_dtype(df[col].dtype)
+
+        dtypes[col] = _merge_dtypes(dtypes[col], dtype) if col in dtypes else dtype
+
+
+def _spilled_chunks(
+    spill_path: Path, dtypes: dict[str, str]
+) -> Iterator[pd.DataFrame]:
+    import pandas as pd
+
+    names = list(dtypes)
+    yielded = False
+
+    with open(spill_path, "rb") as spill:
+        while True:
+            try:
+                chunk = pickle.load(spill)
+            except EOFError:
+                break
+
+            df = _positional_frame(rows=chunk, width=len(names))
+            df.columns = names
+            yield df.astype(dtypes)
+            yielded = True
+
+    if not yielded:
+        # Header-only sheets still produce a file carrying the schema
+        yield pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in dtypes.items()})
+
+
+def _xlsx_rows(data_path: Path, sheet: str | None) -> Iterator[tuple]:
+    """Values of the non-blank rows of a sheet, without their trailing empty cells."""
+    from openpyxl import load_workbook
+
+    # data_only reads the values formulas last evaluated to, as pd.read_excel does
+    workbook = load_workbook(data_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0] if sheet is None else workbook[sheet]
+
+        for row in worksheet.iter_rows(values_only=True):
+            end = len(row)
+            while end and row[end - 1] is None:
+                end -= 1
+
+            if end:
+                yield row[:end]
+
+    finally:
+        workbook.close()
+
+
+def _positional_frame(rows: list[tuple], width: int) -> pd.DataFrame:
+    # Columns are numbered, since a row can be longer than the header
+    import pandas as pd
+
+    width = max([width, *(len(row) for row in rows)])
+
+    return pd.DataFrame(
+        [row + (None,) * (width - len(row)) for row in rows], columns=range(width)
+    )
+
+
+def _column_names(header: tuple, width: int) -> list[str]:
+    """Header cells as column names, with pd.read_excel's names for blank and repeated ones."""
+    names: list[str] = []
+    seen: dict[str, int] = {}
+
+    for i in range(width):
+        value = header[i] if i < len(header) else None
+        name = f"Unnamed: {i}" if value is None else str(value)
+
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+
+        names.append(name)
+
+    return names
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _normalize_dtype(dtype) -> str:
+    # Text columns are stored as pandas' string dtype, matching make_temp_parquet
+    return "string" if dtype.kind == "O" else str(dtype)
+
+
+def _merge_dtypes(a: str, b: str) -> str:
+    """
+    Combine the dtypes inferred for the same column in two chunks into the dtype
+    pandas would have inferred had it read both chunks at once.
+    """
+    import numpy as np
+
+    if a == b:
+        return a
+
+    numeric = "iuf"
+    if a != "string" and b != "string":
+        kind_a, kind_b = np.dtype(a).kind, np.dtype(b).kind
+
+        # e.g. an int column that has missing values in a later chunk
+        if kind_a in numeric and kind_b in numeric:
+            return "float64"
+
+    return "string"
+
+
+def _nullable_dtype(dtype: str) -> str:
+    # The dtype a column gets once it holds missing values, as pd.read_excel infers it:
+    # ints and bools (as 1.0/0.0) turn to floats, so artifacts match the ones it made
+    import numpy as np
+
+    if dtype == "string":
+        return dtype
+
+    return "float64" if np.dtype(dtype).kind in "iub" else dtype
+
+
+def _rebatch(chunks: Iterable[pd.DataFrame], rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Re-slice chunks of arbitrary length into DataFrames of exactly `rows` rows
+    (the last one may be shorter).
+    """
+    import pandas as pd
+
+    pending: list[pd.DataFrame] = []
+    pending_rows = 0
+    empty = None
+    yielded = False
+
+    for chunk in chunks:
+        if empty is None:
+            empty = chunk.iloc[:0]
+
+        while len(chunk) > 0:
+            take = min(rows - pending_rows, len(chunk))
+            pending.append(chunk.iloc[:take])
+            pending_rows += take
+            chunk = chunk.iloc[take:]
+
+            if pending_rows == rows:
+                yield pd.concat(pending, ignore_index=True)
+                pending, pending_rows = [], 0
+                yielded = True
+
+    if pending:
+        yield pd.concat(pending, ignore_index=True)
+
+    elif not yielded and empty is not None:
+        # Header-only CSVs still produce a file carrying the schema
+        yield empty
+
+
+def _write_row_groups_pyarrow(
+    first: pd.DataFrame,
+    rest: Iterator[pd.DataFrame],
+    sink,
+    write_options: ParquetWriteOptions,
+):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(first, preserve_index=False)
+    schema = table.schema
+    kwargs = pyarrow_writer_kwargs(options=write_options, columns=list(first.columns))
+
+    with pq.ParquetWriter(sink, schema, **kwargs) as writer:
+        writer.write_table(table, row_group_size=max(len(first), 1))
+
+        for df in rest:
+            table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            writer.write_table(table, row_group_size=max(len(df), 1))
+
+
+def _write_row_groups_fastparquet(
+    first: pd.DataFrame,
+    rest: Iterator[pd.DataFrame],
+    sink,
+    write_options: ParquetWriteOptions,
+):
+    from itertools import chain
+    from fastparquet import writer
+
+    # Mirrors fastparquet.write(..., write_index=False), but lets the row groups
+    # come from an iterator instead of one DataFrame held in memory
+    fmd = writer.make_metadata(
+        first,
+        has_nulls=True,
+        object_encoding="infer",
+        times="int64",
+        index_cols=[],
+        cols_dtype=first.columns.dtype,
+    )
+    writer.write_simple(
+        sink,
+        chain([first], rest),
+        fmd,
+        **fastparquet_writer_kwargs(options=write_options),
+    )
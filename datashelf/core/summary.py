@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import io
+import struct
+from pathlib import Path
+from typing import Any, Callable, TypedDict
+from datashelf.core.chunkstore import is_chunked, read_manifest, read_range
+from datashelf.core.metadata import FileEntry, _atomic_write_json, _read_json
+from datashelf.core.storage import LocalStorage
+
+SUMMARIES_DIR = "summaries"
+PARQUET_MAGIC = b"PAR1"
+
+# Bytes read from the end of an artifact in one go: enough for the footer of all but
+# very wide tables, which are read again with the exact footer length
+FOOTER_READ = 64 * 1024
+
+# (offset, length) -> bytes
+RangeReader = Callable[[int, int], bytes]
+
+
+class ColumnSummary(TypedDict):
+    name: str
+    dtype: str  # pandas dtype the column loads as
+    null_count: int | None
+    # Over all row groups; None when the writer recorded no statistics (e.g.
+    # fastparquet for strings). Timestamps are ISO 8601 strings.
+    min: Any
+    max: Any
+
+
+class ArtifactSummary(TypedDict):
+    version: int
+    rows: int
+    row_groups: int
+    bytes: int  # size of the artifact on disk (reassembled size for chunked artifacts)
+    columns: list[ColumnSummary]
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def summary_key(file_hash: str) -> str:
+    """Path of an artifact's summary relative to the .datashelf directory."""
+    return f"{SUMMARIES_DIR}/{file_hash[:2]}/{file_hash}.json"
+
+
+def summarize_file(file_path: Path) -> ArtifactSummary:
+    """Summarizes a parquet file from its footer."""
+    size = file_path.stat().st_size
+
+    return summarize_footer(
+        footer=read_footer(read=_file_reader(file_path=file_path), size=size), size=size
+    )
+
+
+def summarize_entry(datashelf_path: Path, file_entry: FileEntry) -> ArtifactSummary:
+    """
+    Summarizes a stored artifact from its parquet footer. Only the end of the artifact
+    is read (for a chunked artifact, only its last chunks), whatever its size.
+    """
+    storage = LocalStorage(root=datashelf_path)
+
+    if is_chunked(file_entry):
+        manifest = read_manifest(datashelf_path=datashelf_path, file_entry=file_entry)
+        size = manifest["size"]
+
+        def read(offset: int, length: int) -> bytes:
+            return read_range(
+                datashelf_path=datashelf_path,
+                manifest=manifest,
+                offset=offset,
+                length=length,
+            )
+
+    else:
+        path = storage.path(storage.locate(file_entry["stored_path"]))
+        size = path.stat().st_size
+        read = _file_reader(file_path=path)
+
+    return summarize_footer(footer=read_footer(read=read, size=size), size=size)
+
+
+def read_summary(datashelf_path: Path, file_hash: str) -> ArtifactSummary | None:
+    """The summary recorded for an artifact, or None if there is none (yet)."""
+    summary_path = datashelf_path / summary_key(file_hash)
+
+    if not summary_path.exists():
+        return None
+
+    try:
+        return _read_json(path=summary_path)
+    except (ValueError, OSError):
+        return None
+
+
+def write_summary(datashelf_path: Path, file_hash: str, summary: ArtifactSummary) -> None:
+    # Artifacts are immutable, so a summary never goes stale and needs no lock
+    _atomic_write_json(path=datashelf_path / summary_key(file_hash), obj=summary)
+
+
+def get_summary(datashelf_path: Path, file_entry: FileEntry) -> ArtifactSummary:
+    """
+    The summary of an entry's artifact. Artifacts saved before summaries were recorded
+    (or pulled from another machine) are summarized from their footer on first use,
+    and the summary is stored for next time.
+    """
+    summary = read_summary(datashelf_path=datashelf_path, file_hash=file_entry["file_hash"])
+
+    if summary is None:
+        summary = summarize_entry(datashelf_path=datashelf_path, file_entry=file_entry)
+        write_summary(
+            datashelf_path=datashelf_path,
+            file_hash=file_entry["file_hash"],
+            summary=summary,
+        )
+
+    return summary
+
+
+def read_footer(read: RangeReader, size: int) -> bytes:
+    """
+    Reads the footer of a parquet file: the file metadata, its length and the magic
+    bytes, which is everything needed to describe the file without reading its data.
+    """
+    tail = read(max(size - FOOTER_READ, 0), min(size, FOOTER_READ))
+
+    if size < 12 or tail[-4:] != PARQUET_MAGIC:
+        raise ValueError("Not a parquet file: missing the PAR1 magic bytes at its end.")
+
+    footer_length = struct.unpack("<I", tail[-8:-4])[0] + 8
+
+    if footer_length > len(tail):
+        tail = read(size - footer_length, footer_length)
+
+    return tail[-footer_length:]
+
+
+def open_footer(footer: bytes):
+    """
+    fastparquet ParquetFile for a footer read with read_footer. It only looks at the
+    file from its end, so the leading magic bytes are all that is needed in front.
+    """
+    from fastparquet import ParquetFile
+
+    return ParquetFile(io.BytesIO(PARQUET_MAGIC + footer))
+
+
+def summarize_footer(footer: bytes, size: int) -> ArtifactSummary:
+    parquet_file = open_footer(footer=footer)
+    statistics = parquet_file.statistics
+    dtypes = parquet_file.dtypes
+
+    columns: list[ColumnSummary] = []
+    for name in parquet_file.columns:
+        mins = [v for v in statistics["min"].get(name, []) if v is not None]
+        maxes = [v for v in statistics["max"].get(name, []) if v is not None]
+        null_counts = statistics["null_count"].get(name, [])
+
+        columns.append(
+            {
+                "name": name,
+                "dtype": str(dtypes.get(name, "unknown")),
+                "null_count": (
+                    int(sum(null_counts))
+                    if null_counts and None not in null_counts
+                    else None
+                ),
+                "min": _json_value(min(mins)) if mins else None,
+                "max": _json_value(max(maxes)) if maxes else None,
+            }
+        )
+
+    return {
+        "version": 1,
+        "rows": int(parquet_file.count()),
+        "row_groups": len(parquet_file.row_groups),
+        "bytes": size,
+        "columns": columns,
+    }
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _file_reader(file_path: Path) -> RangeReader:
+    def read(offset: int, length: int) -> bytes:
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    return read
+
+
+def _json_value(value: Any) -> Any:
+    import numpy as np
+
+    if isinstance(value, np.datetime64):
+        import pandas as pd
+
+        return pd.Timestamp(value).isoformat()
+
+    if isinstance(value, np.generic):
+        value = value.item()
+
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+
+    if isinstance(value, float) and value != value:
+        return None
+
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+
+    # Dates, decimals, ...
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
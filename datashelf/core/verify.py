@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TypedDict
+from datashelf.core.metadata import metadata_lock, _atomic_write_json, _read_json
+
+VERIFY_CACHE = "verified.json"
+
+
+class Verification(TypedDict):
+    size: int
+    mtime_ns: int
+    inode: int
+    algorithm: str
+    file_hash: str  # hash the file had when it was last read in full
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def read_verifications(datashelf_path: Path) -> dict[str, Verification]:
+    """
+    Verifications recorded by earlier `fsck` runs, by key (path relative to the
+    .datashelf directory). The cache is only an accelerator, so an unreadable file is
+    treated as empty.
+    """
+    cache_path = datashelf_path / VERIFY_CACHE
+
+    if not cache_path.exists():
+        return {}
+
+    try:
+        return _read_json(path=cache_path).get("entries", {})
+    except (ValueError, OSError, AttributeError):
+        return {}
+
+
+def write_verifications(
+    datashelf_path: Path, verifications: dict[str, Verification], keep: set[str]
+) -> None:
+    """
+    Records verifications, dropping the ones of keys not in keep (objects that no
+    longer exist or belong to no dataset). Written under the metadata lock, like the
+    fingerprint cache.
+    """
+    with metadata_lock(datashelf_path=datashelf_path):
+        cache = read_verifications(datashelf_path=datashelf_path)
+        cache.update(verifications)
+        cache = {key: value for key, value in cache.items() if key in keep}
+
+        _atomic_write_json(
+            path=datashelf_path / VERIFY_CACHE, obj={"version": 1, "entries": cache}
+        )
+
+
+def stat_verification(path: Path, algorithm: str, file_hash: str) -> Verification:
+    stat = os.stat(path)
+
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "inode": stat.st_ino,
+        "algorithm": algorithm,
+        "file_hash": file_hash,
+    }
+
+
+def is_verified(
+    path: Path, algorithm: str, file_hash: str, cached: Verification | None
+) -> bool:
+    """
+    Whether the file was read in full with this hash as the result, and has not been
+    replaced or modified since (same size, modification time and inode).
+    """
+    if cached is None:
+        return False
+
+    try:
+        current = stat_verification(path=path, algorithm=algorithm, file_hash=file_hash)
+    except FileNotFoundError:
+        return False
+
+    return current == cached
@@ -1,26 +1,121 @@
-from pathlib import Path
-from datashelf.core.directory import find_datashelf_path
-from datashelf.core.metadata import load_metadata, FileEntry
+from __future__ import annotations
+
+import itertools
+import json
+import re
+import sys
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable
+from datashelf.core.catalog import SORT_FIELDS, EntryQuery
+from datashelf.core.metadata import FileEntry, entry_hash_algorithm
 from datashelf.core.config import get_config_tags_settings, validate_tags
+from datashelf.core.summary import ArtifactSummary, get_summary, read_summary
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from datashelf.shelf import Shelf
 
 MAX_MSG = 60
+MAX_NAME = 40
+MAX_TAG = 20
 HASH_WIDTH = 8
+ADDED_WIDTH = len("YYYY-MM-DD HH:MM:SS")
+# Rows the table column widths are computed from; later rows are cut to fit, so a
+# listing of any size is printed as it is read
+WIDTH_SAMPLE = 1000
+LS_FORMATS = ["table", "json", "csv"]
+ENTRY_FIELDS = [
+    "file_hash",
+    "name",
+    "tag",
+    "message",
+    "datetime_added",
+    "stored_path",
+    "hash_algorithm",
+]
+# Width min/max values are cut to in the schema table
+MAX_VALUE = 24
 
 
 # =============================================================
 # MAIN FUNCTIONS
 # =============================================================
-def ls(filter_tag: list[str] | None = None):
+def ls(
+    filter_tag: list[str] | None = None,
+    name: str | None = None,
+    name_regex: str | None = None,
+    since: str | datetime | None = None,
+    until: str | datetime | None = None,
+    sort: str | None = None,
+    reverse: bool = False,
+    limit: int | None = None,
+    offset: int = 0,
+    output_format: str = "table",
+    to_df: bool = False,
+) -> pd.DataFrame | None:
     """Print a table of datasets currently registered in .datashelf.
 
+    Entries are filtered, sorted and paged by the catalog (in SQL for the sqlite
+    backend) and printed as they are read, so listing a large catalog neither holds
+    it in memory nor waits for the last entry before printing the first. Table column
+    widths are computed from the first rows; longer values further down are cut to fit.
+
     Args:
         filter_tag (list[str] | None, optional): Optional list of tags to filter displayed datasets. Defaults to None.
+        name (str | None, optional): Glob the whole dataset name must match, e.g. "sales_*". Defaults to None.
+        name_regex (str | None, optional): Regular expression searched for in dataset names. Defaults to None.
+        since (str | datetime | None, optional): Only datasets added at or after this ISO date or time. Defaults to None.
+        until (str | datetime | None, optional): Only datasets added at or before this ISO date or time;
+            a date includes that whole day. Defaults to None.
+        sort (str | None, optional): Field to sort by, one of "name", "tag", "datetime_added" or "file_hash".
+            Defaults to the order datasets were added in.
+        reverse (bool, optional): Sort in descending order (newest first if sort is not set). Defaults to False.
+        limit (int | None, optional): Show at most this many datasets. Defaults to all.
+        offset (int, optional): Skip this many datasets first. Defaults to 0.
+        output_format (str, optional): "table", "json" (one object per line) or "csv". Defaults to "table".
+        to_df (bool, optional): Return the matching entries as a pandas DataFrame instead of printing them,
+            with datetime_added parsed to timestamps for vectorised filtering. Defaults to False.
+
+    Returns:
+        pd.DataFrame | None: The matching entries if to_df is True, otherwise None.
+
+    Raises:
+        ValueError: If a filter, the sort field, the paging or the output format is invalid.
     """
-    datashelf_path = find_datashelf_path()
-    metadata = load_metadata(datashelf_path=datashelf_path)
-    enforce_tags, allowed_tags = get_config_tags_settings(datashelf_path=datashelf_path)
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().ls(
+        filter_tag=filter_tag,
+        name=name,
+        name_regex=name_regex,
+        since=since,
+        until=until,
+        sort=sort,
+        reverse=reverse,
+        limit=limit,
+        offset=offset,
+        output_format=output_format,
+        to_df=to_df,
+    )
+
 
-    files = metadata["files"]
+def _ls(
+    shelf: Shelf,
+    filter_tag: list[str] | None = None,
+    name: str | None = None,
+    name_regex: str | None = None,
+    since: str | datetime | None = None,
+    until: str | datetime | None = None,
+    sort: str | None = None,
+    reverse: bool = False,
+    limit: int | None = None,
+    offset: int = 0,
+    output_format: str = "table",
+    to_df: bool = False,
+) -> pd.DataFrame | None:
+    datashelf_path = shelf.path
+    catalog = shelf.catalog
+    enforce_tags, allowed_tags = get_config_tags_settings(datashelf_path=datashelf_path)
 
     if filter_tag:
         if isinstance(filter_tag, str):
@@ -30,13 +125,34 @@ def ls(filter_tag: list[str] | None = None):
             for tag in filter_tag:
                 validate_tags(tag=tag, allowed_tags=allowed_tags)
 
-        files = [f for f in files if f["tag"] in filter_tag]
+    query = _build_query(
+        filter_tag=filter_tag,
+        name=name,
+        name_regex=name_regex,
+        since=since,
+        until=until,
+        sort=sort,
+        reverse=reverse,
+        limit=limit,
+        offset=offset,
+    )
 
-    if not files:
-        print("No matching metadata found.")
-        return
+    if output_format not in LS_FORMATS:
+        raise ValueError(
+            f"{output_format} is an invalid output format. Please use one of: {', '.join(LS_FORMATS)}."
+        )
 
-    _print_metadata_table(files=files)
+    files = catalog.query(query)
+
+    if to_df:
+        return _entries_frame(files=files)
+
+    if output_format == "json":
+        _print_metadata_json(files=files)
+    elif output_format == "csv":
+        _print_metadata_csv(files=files)
+    else:
+        _print_metadata_table(files=files)
 
 
 def show(lookup_key: str) -> None:
@@ -51,25 +167,15 @@ def show(lookup_key: str) -> None:
         ValueError: If no matching dataset is found.
         RuntimeError: If an unexpected state is encountered.
     """
-    datashelf_path = find_datashelf_path()
-    metadata = load_metadata(datashelf_path=datashelf_path)
+    from datashelf.shelf import _default_shelf
 
-    name_matches = [
-        file_entry
-        for file_entry in metadata["files"]
-        if file_entry["name"] == lookup_key
-    ]
-    hash_approx_match = [
-        file_entry
-        for file_entry in metadata["files"]
-        if file_entry["file_hash"].startswith(lookup_key)
-        and file_entry["file_hash"] != lookup_key
-    ]
-    hash_exact_match = [
-        file_entry
-        for file_entry in metadata["files"]
-        if file_entry["file_hash"] == lookup_key
-    ]
+    return _default_shelf().show(lookup_key=lookup_key)
+
+
+def _show(shelf: Shelf, lookup_key: str) -> None:
+    catalog = shelf.catalog
+
+    name_matches, hash_approx_match, hash_exact_match = catalog.match(lookup_key)
 
     # First check name, then approx hash, then exact hash
     if (
@@ -87,11 +193,15 @@ def show(lookup_key: str) -> None:
         )
 
         for file_entry in name_matches:
-            entry_str += _create_metadata_entry_str(entry=file_entry)
+            entry_str += _create_metadata_entry_str(
+                entry=file_entry, summary=_local_summary(shelf=shelf, entry=file_entry)
+            )
 
     elif len(name_matches) == 1:
         file_entry = name_matches[0]
-        entry_str = _create_metadata_entry_str(entry=file_entry)
+        entry_str = _create_metadata_entry_str(
+            entry=file_entry, summary=_local_summary(shelf=shelf, entry=file_entry)
+        )
 
     elif len(hash_approx_match) > 1:
         entry_str = (
@@ -99,15 +209,21 @@ def show(lookup_key: str) -> None:
         )
 
         for file_entry in hash_approx_match:
-            entry_str += _create_metadata_entry_str(entry=file_entry)
+            entry_str += _create_metadata_entry_str(
+                entry=file_entry, summary=_local_summary(shelf=shelf, entry=file_entry)
+            )
 
     elif len(hash_approx_match) == 1:
         file_entry = hash_approx_match[0]
-        entry_str = _create_metadata_entry_str(entry=file_entry)
+        entry_str = _create_metadata_entry_str(
+            entry=file_entry, summary=_local_summary(shelf=shelf, entry=file_entry)
+        )
 
     elif len(hash_exact_match) == 1:
         file_entry = hash_exact_match[0]
-        entry_str = _create_metadata_entry_str(entry=file_entry)
+        entry_str = _create_metadata_entry_str(
+            entry=file_entry, summary=_local_summary(shelf=shelf, entry=file_entry)
+        )
 
     else:
         raise RuntimeError(f"Unreachable state in `show()`.")
@@ -115,6 +231,84 @@ def show(lookup_key: str) -> None:
     print(entry_str)
 
 
+def schema(lookup_key: str) -> ArtifactSummary:
+    """Print the columns of a dataset with their dtypes, null counts and value ranges.
+
+    The summary is recorded when the dataset is saved. Datasets saved before summaries
+    were recorded are summarized from their parquet footer, without reading their data.
+
+    Args:
+        lookup_key (str): Dataset name, full hash, or unique hash prefix.
+
+    Raises:
+        ValueError: If no matching dataset, or more than one, is found.
+
+    Returns:
+        ArtifactSummary: Row count, row groups, size on disk and per-column summaries.
+    """
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().schema(lookup_key=lookup_key)
+
+
+def backfill_summaries(max_workers: int | None = None) -> int:
+    """Record the summary of every stored dataset that has none yet.
+
+    Summaries are read from parquet footers in a thread pool, so this takes about the
+    same time for large artifacts as for small ones. Datasets whose artifact is not in
+    the local store (e.g. not pulled yet) are skipped.
+
+    Args:
+        max_workers (int | None, optional): Footers read at once. Defaults to
+            min(32, number of CPUs + 4).
+
+    Returns:
+        int: Number of datasets summarized.
+    """
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().backfill_summaries(max_workers=max_workers)
+
+
+def _schema(shelf: Shelf, lookup_key: str) -> ArtifactSummary:
+    from datashelf.load import resolve_entry
+    from datashelf.remote import fetch_entry
+
+    entry = resolve_entry(catalog=shelf.catalog, lookup_key=lookup_key)
+
+    if read_summary(datashelf_path=shelf.path, file_hash=entry["file_hash"]) is None:
+        fetch_entry(shelf=shelf, file_entry=entry)
+
+    summary = get_summary(datashelf_path=shelf.path, file_entry=entry)
+    _print_schema(entry=entry, summary=summary)
+
+    return summary
+
+
+def _backfill_summaries(shelf: Shelf, max_workers: int | None = None) -> int:
+    from concurrent.futures import ThreadPoolExecutor
+
+    datashelf_path = shelf.path
+    storage = shelf.storage
+    entries = [
+        entry
+        for entry in shelf.catalog.entries()
+        if read_summary(datashelf_path=datashelf_path, file_hash=entry["file_hash"]) is None
+        and storage.exists(storage.locate(entry["stored_path"]))
+    ]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(
+            executor.map(
+                lambda entry: get_summary(datashelf_path=datashelf_path, file_entry=entry),
+                entries,
+            )
+        )
+
+    print(f"Summarized {len(entries)} datasets from their parquet footers.")
+    return len(entries)
+
+
 # =============================================================
 # HELPER FUNCTIONS
 # =============================================================
@@ -122,37 +316,152 @@ def _truncate(text: str, max_len: int) -> str:
     return text if len(text) <= max_len else text[: max_len - 3] + "..."
 
 
-def _print_metadata_table(files: list[FileEntry]) -> None:
+def _build_query(
+    filter_tag: list[str] | None,
+    name: str | None,
+    name_regex: str | None,
+    since: str | datetime | None,
+    until: str | datetime | None,
+    sort: str | None,
+    reverse: bool,
+    limit: int | None,
+    offset: int,
+) -> EntryQuery:
+    query: EntryQuery = {"reverse": reverse, "offset": offset}
+
+    if filter_tag:
+        query["tags"] = list(filter_tag)
+
+    if name:
+        query["name_glob"] = name
+
+    if name_regex:
+        try:
+            re.compile(name_regex)
+        except re.error as e:
+            raise ValueError(f"{name_regex} is an invalid regular expression: {e}.")
+
+        query["name_regex"] = name_regex
+
+    if since is not None:
+        query["since"] = _time_bound(value=since, end_of_day=False)
+
+    if until is not None:
+        query["until"] = _time_bound(value=until, end_of_day=True)
+
+    if sort is not None:
+        if sort not in SORT_FIELDS:
+            raise ValueError(
+                f"{sort} is an invalid sort field. Please use one of: {', '.join(SORT_FIELDS)}."
+            )
+
+        query["sort"] = sort
+
+    if limit is not None:
+        if limit < 0:
+            raise ValueError("limit must be zero or more.")
+
+        query["limit"] = limit
+
+    if offset < 0:
+        raise ValueError("offset must be zero or more.")
+
+    return query
+
+
+def _time_bound(value: str | datetime, end_of_day: bool) -> str:
+    # Entries record datetime_added as "YYYY-MM-DDTHH:MM:SS", so bounds in the same
+    # form compare correctly as strings, in SQL as well
+    if isinstance(value, datetime):
+        return value.replace(microsecond=0).isoformat()
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(
+            f"{value} is an invalid date. Please use an ISO date or time such as 2024-01-31 or 2024-01-31T12:00:00."
+        )
+
+    if end_of_day and "T" not in value and " " not in value:
+        parsed = parsed.replace(hour=23, minute=59, second=59)
+
+    return parsed.replace(microsecond=0, tzinfo=None).isoformat()
+
+
+def _entries_frame(files: Iterable[FileEntry]) -> pd.DataFrame:
+    import pandas as pd
+
+    df = pd.DataFrame.from_records(list(files), columns=ENTRY_FIELDS)
+    # Entries written before hash algorithms were recorded are sha256
+    df["hash_algorithm"] = df["hash_algorithm"].fillna("sha256")
+    df["datetime_added"] = pd.to_datetime(df["datetime_added"])
+
+    return df
+
 
-    name_width = max(len("Name"), max(len(f["name"]) for f in files))
-    tag_width = max(
-        len("Tag"), max((len(f.get("tag") or "") for f in files), default=0)
+def _print_metadata_json(files: Iterable[FileEntry]) -> None:
+    for entry in files:
+        sys.stdout.write(json.dumps({field: entry.get(field) for field in ENTRY_FIELDS}) + "\n")
+
+
+def _print_metadata_csv(files: Iterable[FileEntry]) -> None:
+    import csv
+
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    writer.writerow(ENTRY_FIELDS)
+
+    for entry in files:
+        writer.writerow([entry.get(field) or "" for field in ENTRY_FIELDS])
+
+
+def _print_metadata_table(files: Iterable[FileEntry]) -> None:
+    files = iter(files)
+    sample = list(itertools.islice(files, WIDTH_SAMPLE))
+
+    if not sample:
+        print("No matching metadata found.")
+        return
+
+    name_width = min(MAX_NAME, max(len("Name"), max(len(f["name"]) for f in sample)))
+    tag_width = min(
+        MAX_TAG, max(len("Tag"), max((len(f.get("tag") or "") for f in sample), default=0))
     )
-    msg_width = max(
-        len("Message"), max(len(_truncate(f["message"] or "", MAX_MSG)) for f in files)
+    msg_width = min(
+        MAX_MSG, max(len("Message"), max(len(f["message"] or "") for f in sample))
     )
 
     print(
         f"{'Hash':<{HASH_WIDTH}}  "
         f"{'Name':<{name_width}}  "
         f"{'Tag':<{tag_width}}  "
+        f"{'Added':<{ADDED_WIDTH}}  "
         f"{'Message':<{msg_width}}"
     )
 
-    print("-" * (HASH_WIDTH + name_width + tag_width + msg_width + 6))
+    print("-" * (HASH_WIDTH + name_width + tag_width + ADDED_WIDTH + msg_width + 8))
 
-    for entry in files:
+    for entry in itertools.chain(sample, files):
         print(
             f"{entry['file_hash'][:8]:<{HASH_WIDTH}}  "
-            f"{entry['name']:<{name_width}}  "
-            f"{entry['tag']:<{tag_width}}  "
-            f"{_truncate(entry['message'] or '', MAX_MSG):<{msg_width}}"
+            f"{_truncate(entry['name'], name_width):<{name_width}}  "
+            f"{_truncate(entry.get('tag') or '', tag_width):<{tag_width}}  "
+            f"{entry['datetime_added'].replace('T', ' '):<{ADDED_WIDTH}}  "
+            f"{_truncate(entry['message'] or '', msg_width)}"
         )
 
 
-def _create_metadata_entry_str(entry: FileEntry) -> str:
+def _local_summary(shelf: Shelf, entry: FileEntry) -> ArtifactSummary | None:
+    # show only reads recorded summaries: summarizing an artifact reads its footer with
+    # the parquet engine, which show must not import. That is left to schema.
+    return read_summary(datashelf_path=shelf.path, file_hash=entry["file_hash"])
+
+
+def _create_metadata_entry_str(
+    entry: FileEntry, summary: ArtifactSummary | None = None
+) -> str:
     fields = {
         "Hash": entry["file_hash"],
+        "Algorithm": entry_hash_algorithm(entry),
         "Name": entry["name"],
         "Tag": entry["tag"],
         "Message": entry["message"],
@@ -160,6 +469,17 @@ def _create_metadata_entry_str(entry: FileEntry) -> str:
         "Added": entry["datetime_added"],
     }
 
+    if summary is None:
+        fields["Rows"] = "n/a (not summarized yet, see `datashelf schema`)"
+
+    else:
+        names = ", ".join(c["name"] for c in summary["columns"])
+        fields["Rows"] = f"{summary['rows']:,}"
+        fields["Columns"] = f"{len(summary['columns'])} ({_truncate(names, MAX_MSG)})"
+        fields["Size"] = (
+            f"{summary['bytes'] / 1e6:.1f} MB in {summary['row_groups']} row groups"
+        )
+
     label_width = max(len(label) for label in fields)
     lines = [f"{label:<{label_width}}  {value}" for label, value in fields.items()]
     width = max(len(line) for line in lines)
@@ -168,3 +488,30 @@ def _create_metadata_entry_str(entry: FileEntry) -> str:
     msg += "\n" + "-" * width + "\n\n"
 
     return msg
+
+
+def _print_schema(entry: FileEntry, summary: ArtifactSummary) -> None:
+    columns = summary["columns"]
+    rows = [
+        (
+            c["name"],
+            c["dtype"],
+            "" if c["null_count"] is None else f"{c['null_count']:,}",
+            "" if c["min"] is None else _truncate(str(c["min"]), MAX_VALUE),
+            "" if c["max"] is None else _truncate(str(c["max"]), MAX_VALUE),
+        )
+        for c in columns
+    ]
+    header = ("Column", "Dtype", "Nulls", "Min", "Max")
+    widths = [max([len(h)] + [len(r[i]) for r in rows]) for i, h in enumerate(header)]
+
+    print(
+        f"{entry['name']} ({entry['file_hash'][:HASH_WIDTH]}): {summary['rows']:,} rows, "
+        f"{len(columns)} columns, {summary['bytes'] / 1e6:.1f} MB in "
+        f"{summary['row_groups']} row groups\n"
+    )
+    print("  ".join(f"{h:<{w}}" for h, w in zip(header, widths)).rstrip())
+    print("-" * (sum(widths) + 2 * (len(widths) - 1)))
+
+    for row in rows:
+        print("  ".join(f"{v:<{w}}" for v, w in zip(row, widths)).rstrip())
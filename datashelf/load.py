@@ -1,46 +1,285 @@
-import pandas as pd
+from __future__ import annotations
+
 from pathlib import Path
-from datashelf.core.directory import find_datashelf_path
-from datashelf.core.metadata import load_metadata
-from datashelf.core.config import get_parquet_engine
+from typing import BinaryIO, TYPE_CHECKING
+from datashelf.core.config import get_df_cache_settings, get_parquet_engine
+from datashelf.core.chunkstore import is_chunked
+from datashelf.core.dfcache import DF_CACHE, CacheInfo, DataFrameCacheMode
+from datashelf.core.metadata import FileEntry
+from datashelf.core.profiling import span
+from datashelf.remote import fetch_entry
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+    from datashelf.core.catalog import JsonCatalog, SqliteCatalog
+    from datashelf.shelf import Shelf
 
 
-def load(lookup_key: str, to_df: bool = False) -> Path | pd.DataFrame:
+def load(
+    lookup_key: str,
+    to_df: bool = False,
+    as_arrow: bool = False,
+    memory_map: bool = False,
+    columns: list[str] | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+) -> Path | pd.DataFrame | pa.Table:
     """Load a stored artifact from the datashelf.
     The lookup key can be a dataset name, full hash, or unique hash prefix.
     If multiple matches are found for the lookup key, an error will be raised to prompt the user to provide a more specific lookup key.
 
+    With memory_map, the artifact is opened with a memory map through pyarrow, so repeated loads
+    of the same artifact share the OS page cache rather than each reading it into fresh buffers.
+    Columns in uncompressed pages are then used without copying; compressed pages still have to
+    be decompressed into memory.
+
+    columns and filters are pushed down into the parquet reader: only the requested column chunks
+    are read, and row groups whose min/max statistics cannot satisfy the filters are skipped.
+    Filters use the pyarrow/fastparquet format, e.g. [("date", ">=", "2024-01-01"), ("id", "in", [1, 2])]
+    (tuples in a list are ANDed; a list of such lists is ORed).
+
+    With 'df_cache_mb' set in config.yaml, DataFrames are kept in an in-process LRU cache keyed by
+    artifact hash, columns and filters, so loading the same data again skips decoding it. Each call
+    gets a copy, or with 'df_cache_mode: readonly' a read-only view of the cached data.
+    See `datashelf.cache_info()`.
+
     Args:
         lookup_key (str): Dataset name, full hash, or unique hash prefix to look up in the metadata.
         to_df (bool, optional): Whether to load the artifact into a pandas DataFrame. Defaults to False.
+        as_arrow (bool, optional): Whether to load the artifact into a pyarrow Table. Requires pyarrow. Defaults to False.
+        memory_map (bool, optional): Whether to memory-map the artifact when loading it. Requires pyarrow. Defaults to False.
+        columns (list[str] | None, optional): Columns to read. Defaults to all columns.
+        filters (list[tuple] | list[list[tuple]] | None, optional): Row filters to apply while reading. Defaults to None.
 
     Raises:
         ValueError: If no matching dataset is found.
         ValueError: If multiple matching datasets are found.
+        ValueError: If both to_df and as_arrow are set.
+        ValueError: If columns or filters are given without to_df or as_arrow.
+        ImportError: If as_arrow or memory_map is set and pyarrow is not installed.
         RuntimeError: If an unexpected state is encountered.
 
     Returns:
-        Path | pd.DataFrame: The path to the loaded artifact or a pandas DataFrame containing the artifact data.
+        Path | pd.DataFrame | pa.Table: The path to the loaded artifact, a pandas DataFrame or a pyarrow Table containing the artifact data.
+    """
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().load(
+        lookup_key=lookup_key,
+        to_df=to_df,
+        as_arrow=as_arrow,
+        memory_map=memory_map,
+        columns=columns,
+        filters=filters,
+    )
+
+
+def cache_info() -> CacheInfo:
+    """Counters of the DataFrame cache used by `load(..., to_df=True)`.
+
+    Returns:
+        CacheInfo: Hits, misses and evictions since the last `clear_cache()`, and the
+            number of cached DataFrames, the memory they hold and the byte budget.
     """
-    datashelf_path = find_datashelf_path()
-    metadata = load_metadata(datashelf_path=datashelf_path)
-
-    name_matches = [
-        file_entry
-        for file_entry in metadata["files"]
-        if file_entry["name"] == lookup_key
-    ]
-    hash_approx_match = [
-        file_entry
-        for file_entry in metadata["files"]
-        if file_entry["file_hash"].startswith(lookup_key)
-        and file_entry["file_hash"] != lookup_key
-    ]
-    hash_exact_match = [
-        file_entry
-        for file_entry in metadata["files"]
-        if file_entry["file_hash"] == lookup_key
-    ]
+    return DF_CACHE.info()
+
+
+def clear_cache() -> None:
+    """Empty the DataFrame cache used by `load(..., to_df=True)` and reset its counters."""
+    DF_CACHE.clear()
+
+
+def head(lookup_key: str, n: int = 10, columns: list[str] | None = None) -> pd.DataFrame:
+    """Return the first n rows of a stored artifact as a pandas DataFrame.
+
+    Only the parquet footer and the first row groups holding n rows are read, and of
+    those only the requested column chunks, so peeking at an artifact takes about the
+    same time and memory whatever its size. Chunked artifacts are read the same way,
+    opening only the chunks those bytes are in.
+
+    Args:
+        lookup_key (str): Dataset name, full hash, or unique hash prefix.
+        n (int, optional): Number of rows to return. Defaults to 10.
+        columns (list[str] | None, optional): Columns to read. Defaults to all columns.
+
+    Raises:
+        ValueError: If no matching dataset, or more than one, is found.
+        ValueError: If n is negative.
+
+    Returns:
+        pd.DataFrame: The first n rows (fewer if the artifact has fewer).
+    """
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().head(lookup_key=lookup_key, n=n, columns=columns)
+
+
+def _load(
+    shelf: Shelf,
+    lookup_key: str,
+    to_df: bool = False,
+    as_arrow: bool = False,
+    memory_map: bool = False,
+    columns: list[str] | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+) -> Path | pd.DataFrame | pa.Table:
+    if to_df and as_arrow:
+        raise ValueError("Only one of `to_df` and `as_arrow` can be set.")
+
+    if (columns is not None or filters) and not (to_df or as_arrow):
+        raise ValueError("`columns` and `filters` require `to_df` or `as_arrow`.")
+
+    filters = _normalize_filters(filters=filters)
+
+    with span("load.resolve"):
+        file_entry = resolve_entry(catalog=shelf.catalog, lookup_key=lookup_key)
+
+    if to_df:
+        cache_bytes, cache_mode = get_df_cache_settings(datashelf_path=shelf.path)
+        DF_CACHE.resize(max_bytes=cache_bytes)
+
+        if cache_bytes:
+            return _load_cached(
+                shelf=shelf,
+                file_entry=file_entry,
+                memory_map=memory_map,
+                columns=columns,
+                filters=filters,
+                mode=cache_mode,
+            )
+
+    return _read_entry(
+        shelf=shelf,
+        file_entry=file_entry,
+        to_df=to_df,
+        as_arrow=as_arrow,
+        memory_map=memory_map,
+        columns=columns,
+        filters=filters,
+    )
+
+
+def _load_cached(
+    shelf: Shelf,
+    file_entry: FileEntry,
+    memory_map: bool,
+    columns: list[str] | None,
+    filters: list[list[tuple]] | None,
+    mode: DataFrameCacheMode,
+) -> pd.DataFrame:
+    # The engine (or pyarrow, when memory-mapping) decides the dtypes of the DataFrame
+    reader = "pyarrow" if memory_map else get_parquet_engine(datashelf_path=shelf.path)
+    key = (
+        file_entry["file_hash"],
+        tuple(columns) if columns is not None else None,
+        repr(filters),
+        reader,
+    )
+
+    with span("load.cache") as s:
+        df = DF_CACHE.get(key=key, mode=mode)
+        s["hit"] = df is not None
+
+    if df is not None:
+        return df
+
+    df = _read_entry(
+        shelf=shelf,
+        file_entry=file_entry,
+        to_df=True,
+        as_arrow=False,
+        memory_map=memory_map,
+        columns=columns,
+        filters=filters,
+    )
+    return DF_CACHE.put(key=key, df=df, mode=mode)
+
+
+def _read_entry(
+    shelf: Shelf,
+    file_entry: FileEntry,
+    to_df: bool,
+    as_arrow: bool,
+    memory_map: bool,
+    columns: list[str] | None,
+    filters: list[list[tuple]] | None,
+) -> Path | pd.DataFrame | pa.Table:
+    datashelf_path = shelf.path
+    fetch_entry(shelf=shelf, file_entry=file_entry)
+
+    if is_chunked(file_entry):
+        return _load_chunked(
+            datashelf_path=datashelf_path,
+            file_entry=file_entry,
+            to_df=to_df,
+            as_arrow=as_arrow,
+            columns=columns,
+            filters=filters,
+        )
+
+    full_path = shelf.storage.path(shelf.storage.locate(file_entry["stored_path"]))
+
+    if as_arrow or (to_df and memory_map):
+        table = _read_arrow_table(
+            full_path=full_path, memory_map=memory_map, columns=columns, filters=filters
+        )
+
+        # self_destruct releases each Arrow column as it is converted and split_blocks
+        # skips consolidating columns into 2D blocks, avoiding extra copies
+        return table if as_arrow else table.to_pandas(split_blocks=True, self_destruct=True)
+
+    if not to_df:
+        return full_path
+
+    return _read_dataframe(
+        datashelf_path=datashelf_path, source=full_path, columns=columns, filters=filters
+    )
+
+
+def _head(
+    shelf: Shelf, lookup_key: str, n: int = 10, columns: list[str] | None = None
+) -> pd.DataFrame:
+    if n < 0:
+        raise ValueError(f"n must be zero or more, got {n}.")
+
+    with span("load.resolve"):
+        file_entry = resolve_entry(catalog=shelf.catalog, lookup_key=lookup_key)
+
+    fetch_entry(shelf=shelf, file_entry=file_entry)
+    engine = get_parquet_engine(datashelf_path=shelf.path)
+
+    if is_chunked(file_entry):
+        from datashelf.core.chunkstore import ChunkedFile, read_manifest
+
+        manifest = read_manifest(datashelf_path=shelf.path, file_entry=file_entry)
+        source = ChunkedFile(datashelf_path=shelf.path, manifest=manifest)
+    else:
+        stored_path = shelf.storage.locate(file_entry["stored_path"])
+        source = open(shelf.storage.path(stored_path), "rb")
+
+    with source, span("load.head", engine=engine) as s:
+        df = _read_head(source=source, engine=engine, n=n, columns=columns)
+        s["rows"] = len(df)
+
+    return df
+
+
+def resolve_entry(catalog: JsonCatalog | SqliteCatalog, lookup_key: str) -> FileEntry:
+    """Find the single catalog entry matching a dataset name, full hash, or unique hash prefix.
+
+    Args:
+        catalog (JsonCatalog | SqliteCatalog): Catalog to search.
+        lookup_key (str): Dataset name, full hash, or unique hash prefix.
+
+    Raises:
+        ValueError: If no matching dataset is found.
+        ValueError: If multiple matching datasets are found.
+        RuntimeError: If an unexpected state is encountered.
+
+    Returns:
+        FileEntry: The matching entry.
+    """
+    name_matches, hash_approx_match, hash_exact_match = catalog.match(lookup_key)
 
     # First check name, then approx hash, then exact hash
     if (
@@ -88,6 +327,141 @@ def load(lookup_key: str, to_df: bool = False) -> Path | pd.DataFrame:
     else:
         raise RuntimeError(f"Unreachable state in `load()`.")
 
+    return file_entry
+
+
+def _normalize_filters(
+    filters: list[tuple] | list[list[tuple]] | None,
+) -> list[list[tuple]] | None:
+    # pyarrow ANDs a flat list of filters while fastparquet ORs it, so always pass
+    # the explicit disjunctive form to get the same rows from both engines
+    if not filters:
+        return None
+
+    if all(isinstance(f, tuple) for f in filters):
+        return [list(filters)]
+
+    return [list(conjunction) for conjunction in filters]
+
+
+def _load_chunked(
+    datashelf_path: Path,
+    file_entry: FileEntry,
+    to_df: bool,
+    as_arrow: bool,
+    columns: list[str] | None,
+    filters: list[list[tuple]] | None,
+) -> Path | pd.DataFrame | pa.Table:
+    # A chunked artifact has no single file to read or memory-map: it is reassembled in
+    # memory for DataFrame/Arrow loads, and into .datashelf/materialized/ when a path is needed
+    from datashelf.core.chunkstore import (
+        read_manifest,
+        open_chunked,
+        materialize_chunked,
+    )
+
+    manifest = read_manifest(datashelf_path=datashelf_path, file_entry=file_entry)
+
+    if not (to_df or as_arrow):
+        with span("load.materialize", bytes=manifest["size"]):
+            return materialize_chunked(datashelf_path=datashelf_path, manifest=manifest)
+
+    with span("load.reassemble", bytes=manifest["size"]):
+        buffer = open_chunked(datashelf_path=datashelf_path, manifest=manifest)
+
+    if as_arrow:
+        return _read_arrow_table(
+            full_path=buffer, memory_map=False, columns=columns, filters=filters
+        )
+
+    return _read_dataframe(
+        datashelf_path=datashelf_path, source=buffer, columns=columns, filters=filters
+    )
+
+
+def _read_dataframe(
+    datashelf_path: Path,
+    source: Path | BinaryIO,
+    columns: list[str] | None,
+    filters: list[list[tuple]] | None,
+) -> pd.DataFrame:
+    # pandas (and the parquet engine) are only imported when a DataFrame is requested
+    import pandas as pd
+
     engine = get_parquet_engine(datashelf_path=datashelf_path)
-    full_path = datashelf_path / file_entry["stored_path"]
-    return full_path if not to_df else pd.read_parquet(full_path, engine=engine)
+
+    with span("load.read", engine=engine, bytes=_source_size(source)) as s:
+        if engine == "fastparquet" and filters:
+            # fastparquet only skips row groups by default; row_filter also drops
+            # non-matching rows within the remaining row groups, like pyarrow does
+            df = pd.read_parquet(
+                source, engine=engine, columns=columns, filters=filters, row_filter=True
+            )
+        else:
+            df = pd.read_parquet(source, engine=engine, columns=columns, filters=filters)
+
+        s["rows"] = len(df)
+
+    return df
+
+
+def _read_arrow_table(
+    full_path: Path | BinaryIO,
+    memory_map: bool,
+    columns: list[str] | None = None,
+    filters: list[tuple] | list[list[tuple]] | None = None,
+) -> pa.Table:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required to load artifacts as Arrow tables or with memory mapping. "
+            "Install it with `pip install datashelf-py[arrow]`."
+        ) from e
+
+    with span("load.read", engine="pyarrow", bytes=_source_size(full_path)) as s:
+        table = pq.read_table(
+            full_path, memory_map=memory_map, columns=columns, filters=filters
+        )
+        s["rows"] = table.num_rows
+
+    return table
+
+
+def _read_head(
+    source: BinaryIO, engine: str, n: int, columns: list[str] | None
+) -> pd.DataFrame:
+    if engine == "pyarrow":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(source)
+        row_groups = []
+        rows = 0
+
+        # The first row group is read even for n=0, so the columns and dtypes are kept
+        for i in range(parquet_file.num_row_groups):
+            row_groups.append(i)
+            rows += parquet_file.metadata.row_group(i).num_rows
+            if rows >= n:
+                break
+
+        table = parquet_file.read_row_groups(row_groups, columns=columns)
+        return table.slice(0, n).to_pandas()
+
+    from fastparquet import ParquetFile
+
+    parquet_file = ParquetFile(source)
+
+    # An empty DataFrame is written without row groups, which head() does not handle
+    if not parquet_file.row_groups:
+        return parquet_file.to_pandas(columns=columns)
+
+    # head() reads row groups, for the given columns only, until it has n rows
+    return parquet_file.head(n, columns=columns)
+
+
+def _source_size(source: Path | BinaryIO) -> int:
+    if isinstance(source, Path):
+        return source.stat().st_size
+
+    return source.getbuffer().nbytes
@@ -0,0 +1,491 @@
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
+from datashelf.core.chunkstore import (
+    MATERIALIZED_DIR,
+    chunk_key,
+    is_chunked,
+    read_manifest,
+)
+from datashelf.core.config import get_artifact_layout, get_hash_buffer_size
+from datashelf.core.hashing import hash_file
+from datashelf.core.metadata import FileEntry, entry_hash_algorithm
+from datashelf.core.profiling import span
+from datashelf.core.storage import (
+    ARTIFACTS_DIR,
+    LocalStorage,
+    RemoteBackedStorage,
+    artifact_key,
+)
+from datashelf.core.summary import SUMMARIES_DIR
+from datashelf.core.verify import (
+    Verification,
+    is_verified,
+    read_verifications,
+    stat_verification,
+    write_verifications,
+)
+
+if TYPE_CHECKING:
+    from datashelf.shelf import Shelf
+
+# Top-level directories holding stored objects
+STORE_DIRS = ["artifacts", "chunks", MATERIALIZED_DIR, SUMMARIES_DIR]
+
+
+class FsckProblem(TypedDict):
+    name: str
+    file_hash: str
+    status: str  # missing | corrupt
+    detail: str
+
+
+class FsckResult(TypedDict):
+    datasets: int
+    hashed: int  # files read in full
+    cached: int  # files unchanged since they were last verified, not read
+    bytes: int  # bytes read
+    problems: list[FsckProblem]
+
+
+class GcResult(TypedDict):
+    removed: list[str]  # paths relative to the .datashelf directory
+    bytes: int
+    dry_run: bool
+
+
+class MigrateResult(TypedDict):
+    layout: str
+    moved: int
+    missing: list[str]  # names of datasets whose artifact is not in the local store
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def fsck(full: bool = False, max_workers: int | None = None) -> FsckResult:
+    """Check that every stored artifact still matches its recorded hash.
+
+    Artifacts (and the chunks of chunked artifacts) are re-hashed in a thread pool with
+    the algorithm each entry was saved with; hashlib releases the GIL, so the files are
+    hashed on all cores. The size, modification time and inode of every file that
+    matched are recorded in `.datashelf/verified.json`, and later runs only re-hash
+    files that changed since. Use full to also catch damage that leaves those
+    unchanged, such as bit rot.
+
+    With 'storage_backend: remote', artifacts not fetched yet are not reported missing.
+
+    Args:
+        full (bool, optional): Re-hash every file, ignoring earlier verifications.
+            Defaults to False.
+        max_workers (int | None, optional): Files hashed at once. Defaults to the
+            number of CPUs.
+
+    Returns:
+        FsckResult: Counts of the files checked and the datasets that are missing or corrupt.
+    """
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().fsck(full=full, max_workers=max_workers)
+
+
+def gc(dry_run: bool = False, min_age_hours: float = 1.0) -> GcResult:
+    """Delete stored files that no dataset needs.
+
+    Marks the artifacts, manifests and chunks referenced by the catalog, then sweeps
+    unreferenced files from `.datashelf/artifacts/` and `.datashelf/chunks/`, copies in
+    `.datashelf/materialized/` and summaries in `.datashelf/summaries/` of datasets that
+    no longer exist, and temporary files and `tmp*` directories left by interrupted
+    saves and downloads. Only files older than min_age_hours are removed, so the ones a
+    running save has written but not yet registered are kept.
+
+    Args:
+        dry_run (bool, optional): Only report what would be removed. Defaults to False.
+        min_age_hours (float, optional): Minimum age of the files removed. Defaults to 1.
+
+    Returns:
+        GcResult: The removed paths and the bytes reclaimed.
+    """
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().gc(dry_run=dry_run, min_age_hours=min_age_hours)
+
+
+def migrate_layout(max_workers: int | None = None) -> MigrateResult:
+    """Move every stored artifact to the 'artifact_layout' set in config.yaml.
+
+    Artifacts are moved in a thread pool (renames within the .datashelf directory, so no
+    data is copied), then the stored_path of every moved dataset is updated in a single
+    atomic catalog commit. Until then artifacts are found in either layout, so loads
+    keep working while the migration runs, and an interrupted migration is completed by
+    running it again.
+
+    Args:
+        max_workers (int | None, optional): Artifacts moved at once. Defaults to
+            min(32, number of CPUs + 4).
+
+    Returns:
+        MigrateResult: The number of artifacts moved, and the datasets left where they
+            were because their artifact is not in the local store.
+    """
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().migrate_layout(max_workers=max_workers)
+
+
+def _fsck(shelf: Shelf, full: bool = False, max_workers: int | None = None) -> FsckResult:
+    from concurrent.futures import ThreadPoolExecutor
+
+    datashelf_path = shelf.path
+    storage = shelf.storage
+    buffer_size = get_hash_buffer_size(datashelf_path=datashelf_path)
+    remote_backend = isinstance(storage, RemoteBackedStorage)
+
+    entries = shelf.catalog.entries()
+    problems: list[FsckProblem] = []
+    # key -> (algorithm, expected hash), and the keys each entry is stored in
+    expected: dict[str, tuple[str, str]] = {}
+    entry_keys: list[tuple[FileEntry, list[str]]] = []
+
+    for entry in entries:
+        stored_path = storage.locate(entry["stored_path"])
+
+        if not storage.exists(stored_path):
+            if not remote_backend:
+                problems.append(_problem(entry, "missing", f"{stored_path} not found"))
+            continue
+
+        if not is_chunked(entry):
+            expected[stored_path] = (entry_hash_algorithm(entry), entry["file_hash"])
+            entry_keys.append((entry, [stored_path]))
+            continue
+
+        try:
+            manifest = read_manifest(datashelf_path=datashelf_path, file_entry=entry)
+        except ValueError:
+            problems.append(_problem(entry, "corrupt", f"{stored_path} is not valid JSON"))
+            continue
+
+        if manifest["file_hash"] != entry["file_hash"]:
+            problems.append(
+                _problem(entry, "corrupt", f"{stored_path} describes another artifact")
+            )
+            continue
+
+        # Chunks are named after their sha256, whatever the artifact's algorithm
+        keys = [chunk_key(chunk_hash) for chunk_hash, _ in manifest["chunks"]]
+        expected.update({key: ("sha256", key.rsplit("/", 1)[1]) for key in keys})
+        entry_keys.append((entry, keys))
+
+    cache = {} if full else read_verifications(datashelf_path=datashelf_path)
+    verified = {
+        key
+        for key, (algorithm, file_hash) in expected.items()
+        if is_verified(
+            path=storage.path(key),
+            algorithm=algorithm,
+            file_hash=file_hash,
+            cached=cache.get(key),
+        )
+    }
+    to_hash = [key for key in expected if key not in verified]
+
+    with (
+        span("fsck.hash", files=len(to_hash)) as s,
+        ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor,
+    ):
+        results = dict(
+            zip(
+                to_hash,
+                executor.map(
+                    lambda key: _rehash(
+                        path=storage.path(key),
+                        algorithm=expected[key][0],
+                        chunk_size=buffer_size,
+                    ),
+                    to_hash,
+                ),
+            )
+        )
+        s["bytes"] = sum(v["size"] for v in results.values() if v is not None)
+
+    new_verifications: dict[str, Verification] = {}
+    for key, verification in results.items():
+        if verification is not None and verification["file_hash"] == expected[key][1]:
+            new_verifications[key] = verification
+            verified.add(key)
+
+    for entry, keys in entry_keys:
+        for key in keys:
+            if key in verified:
+                continue
+
+            if results.get(key) is None:
+                problems.append(_problem(entry, "missing", f"{key} not found"))
+            else:
+                actual = results[key]["file_hash"]
+                problems.append(_problem(entry, "corrupt", f"{key} hashes to {actual[:8]}"))
+            break
+
+    write_verifications(
+        datashelf_path=datashelf_path, verifications=new_verifications, keep=verified
+    )
+
+    result: FsckResult = {
+        "datasets": len(entries),
+        "hashed": len(to_hash),
+        "cached": len(expected) - len(to_hash),
+        "bytes": sum(v["size"] for v in results.values() if v is not None),
+        "problems": problems,
+    }
+    _print_fsck_result(result=result)
+    return result
+
+
+def _gc(shelf: Shelf, dry_run: bool = False, min_age_hours: float = 1.0) -> GcResult:
+    datashelf_path = shelf.path
+    storage = shelf.storage
+    cutoff = time.time() - min_age_hours * 3600
+
+    # Listed before the catalog is read, so an object registered in between is marked.
+    # A save keeps writing into its temp directory without touching the directory's
+    # own mtime, so it is only stale once nothing inside it has changed either
+    temp_dirs = [
+        p
+        for p in datashelf_path.iterdir()
+        if p.is_dir() and p.name.startswith("tmp") and _newest_mtime(p) < cutoff
+    ]
+    hidden = [p for p in _hidden_files(datashelf_path=datashelf_path) if _mtime(p) < cutoff]
+    object_keys = [key for d in STORE_DIRS for key in storage.list(f"{d}/")]
+
+    with span("gc.mark"):
+        referenced: set[str] = set()
+        hashes: set[str] = set()
+
+        for entry in shelf.catalog.entries():
+            stored_path = storage.locate(entry["stored_path"])
+            referenced.add(stored_path)
+            hashes.add(entry["file_hash"])
+
+            if is_chunked(entry) and storage.exists(stored_path):
+                manifest = read_manifest(datashelf_path=datashelf_path, file_entry=entry)
+                referenced.update(chunk_key(h) for h, _ in manifest["chunks"])
+
+    unreferenced = []
+    for key in object_keys:
+        if key.startswith((f"{MATERIALIZED_DIR}/", f"{SUMMARIES_DIR}/")):
+            # Reassembled copies and summaries are named <hash>.parquet and <hash>.json
+            needed = Path(key).stem in hashes
+        else:
+            needed = key in referenced
+
+        if not needed and _mtime(storage.path(key)) < cutoff:
+            unreferenced.append(storage.path(key))
+
+    removed: list[str] = []
+    reclaimed = 0
+
+    with span("gc.sweep", dry_run=dry_run) as s:
+        for path in temp_dirs + hidden + unreferenced:
+            size = _tree_size(path)
+
+            if not dry_run:
+                try:
+                    if path.is_dir():
+                        shutil.rmtree(path)
+                    else:
+                        path.unlink()
+                except FileNotFoundError:
+                    continue
+
+            removed.append(path.relative_to(datashelf_path).as_posix())
+            reclaimed += size
+
+        s["bytes"] = reclaimed
+
+    verb = "Would remove" if dry_run else "Removed"
+    print(
+        f"{verb} {len(unreferenced)} unreferenced files and "
+        f"{len(temp_dirs) + len(hidden)} temporary files or directories "
+        f"({reclaimed / 1e6:.1f} MB{' would be' if dry_run else ''} reclaimed)."
+    )
+    return {"removed": removed, "bytes": reclaimed, "dry_run": dry_run}
+
+
+def _migrate_layout(shelf: Shelf, max_workers: int | None = None) -> MigrateResult:
+    from concurrent.futures import ThreadPoolExecutor
+
+    datashelf_path = shelf.path
+    storage = shelf.storage
+    layout = get_artifact_layout(datashelf_path=datashelf_path)
+
+    # file_hash -> (key the artifact is at, key it belongs at in the layout)
+    moves: dict[str, tuple[str, str]] = {}
+    missing: list[str] = []
+
+    for entry in shelf.catalog.entries():
+        stored_path = entry["stored_path"]
+        target = artifact_key(filename=Path(stored_path).name, layout=layout)
+
+        if stored_path == target:
+            continue
+
+        current = storage.locate(stored_path)
+        if not storage.exists(current):
+            # Not fetched from the remote store yet, or lost: it is pulled under its old key
+            missing.append(entry["name"])
+            continue
+
+        moves[entry["file_hash"]] = (current, target)
+
+    with (
+        span("migrate.move", artifacts=len(moves)),
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+    ):
+        list(
+            executor.map(
+                lambda move: _move_object(storage=storage, key=move[0], dest_key=move[1]),
+                moves.values(),
+            )
+        )
+
+    shelf.catalog.update_many(
+        updates={
+            file_hash: {"stored_path": target} for file_hash, (_, target) in moves.items()
+        }
+    )
+    _rename_verifications(datashelf_path=datashelf_path, renames=dict(moves.values()))
+    _remove_empty_dirs(root=datashelf_path / ARTIFACTS_DIR)
+
+    print(f"Moved {len(moves)} artifacts to the '{layout}' layout.")
+    if missing:
+        print(
+            f"{len(missing)} datasets whose artifact is not in the local store were left "
+            f"as they were: {', '.join(missing)}"
+        )
+
+    return {"layout": layout, "moved": len(moves), "missing": missing}
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _rehash(path: Path, algorithm: str, chunk_size: int) -> Verification | None:
+    # Stat first: if the file is modified while it is read, the recorded stat no
+    # longer matches and the next run reads it again
+    try:
+        before = stat_verification(path=path, algorithm=algorithm, file_hash="")
+        file_hash = hash_file(data_path=path, algorithm=algorithm, chunk_size=chunk_size)
+    except FileNotFoundError:
+        return None
+
+    return {**before, "file_hash": file_hash}
+
+
+def _move_object(storage: LocalStorage, key: str, dest_key: str) -> None:
+    # Already moved by an earlier, interrupted migration
+    if key == dest_key:
+        return
+
+    storage.put(key=dest_key, src=storage.path(key), move=True)
+
+
+def _rename_verifications(datashelf_path: Path, renames: dict[str, str]) -> None:
+    # A rename keeps the size, modification time and inode, so fsck still trusts them
+    cache = read_verifications(datashelf_path=datashelf_path)
+    renamed = {new: cache[old] for old, new in renames.items() if old in cache}
+
+    if renamed:
+        write_verifications(
+            datashelf_path=datashelf_path,
+            verifications=renamed,
+            keep=(set(cache) - set(renames)) | set(renamed),
+        )
+
+
+def _remove_empty_dirs(root: Path) -> None:
+    # Shard directories emptied by a migration back to the flat layout
+    for dirpath, _, _ in os.walk(root, topdown=False):
+        if Path(dirpath) != root and not os.listdir(dirpath):
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass
+
+
+def _problem(entry: FileEntry, status: str, detail: str) -> FsckProblem:
+    return {
+        "name": entry["name"],
+        "file_hash": entry["file_hash"],
+        "status": status,
+        "detail": detail,
+    }
+
+
+def _print_fsck_result(result: FsckResult) -> None:
+    problems = result["problems"]
+
+    if problems:
+        name_width = max([len("Name")] + [len(p["name"]) for p in problems])
+
+        print(f"{'Hash':<8}  {'Name':<{name_width}}  {'Status':<7}  Detail")
+        print("-" * (8 + name_width + 7 + 14))
+
+        for p in problems:
+            print(
+                f"{p['file_hash'][:8]:<8}  {p['name']:<{name_width}}  "
+                f"{p['status']:<7}  {p['detail']}"
+            )
+        print()
+
+    print(
+        f"Checked {result['datasets']} datasets: {len(problems)} with problems. "
+        f"Hashed {result['hashed']} files ({result['bytes'] / 1e6:.1f} MB), "
+        f"{result['cached']} unchanged since last verified."
+    )
+
+
+def _hidden_files(datashelf_path: Path) -> list[Path]:
+    # Temporary files of atomic writes and partial downloads start with "."
+    found = []
+
+    for store_dir in STORE_DIRS:
+        for dirpath, _, filenames in os.walk(datashelf_path / store_dir):
+            found.extend(Path(dirpath) / f for f in filenames if f.startswith("."))
+
+    return found
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return time.time()
+
+
+def _newest_mtime(path: Path) -> float:
+    newest = _mtime(path)
+
+    for dirpath, dirnames, filenames in os.walk(path):
+        for name in dirnames + filenames:
+            newest = max(newest, _mtime(Path(dirpath) / name))
+
+    return newest
+
+
+def _tree_size(path: Path) -> int:
+    if not path.is_dir():
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    return sum(
+        (Path(dirpath) / f).stat().st_size
+        for dirpath, _, filenames in os.walk(path)
+        for f in filenames
+    )
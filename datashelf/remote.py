@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
+from datashelf.core.chunkstore import chunk_key, is_chunked, read_manifest
+from datashelf.core.config import get_remote_path, get_transfer_settings
+from datashelf.core.metadata import FileEntry, entry_hash_algorithm
+from datashelf.core.storage import (
+    RemoteBackedStorage,
+    RemoteStorage,
+    download_objects,
+    upload_objects,
+)
+
+if TYPE_CHECKING:
+    from datashelf.shelf import Shelf
+
+
+class TransferResult(TypedDict):
+    entries: int  # datasets newly registered on the receiving side
+    objects: int  # artifacts, manifests and chunks transferred
+    bytes: int
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def push(
+    lookup_keys: list[str] | None = None,
+    remote: str | Path | None = None,
+    max_workers: int | None = None,
+) -> TransferResult:
+    """Upload datasets to a remote store.
+
+    Only artifacts (and chunks) the remote does not hold yet are sent. Objects are
+    uploaded in parts, 'transfer_workers' parts at a time, and an interrupted push
+    resumes from the parts that already arrived. Each dataset's catalog entry is
+    published after its objects, so other machines never see a dataset they cannot pull.
+
+    Args:
+        lookup_keys (list[str] | None, optional): Dataset names or hash prefixes to push.
+            Defaults to every dataset on the shelf.
+        remote (str | Path | None, optional): Remote store directory. Defaults to the
+            'remote_path' setting in config.yaml.
+        max_workers (int | None, optional): Parts transferred at once. Defaults to the
+            'transfer_workers' setting in config.yaml.
+
+    Raises:
+        ValueError: If no remote is given or configured.
+        ValueError: If a lookup key matches no dataset.
+
+    Returns:
+        TransferResult: Counts of the datasets, objects and bytes pushed.
+    """
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().push(
+        lookup_keys=lookup_keys, remote=remote, max_workers=max_workers
+    )
+
+
+def pull(
+    lookup_keys: list[str] | None = None,
+    remote: str | Path | None = None,
+    max_workers: int | None = None,
+) -> TransferResult:
+    """Download datasets from a remote store and register them in the local catalog.
+
+    Only artifacts (and chunks) missing from the local store are fetched, with ranged
+    reads run 'transfer_workers' at a time. Partial downloads are kept, so an
+    interrupted pull resumes where it stopped. Datasets already in the catalog whose
+    artifacts were removed locally are fetched again.
+
+    Args:
+        lookup_keys (list[str] | None, optional): Dataset names or hash prefixes to pull.
+            Defaults to every dataset on the remote.
+        remote (str | Path | None, optional): Remote store directory. Defaults to the
+            'remote_path' setting in config.yaml.
+        max_workers (int | None, optional): Parts transferred at once. Defaults to the
+            'transfer_workers' setting in config.yaml.
+
+    Raises:
+        ValueError: If no remote is given or configured.
+        ValueError: If a lookup key matches no dataset on the remote.
+        FileNotFoundError: If the remote store does not exist.
+
+    Returns:
+        TransferResult: Counts of the datasets, objects and bytes pulled.
+    """
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().pull(
+        lookup_keys=lookup_keys, remote=remote, max_workers=max_workers
+    )
+
+
+def _push(
+    shelf: Shelf,
+    lookup_keys: list[str] | None = None,
+    remote: str | Path | None = None,
+    max_workers: int | None = None,
+) -> TransferResult:
+    remote_store = _open_remote(shelf=shelf, remote=remote, create=True)
+    entries = _select(entries=shelf.catalog.entries(), lookup_keys=lookup_keys)
+
+    result = _upload_entries(
+        shelf=shelf, remote_store=remote_store, entries=entries, max_workers=max_workers
+    )
+
+    print(
+        f"Pushed {result['entries']} datasets ({result['objects']} objects, "
+        f"{result['bytes'] / 1e6:.1f} MB) to {remote_store.root}."
+    )
+    return result
+
+
+def _pull(
+    shelf: Shelf,
+    lookup_keys: list[str] | None = None,
+    remote: str | Path | None = None,
+    max_workers: int | None = None,
+) -> TransferResult:
+    remote_store = _open_remote(shelf=shelf, remote=remote)
+    entries = _select(entries=remote_store.entries(), lookup_keys=lookup_keys)
+
+    catalog = shelf.catalog
+    new_entries = [e for e in entries if not catalog.find_by_hash(file_hash=e["file_hash"])]
+
+    objects, received = _download_entries(
+        shelf=shelf, remote_store=remote_store, entries=entries, max_workers=max_workers
+    )
+
+    # Registered only once every object is in place
+    if new_entries:
+        catalog.add_many(entries=new_entries)
+
+    print(
+        f"Pulled {len(new_entries)} datasets ({objects} objects, "
+        f"{received / 1e6:.1f} MB) from {remote_store.root}."
+    )
+    return {"entries": len(new_entries), "objects": objects, "bytes": received}
+
+
+def publish_entries(shelf: Shelf, entries: list[FileEntry]) -> None:
+    """
+    Uploads newly saved entries when 'storage_backend' is 'remote', so every save is
+    written through to the remote store.
+    """
+    storage = shelf.storage
+    if not entries or not isinstance(storage, RemoteBackedStorage):
+        return
+
+    _upload_entries(
+        shelf=shelf,
+        remote_store=_open_remote(shelf=shelf, remote=storage.remote.root, create=True),
+        entries=entries,
+    )
+
+
+def fetch_entry(shelf: Shelf, file_entry: FileEntry) -> None:
+    """
+    Downloads the artifact of an entry from the remote store if it is not in the local
+    store and 'storage_backend' is 'remote', so load and checkout only fetch the
+    datasets they use. With the local backend a missing artifact is left to fail as before.
+    """
+    storage = shelf.storage
+    if storage.exists(storage.locate(file_entry["stored_path"])):
+        return
+
+    if not isinstance(storage, RemoteBackedStorage):
+        return
+
+    _download_entries(
+        shelf=shelf,
+        remote_store=_open_remote(shelf=shelf, remote=storage.remote.root),
+        entries=[file_entry],
+    )
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _open_remote(
+    shelf: Shelf, remote: str | Path | None, create: bool = False
+) -> RemoteStorage:
+    root = Path(remote).expanduser().resolve() if remote else None
+    root = root or get_remote_path(datashelf_path=shelf.path)
+
+    if root is None:
+        raise ValueError(
+            "No remote store configured. Set 'remote_path' in config.yaml or pass a remote."
+        )
+
+    if create:
+        root.mkdir(parents=True, exist_ok=True)
+
+    elif not root.is_dir():
+        raise FileNotFoundError(f"Remote store not found: {root}")
+
+    return RemoteStorage(root=root)
+
+
+def _select(entries: list[FileEntry], lookup_keys: list[str] | None) -> list[FileEntry]:
+    if not lookup_keys:
+        return list(entries)
+
+    selected = {}
+    for key in lookup_keys:
+        matches = [
+            e for e in entries if e["name"] == key or e["file_hash"].startswith(key)
+        ]
+        if not matches:
+            raise ValueError(f"No match found for {key}.")
+
+        for entry in matches:
+            selected[entry["file_hash"]] = entry
+
+    return list(selected.values())
+
+
+def _upload_entries(
+    shelf: Shelf,
+    remote_store: RemoteStorage,
+    entries: list[FileEntry],
+    max_workers: int | None = None,
+) -> TransferResult:
+    workers, part_size = get_transfer_settings(datashelf_path=shelf.path)
+
+    published = remote_store.entry_hashes()
+    entries = [e for e in entries if e["file_hash"] not in published]
+
+    # Ordered and deduplicated, as versions of a chunked dataset share most chunks
+    keys: dict[str, None] = {}
+    for entry in entries:
+        for key in _object_keys(shelf=shelf, file_entry=entry):
+            if key not in keys and not remote_store.exists(key):
+                keys[key] = None
+
+    # Chunks come before the manifests listing them, and objects complete in order
+    sent = upload_objects(
+        local=shelf.storage,
+        remote=remote_store,
+        keys=list(keys),
+        part_size=part_size,
+        max_workers=max_workers or workers,
+        src_keys={key: shelf.storage.locate(key) for key in keys},
+    )
+
+    for entry in entries:
+        remote_store.put_entry(entry=entry)
+
+    return {"entries": len(entries), "objects": len(keys), "bytes": sent}
+
+
+def _download_entries(
+    shelf: Shelf,
+    remote_store: RemoteStorage,
+    entries: list[FileEntry],
+    max_workers: int | None = None,
+) -> tuple[int, int]:
+    workers, part_size = get_transfer_settings(datashelf_path=shelf.path)
+    local = shelf.storage
+
+    # Key -> (algorithm, hash) the downloaded object must match, in download order
+    expected: dict[str, tuple[str, str]] = {}
+    for entry in entries:
+        stored_path = entry["stored_path"]
+        # A manifest is only written locally once its chunks are, so a local manifest
+        # means the whole artifact is there
+        if local.exists(local.locate(stored_path)):
+            continue
+
+        if not is_chunked(entry):
+            expected[stored_path] = (entry_hash_algorithm(entry), entry["file_hash"])
+            continue
+
+        data = remote_store.read_range(
+            key=stored_path, offset=0, length=remote_store.size(stored_path)
+        )
+        try:
+            manifest = json.loads(data)
+        except ValueError:
+            manifest = {}
+
+        # As in fsck, a manifest is checked against its entry and its chunks are
+        # checked against their sha256 names
+        if manifest.get("file_hash") != entry["file_hash"]:
+            raise ValueError(
+                f"{stored_path} on the remote store is corrupt or describes another "
+                f"artifact than {entry['name']}."
+            )
+
+        for chunk_hash, _ in manifest["chunks"]:
+            key = chunk_key(chunk_hash)
+            if key not in expected and not local.exists(key):
+                expected[key] = ("sha256", chunk_hash)
+
+        # The manifest that is downloaded must be the one that was checked
+        expected[stored_path] = ("sha256", hashlib.sha256(data).hexdigest())
+
+    received = download_objects(
+        remote=remote_store,
+        local=local,
+        keys=list(expected),
+        part_size=part_size,
+        max_workers=max_workers or workers,
+        expected=expected,
+    )
+
+    return len(expected), received
+
+
+def _object_keys(shelf: Shelf, file_entry: FileEntry) -> list[str]:
+    """Keys of the objects holding an artifact, the manifest of a chunked one last."""
+    if not is_chunked(file_entry):
+        return [file_entry["stored_path"]]
+
+    manifest = read_manifest(datashelf_path=shelf.path, file_entry=file_entry)
+
+    return [chunk_key(h) for h, _ in manifest["chunks"]] + [file_entry["stored_path"]]
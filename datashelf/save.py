@@ -1,32 +1,134 @@
-import pandas as pd
-import shutil
+from __future__ import annotations
+
 from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict, Optional
 from tempfile import TemporaryDirectory
 from datashelf.core.config import (
     get_config_tags_settings,
     validate_tags,
     get_parquet_engine,
+    get_ingest_settings,
+    get_fingerprint_settings,
+    get_chunk_settings,
+    get_artifact_layout,
+    get_parquet_write_options,
+    get_hash_algorithm,
+    get_hash_buffer_size,
 )
-from datashelf.core.directory import find_datashelf_path
-from datashelf.core.hashing import sha256_hex, make_temp_parquet
-from datashelf.core.metadata import (
-    load_metadata,
-    _atomic_write_json,
-    create_file_entry,
-    _get_current_timestamp,
+from datashelf.core.hashing import hash_file, make_temp_parquet
+from datashelf.core.fingerprint import (
+    source_fingerprint,
+    lookup_fingerprint,
+    record_fingerprint,
+    record_fingerprints,
 )
+from datashelf.core.metadata import create_file_entry, entry_hash_algorithm, FileEntry
+from datashelf.core.parquet_options import ParquetWriteOptions, validate_write_options
+from datashelf.core.profiling import span
+from datashelf.core.storage import artifact_key
+from datashelf.core.summary import summarize_file, write_summary
+from datashelf.remote import publish_entries
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from datashelf.shelf import Shelf
+
+
+class SaveItem(TypedDict):
+    data: pd.DataFrame | str | Path
+    name: str
+    message: Optional[str]
+    tag: Optional[str]
+    sheet: Optional[str]  # sheet of an xlsx file; may be left out for the first sheet
+
 
+class SaveResult(TypedDict):
+    name: str
+    # saved | exists | tag_conflict | duplicate | error
+    status: str
+    file_hash: Optional[str]
+    detail: str
 
-def save(data: pd.DataFrame | str | Path, name: str, message: str, tag: str) -> None:
+
+def save(
+    data: pd.DataFrame | str | Path,
+    name: str,
+    message: str,
+    tag: str,
+    stream: bool | None = None,
+    write_options: ParquetWriteOptions | None = None,
+    prompt: bool = True,
+    sheets: list[str] | str | None = None,
+) -> list[SaveResult] | None:
     """Save data to the datashelf.
 
+    If data is a file path that was saved before and has not changed since (same size,
+    modification time and inode), the conversion is skipped and the existing artifact is used.
+
+    With sheets, several sheets of an xlsx workbook are saved as separate datasets named
+    "<name>_<sheet>", converted in parallel worker processes as by `save_many`.
+
     Args:
         data (pd.DataFrame | str | Path): The data to be saved. Can be a pandas DataFrame, a file path as a string, or a Path object.
         name (str): The name to assign to the saved data.
         message (str): A message describing the saved data.
         tag (str): The tag to associate with the saved data.
+        stream (bool | None, optional): Convert CSV files in chunks within the configured
+            'ingest_memory_budget_mb'. Defaults to the 'stream_csv' setting in config.yaml.
+        write_options (ParquetWriteOptions | None, optional): Parquet write options for this
+            save (e.g. {"compression": "zstd", "sort_by": ["date"]}), overriding the
+            'parquet_*' settings in config.yaml. Note that different options produce a
+            different artifact, and so a different hash, for the same data.
+        prompt (bool, optional): If the data is already stored under another tag, ask
+            whether to update that entry's metadata. If False, nothing is changed.
+            Defaults to True.
+        sheets (list[str] | str | None, optional): Sheets of an xlsx file to save, or "all"
+            for every sheet. Nothing is prompted for. Defaults to None (only the first sheet,
+            saved as name).
+
+    Returns:
+        list[SaveResult] | None: One result per sheet if sheets is given, otherwise None.
+
+    Raises:
+        ValueError: If sheets is given for data that is not an xlsx file, or names a
+            sheet the workbook does not have.
     """
-    datashelf_path: Path = find_datashelf_path()
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().save(
+        data=data,
+        name=name,
+        message=message,
+        tag=tag,
+        stream=stream,
+        write_options=write_options,
+        prompt=prompt,
+        sheets=sheets,
+    )
+
+
+def _save(
+    shelf: Shelf,
+    data: pd.DataFrame | str | Path,
+    name: str,
+    message: str,
+    tag: str,
+    stream: bool | None = None,
+    write_options: ParquetWriteOptions | None = None,
+    prompt: bool = True,
+    sheets: list[str] | str | None = None,
+) -> list[SaveResult] | None:
+    if sheets is not None:
+        return _save_many(
+            shelf=shelf,
+            items=sheet_items(
+                data_path=data, name=name, message=message, tag=tag, sheets=sheets
+            ),
+            stream=stream,
+            write_options=write_options,
+        )
+
+    datashelf_path = shelf.path
 
     tag_validation_enforced, allowed_tags = get_config_tags_settings(
         datashelf_path=datashelf_path
@@ -34,87 +136,523 @@ def save(data: pd.DataFrame | str | Path, name: str, message: str, tag: str) ->
     if tag_validation_enforced:
         validate_tags(tag=tag, allowed_tags=allowed_tags)
 
+    engine = get_parquet_engine(datashelf_path=datashelf_path)
+    stream_csv, memory_budget_mb = get_ingest_settings(datashelf_path=datashelf_path)
+    stream = stream_csv if stream is None else stream
+    write_options = _resolve_write_options(
+        datashelf_path=datashelf_path, engine=engine, write_options=write_options
+    )
+
+    hash_algorithm = get_hash_algorithm(datashelf_path=datashelf_path)
+
+    catalog = shelf.catalog
+
+    # Settings that change the bytes (or the hash) of the artifact produced from the same source
+    conversion = _conversion(
+        engine=engine,
+        stream=stream,
+        write_options=write_options,
+        hash_algorithm=hash_algorithm,
+    )
+    use_fingerprints, fast_hash = get_fingerprint_settings(
+        datashelf_path=datashelf_path
+    )
+    fingerprint = None
+
+    if use_fingerprints and isinstance(data, (str, Path)) and Path(data).exists():
+        with span("save.fingerprint") as s:
+            fingerprint = source_fingerprint(data_path=Path(data), fast_hash=fast_hash)
+            cached_hash = lookup_fingerprint(
+                datashelf_path=datashelf_path,
+                fingerprint=fingerprint,
+                conversion=conversion,
+            )
+            existing = catalog.find_by_hash(file_hash=cached_hash) if cached_hash else []
+            s["hit"] = bool(existing)
+
+        if existing:
+            _handle_existing_entry(
+                catalog=catalog,
+                entry=existing[0],
+                name=name,
+                message=message,
+                tag=tag,
+                prompt=prompt,
+            )
+            return
+
     # Open a temporary directory for hash validation and metadata update processes
     with TemporaryDirectory(dir=datashelf_path) as t_dir:
         temp_dir = Path(t_dir)
         temp_dir.mkdir(parents=True, exist_ok=True)
         temp_data_path = temp_dir / "data.parquet"
 
-        engine = get_parquet_engine(datashelf_path=datashelf_path)
-        make_temp_parquet(data=data, output_path=temp_data_path, engine=engine)
-        data_hash = sha256_hex(data_path=temp_data_path)
+        # The hash is computed while the parquet file is written
+        with span("save.convert", stream=stream) as s:
+            _, data_hash = make_temp_parquet(
+                data=data,
+                output_path=temp_data_path,
+                engine=engine,
+                stream=stream,
+                memory_budget_mb=memory_budget_mb,
+                write_options=write_options,
+                hash_algorithm=hash_algorithm,
+            )
+            s["bytes"] = temp_data_path.stat().st_size
 
-        metadata = load_metadata(datashelf_path=datashelf_path)
-        metadata_path = datashelf_path / "metadata.json"
+        # Check if the artifact already exists in the catalog
+        with span("save.dedupe"):
+            existing = _find_existing(
+                datashelf_path=datashelf_path,
+                catalog=catalog,
+                artifact_path=temp_data_path,
+                data_hash=data_hash,
+                hash_algorithm=hash_algorithm,
+            )
 
-        # Check if hash already exists in metadata["files"]
-        for entry in metadata["files"]:
-            if entry["file_hash"] == data_hash and entry["tag"] == tag:
-                print(
-                    f"Data {name} already exists in .datashelf with hash {entry['file_hash']}."
-                )
-                return
-
-            elif entry["file_hash"] == data_hash and entry["tag"] != tag:
-                msg = (
-                    "This data already exists in .datashelf/ under a different tag with the following metadata:\n\n"
-                    f"\t- Hash: {entry['file_hash'][:8] + '...'}\n\t- Name: {entry['name']}\n\t- Message: {entry['message']}"
-                    f"\n\t- Tag: {entry['tag']}\n\n"
-                    "Would you like to update the metadata of this entry with the following metadata? (Y/N)\n\n"
-                    f"\t-New Name: {name}\n\t- New Message: {message}\n\t-New Tag: {tag}\n"
+        if fingerprint is not None:
+            record_fingerprint(
+                datashelf_path=datashelf_path,
+                fingerprint=fingerprint,
+                conversion=conversion,
+                artifact_hash=existing[0]["file_hash"] if existing else data_hash,
+            )
+
+        if existing:
+            _handle_existing_entry(
+                catalog=catalog,
+                entry=existing[0],
+                name=name,
+                message=message,
+                tag=tag,
+                prompt=prompt,
+            )
+            return
+
+        stored_path = _store_artifact(
+            shelf=shelf, temp_path=temp_data_path, data_hash=data_hash
+        )
+
+        data_file_entry = create_file_entry(
+            file_hash=data_hash,
+            name=name,
+            stored_path=stored_path,
+            message=message,
+            tag=tag,
+            hash_algorithm=hash_algorithm,
+        )
+        catalog.add(entry=data_file_entry)
+        publish_entries(shelf=shelf, entries=[data_file_entry])
+
+    print(f"Successfully saved '{name}' with hash {data_hash[:8]}.")
+
+
+def save_many(
+    items: list[SaveItem],
+    stream: bool | None = None,
+    max_workers: int | None = None,
+    write_options: ParquetWriteOptions | None = None,
+) -> list[SaveResult]:
+    """Save several datasets to the datashelf at once.
+
+    Inputs are converted and hashed in parallel worker processes, deduplicated against
+    the catalog and against each other, and every new entry is registered in a single
+    metadata commit. Nothing is prompted for: data that already exists under a different
+    tag is reported as a 'tag_conflict' and left unchanged.
+
+    Args:
+        items (list[SaveItem]): Datasets to save, each with 'data', 'name' and optional
+            'message' and 'tag'.
+        stream (bool | None, optional): Convert CSV files in chunks within the configured
+            'ingest_memory_budget_mb'. Defaults to the 'stream_csv' setting in config.yaml.
+        max_workers (int | None, optional): Number of worker processes. Defaults to the
+            number of CPUs.
+        write_options (ParquetWriteOptions | None, optional): Parquet write options for
+            every item, overriding the 'parquet_*' settings in config.yaml.
+
+    Returns:
+        list[SaveResult]: One result per item, in input order.
+    """
+    from datashelf.shelf import _default_shelf
+
+    return _default_shelf().save_many(
+        items=items,
+        stream=stream,
+        max_workers=max_workers,
+        write_options=write_options,
+    )
+
+
+def _save_many(
+    shelf: Shelf,
+    items: list[SaveItem],
+    stream: bool | None = None,
+    max_workers: int | None = None,
+    write_options: ParquetWriteOptions | None = None,
+) -> list[SaveResult]:
+    from concurrent.futures import ProcessPoolExecutor
+
+    datashelf_path = shelf.path
+
+    tag_validation_enforced, allowed_tags = get_config_tags_settings(
+        datashelf_path=datashelf_path
+    )
+    engine = get_parquet_engine(datashelf_path=datashelf_path)
+    stream_csv, memory_budget_mb = get_ingest_settings(datashelf_path=datashelf_path)
+    stream = stream_csv if stream is None else stream
+    write_options = _resolve_write_options(
+        datashelf_path=datashelf_path, engine=engine, write_options=write_options
+    )
+    hash_algorithm = get_hash_algorithm(datashelf_path=datashelf_path)
+    use_fingerprints, fast_hash = get_fingerprint_settings(
+        datashelf_path=datashelf_path
+    )
+    conversion = _conversion(
+        engine=engine,
+        stream=stream,
+        write_options=write_options,
+        hash_algorithm=hash_algorithm,
+    )
+
+    catalog = shelf.catalog
+
+    results: list[SaveResult | None] = [None] * len(items)
+    hashes: dict[int, str] = {}
+    fingerprints: dict[int, dict] = {}
+
+    for i, item in enumerate(items):
+        try:
+            if tag_validation_enforced:
+                validate_tags(tag=item.get("tag") or "", allowed_tags=allowed_tags)
+
+        except ValueError as e:
+            results[i] = _result(item=item, status="error", detail=str(e))
+            continue
+
+        data = item["data"]
+        if use_fingerprints and isinstance(data, (str, Path)) and Path(data).exists():
+            fingerprints[i] = source_fingerprint(
+                data_path=Path(data), fast_hash=fast_hash, sheet=item.get("sheet")
+            )
+            cached_hash = lookup_fingerprint(
+                datashelf_path=datashelf_path,
+                fingerprint=fingerprints[i],
+                conversion=conversion,
+            )
+            if cached_hash and catalog.find_by_hash(file_hash=cached_hash):
+                hashes[i] = cached_hash
+
+    with TemporaryDirectory(dir=datashelf_path) as t_dir:
+        temp_dir = Path(t_dir)
+        to_convert = [
+            i for i in range(len(items)) if results[i] is None and i not in hashes
+        ]
+
+        if to_convert:
+            with (
+                span("save_many.convert", items=len(to_convert)),
+                ProcessPoolExecutor(max_workers=max_workers) as executor,
+            ):
+                futures = {
+                    i: executor.submit(
+                        make_temp_parquet,
+                        data=items[i]["data"],
+                        output_path=temp_dir / f"{i}.parquet",
+                        engine=engine,
+                        stream=stream,
+                        memory_budget_mb=memory_budget_mb,
+                        write_options=write_options,
+                        hash_algorithm=hash_algorithm,
+                        sheet=items[i].get("sheet"),
+                    )
+                    for i in to_convert
+                }
+
+                for i, future in futures.items():
+                    try:
+                        _, hashes[i] = future.result()
+
+                    except Exception as e:
+                        results[i] = _result(item=items[i], status="error", detail=str(e))
+
+        new_entries = []
+        batch_hashes: dict[str, str] = {}
+
+        for i, item in enumerate(items):
+            if results[i] is not None:
+                continue
+
+            existing = _find_existing(
+                datashelf_path=datashelf_path,
+                catalog=catalog,
+                artifact_path=temp_dir / f"{i}.parquet",
+                data_hash=hashes[i],
+                hash_algorithm=hash_algorithm,
+            )
+            if existing:
+                hashes[i] = existing[0]["file_hash"]
+
+            data_hash = hashes[i]
+
+            if existing and existing[0]["tag"] == (item.get("tag") or ""):
+                results[i] = _result(item, "exists", data_hash, "Already in .datashelf.")
+
+            elif existing:
+                detail = (
+                    f"Already in .datashelf as '{existing[0]['name']}' "
+                    f"with tag '{existing[0]['tag']}'. No changes made."
                 )
-                response = input(msg)
+                results[i] = _result(item, "tag_conflict", data_hash, detail)
+
+            elif data_hash in batch_hashes:
+                detail = f"Same data as '{batch_hashes[data_hash]}' in this batch."
+                results[i] = _result(item, "duplicate", data_hash, detail)
 
-                valid_response = (
-                    True if response.lower() in ["y", "n", "yes", "no"] else False
+            else:
+                stored_path = _store_artifact(
+                    shelf=shelf,
+                    temp_path=temp_dir / f"{i}.parquet",
+                    data_hash=data_hash,
+                )
+                new_entries.append(
+                    create_file_entry(
+                        file_hash=data_hash,
+                        name=item["name"],
+                        stored_path=stored_path,
+                        message=item.get("message") or "",
+                        tag=item.get("tag") or "",
+                        hash_algorithm=hash_algorithm,
+                    )
                 )
+                batch_hashes[data_hash] = item["name"]
+                results[i] = _result(item, "saved", data_hash, "Saved.")
 
-                while not valid_response:
-                    if not valid_response:
-                        response = input("Invalid response. Please enter Y or N. ")
-                        valid_response = (
-                            True
-                            if response.lower() in ["y", "n", "yes", "no"]
-                            else False
-                        )
+        if new_entries:
+            catalog.add_many(entries=new_entries)
+            publish_entries(shelf=shelf, entries=new_entries)
 
-                if response.lower() in ["y", "yes"]:
-                    # Update
-                    metadata["last_modified"] = _get_current_timestamp()
-                    entry["name"] = name
-                    entry["message"] = message
-                    entry["tag"] = tag
+    record_fingerprints(
+        datashelf_path=datashelf_path,
+        records=[
+            (fingerprint, conversion, hashes[i])
+            for i, fingerprint in fingerprints.items()
+            if i in hashes
+        ],
+    )
 
-                    _atomic_write_json(path=metadata_path, obj=metadata)
+    _print_save_results(results=results)
+    return results
 
-                    print(f"Updated metadata for existing artifact {data_hash[:8]}.")
-                    return
 
-                else:
-                    print("No changes made.")
-                    return
+def sheet_items(
+    data_path: str | Path,
+    name: str,
+    message: str,
+    tag: str,
+    sheets: list[str] | str,
+) -> list[SaveItem]:
+    """
+    Save items for sheets of an xlsx workbook ("all" for every sheet), each named
+    "<name>_<sheet>". Only the workbook's sheet list is read.
+    """
+    from datashelf.core.streaming import xlsx_sheet_names
 
-            else:
-                continue
+    if not isinstance(data_path, (str, Path)) or Path(data_path).suffix.lower() != ".xlsx":
+        raise ValueError("Sheets can only be selected when saving an .xlsx file.")
 
-        artifacts_dir = datashelf_path / "artifacts"
-        artifacts_dir.mkdir(parents=True, exist_ok=True)
+    available = xlsx_sheet_names(data_path=Path(data_path))
 
-        full_stored_path = artifacts_dir / f"{data_hash}.parquet"
-        stored_path = f"artifacts/{data_hash}.parquet"
+    if sheets == "all":
+        sheets = available
+    elif isinstance(sheets, str):
+        sheets = [sheets]
 
-        shutil.move(str(temp_data_path), str(full_stored_path))
+    missing = [sheet for sheet in sheets if sheet not in available]
+    if missing:
+        raise ValueError(
+            f"Sheet(s) not found in {data_path}: {', '.join(missing)}. "
+            f"Available sheets: {', '.join(available)}."
+        )
 
-        data_file_entry = create_file_entry(
-            file_hash=data_hash,
-            name=name,
-            stored_path=stored_path,
-            message=message,
-            tag=tag,
+    return [
+        {
+            "data": data_path,
+            "name": f"{name}_{sheet}",
+            "message": message,
+            "tag": tag,
+            "sheet": sheet,
+        }
+        for sheet in sheets
+    ]
+
+
+def _resolve_write_options(
+    datashelf_path: Path,
+    engine: str,
+    write_options: ParquetWriteOptions | None,
+) -> ParquetWriteOptions:
+    options = get_parquet_write_options(datashelf_path=datashelf_path)
+
+    if write_options:
+        options = validate_write_options(
+            options={**options, **write_options}, engine=engine
         )
-        metadata["last_modified"] = _get_current_timestamp()
-        metadata["files"].append(data_file_entry)
 
-        _atomic_write_json(path=metadata_path, obj=metadata)
+    return options
 
-    print(f"Successfully saved '{name}' with hash {data_hash[:8]}.")
+
+def _conversion(
+    engine: str,
+    stream: bool,
+    write_options: ParquetWriteOptions,
+    hash_algorithm: str,
+) -> dict:
+    conversion = {"engine": engine, "stream": stream, "write_options": write_options}
+
+    # Only recorded when not the default, so fingerprints cached before it existed still match
+    if hash_algorithm != "sha256":
+        conversion["hash_algorithm"] = hash_algorithm
+
+    return conversion
+
+
+def _find_existing(
+    datashelf_path: Path,
+    catalog,
+    artifact_path: Path,
+    data_hash: str,
+    hash_algorithm: str,
+) -> list[FileEntry]:
+    """
+    Entries holding the same artifact. After 'hash_algorithm' is changed, older entries
+    are keyed by another algorithm, so if none matches data_hash the artifact is also
+    hashed with each other algorithm in use on the shelf, to keep deduplicating against them.
+    """
+    existing = catalog.find_by_hash(file_hash=data_hash)
+
+    if existing or not artifact_path.exists():
+        return existing
+
+    buffer_size = get_hash_buffer_size(datashelf_path=datashelf_path)
+
+    for algorithm in sorted(catalog.hash_algorithms() - {hash_algorithm}):
+        other_hash = hash_file(
+            data_path=artifact_path, algorithm=algorithm, chunk_size=buffer_size
+        )
+        existing = [
+            entry
+            for entry in catalog.find_by_hash(file_hash=other_hash)
+            if entry_hash_algorithm(entry) == algorithm
+        ]
+        if existing:
+            return existing
+
+    return []
+
+
+def _store_artifact(shelf: Shelf, temp_path: Path, data_hash: str) -> str:
+    """
+    Moves a converted artifact into the store and returns its stored_path. With
+    'chunked_storage' on, the artifact is split into content-defined chunks instead,
+    so only chunks that no earlier artifact contains take up new space. The artifact's
+    summary (shape, dtypes, statistics) is recorded from its footer first.
+    """
+    datashelf_path = shelf.path
+    chunked, avg_chunk_kb = get_chunk_settings(datashelf_path=datashelf_path)
+    layout = get_artifact_layout(datashelf_path=datashelf_path)
+
+    write_summary(
+        datashelf_path=datashelf_path,
+        file_hash=data_hash,
+        summary=summarize_file(file_path=temp_path),
+    )
+
+    with span("save.store", bytes=temp_path.stat().st_size, chunked=chunked):
+        if chunked:
+            from datashelf.core.chunkstore import store_chunked
+
+            return store_chunked(
+                datashelf_path=datashelf_path,
+                file_path=temp_path,
+                file_hash=data_hash,
+                avg_chunk_kb=avg_chunk_kb,
+                layout=layout,
+            )
+
+        stored_path = artifact_key(filename=f"{data_hash}.parquet", layout=layout)
+        shelf.storage.put(key=stored_path, src=temp_path, move=True)
+
+        return stored_path
+
+
+def _result(
+    item: SaveItem, status: str, file_hash: str | None = None, detail: str = ""
+) -> SaveResult:
+    return {
+        "name": item["name"],
+        "status": status,
+        "file_hash": file_hash,
+        "detail": detail,
+    }
+
+
+def _print_save_results(results: list[SaveResult]) -> None:
+    name_width = max([len("Name")] + [len(r["name"]) for r in results])
+    status_width = max([len("Status")] + [len(r["status"]) for r in results])
+
+    print(f"{'Hash':<8}  {'Name':<{name_width}}  {'Status':<{status_width}}  Detail")
+    print("-" * (8 + name_width + status_width + 14))
+
+    for r in results:
+        short_hash = (r["file_hash"] or "")[:8]
+        print(
+            f"{short_hash:<8}  {r['name']:<{name_width}}  "
+            f"{r['status']:<{status_width}}  {r['detail']}"
+        )
+
+    saved = sum(r["status"] == "saved" for r in results)
+    print(f"\nSaved {saved} of {len(results)} datasets.")
+
+
+def _handle_existing_entry(
+    catalog, entry: FileEntry, name: str, message: str, tag: str, prompt: bool = True
+) -> None:
+    data_hash = entry["file_hash"]
+
+    if entry["tag"] == tag:
+        print(f"Data {name} already exists in .datashelf with hash {data_hash}.")
+        return
+
+    if not prompt:
+        print(
+            f"Data {name} already exists in .datashelf as '{entry['name']}' with tag "
+            f"'{entry['tag']}' (hash {data_hash[:8]}). No changes made."
+        )
+        return
+
+    msg = (
+        "This data already exists in .datashelf/ under a different tag with the following metadata:\n\n"
+        f"\t- Hash: {data_hash[:8] + '...'}\n\t- Name: {entry['name']}\n\t- Message: {entry['message']}"
+        f"\n\t- Tag: {entry['tag']}\n\n"
+        "Would you like to update the metadata of this entry with the following metadata? (Y/N)\n\n"
+        f"\t-New Name: {name}\n\t- New Message: {message}\n\t-New Tag: {tag}\n"
+    )
+    response = input(msg)
+
+    valid_response = True if response.lower() in ["y", "n", "yes", "no"] else False
+
+    while not valid_response:
+        if not valid_response:
+            response = input("Invalid response. Please enter Y or N. ")
+            valid_response = (
+                True if response.lower() in ["y", "n", "yes", "no"] else False
+            )
+
+    if response.lower() in ["y", "yes"]:
+        # Update
+        catalog.update(file_hash=data_hash, name=name, message=message, tag=tag)
+
+        print(f"Updated metadata for existing artifact {data_hash[:8]}.")
+
+    else:
+        print("No changes made.")
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+from datashelf.checkout import _checkout, _checkout_many
+from datashelf.inspect import _backfill_summaries, _ls, _schema, _show
+from datashelf.load import _head, _load
+from datashelf.maintenance import _fsck, _gc, _migrate_layout
+from datashelf.remote import _push, _pull
+from datashelf.save import _save, _save_many
+from datashelf.core.catalog import JsonCatalog, SqliteCatalog, open_catalog
+from datashelf.core.config import get_catalog_backend, get_remote_path, get_storage_backend
+from datashelf.core.profiling import span
+from datashelf.core.storage import LocalStorage, RemoteBackedStorage, open_storage
+from datashelf.core.directory import (
+    DATASHELF_PATH_ENV,
+    find_datashelf_path,
+    resolve_datashelf_path,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+    from datashelf.checkout import CheckoutMode
+    from datashelf.core.parquet_options import ParquetWriteOptions
+    from datashelf.core.summary import ArtifactSummary
+    from datashelf.maintenance import FsckResult, GcResult, MigrateResult
+    from datashelf.remote import TransferResult
+    from datashelf.save import SaveItem, SaveResult
+
+# Shelves handed out by the module-level functions, so their catalogs stay warm
+_SHELVES: dict[Path, "Shelf"] = {}
+# (cwd, DATASHELF_PATH) -> .datashelf directory found for it
+_ROOTS: dict[tuple[str, str | None], Path] = {}
+
+
+class Shelf:
+    """
+    Handle on one datashelf repository.
+
+    The repository root is resolved once, config.yaml is only re-parsed when it changes
+    on disk, and the catalog stays open between calls, picking up commits made by other
+    processes from the metadata journal instead of re-reading all of `metadata.json`.
+    This makes repeated lookups cheap in long-running processes. Catalogs are kept
+    per thread, so a Shelf can be shared between threads.
+
+    The methods take the same arguments as the module-level functions of the same name.
+    """
+
+    def __init__(self, datashelf_path: str | Path):
+        self.path = Path(datashelf_path)
+        self._storage: tuple[tuple, LocalStorage | RemoteBackedStorage] | None = None
+        self._local = threading.local()
+
+    def __repr__(self) -> str:
+        return f"Shelf({str(self.path)!r})"
+
+    @property
+    def catalog(self) -> JsonCatalog | SqliteCatalog:
+        backend = get_catalog_backend(datashelf_path=self.path)
+        cached = getattr(self._local, "catalog", None)
+
+        # Re-open if 'catalog_backend' was changed in config.yaml
+        if cached is None or cached[0] != backend:
+            if cached is not None:
+                cached[1].close()
+
+            cached = (backend, open_catalog(datashelf_path=self.path))
+            self._local.catalog = cached
+
+        return cached[1]
+
+    @property
+    def storage(self) -> LocalStorage | RemoteBackedStorage:
+        settings = (
+            get_storage_backend(datashelf_path=self.path),
+            get_remote_path(datashelf_path=self.path),
+        )
+
+        # Re-open if 'storage_backend' or 'remote_path' was changed in config.yaml
+        if self._storage is None or self._storage[0] != settings:
+            self._storage = (settings, open_storage(datashelf_path=self.path))
+
+        return self._storage[1]
+
+    def save(
+        self,
+        data: pd.DataFrame | str | Path,
+        name: str,
+        message: str,
+        tag: str,
+        stream: bool | None = None,
+        write_options: ParquetWriteOptions | None = None,
+        prompt: bool = True,
+        sheets: list[str] | str | None = None,
+    ) -> list[SaveResult] | None:
+        """Save data to this shelf. See `datashelf.save`."""
+        with span("save", name=name):
+            return _save(
+                shelf=self,
+                data=data,
+                name=name,
+                message=message,
+                tag=tag,
+                stream=stream,
+                write_options=write_options,
+                prompt=prompt,
+                sheets=sheets,
+            )
+
+    def save_many(
+        self,
+        items: list[SaveItem],
+        stream: bool | None = None,
+        max_workers: int | None = None,
+        write_options: ParquetWriteOptions | None = None,
+    ) -> list[SaveResult]:
+        """Save several datasets to this shelf at once. See `datashelf.save_many`."""
+        with span("save_many", items=len(items)):
+            return _save_many(
+                shelf=self,
+                items=items,
+                stream=stream,
+                max_workers=max_workers,
+                write_options=write_options,
+            )
+
+    def load(
+        self,
+        lookup_key: str,
+        to_df: bool = False,
+        as_arrow: bool = False,
+        memory_map: bool = False,
+        columns: list[str] | None = None,
+        filters: list[tuple] | list[list[tuple]] | None = None,
+    ) -> Path | pd.DataFrame | pa.Table:
+        """Load a stored artifact from this shelf. See `datashelf.load`."""
+        with span("load", lookup_key=lookup_key):
+            return _load(
+                shelf=self,
+                lookup_key=lookup_key,
+                to_df=to_df,
+                as_arrow=as_arrow,
+                memory_map=memory_map,
+                columns=columns,
+                filters=filters,
+            )
+
+    def head(
+        self, lookup_key: str, n: int = 10, columns: list[str] | None = None
+    ) -> pd.DataFrame:
+        """Return the first rows of a stored artifact. See `datashelf.head`."""
+        with span("head", lookup_key=lookup_key):
+            return _head(shelf=self, lookup_key=lookup_key, n=n, columns=columns)
+
+    def ls(
+        self,
+        filter_tag: list[str] | None = None,
+        name: str | None = None,
+        name_regex: str | None = None,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+        sort: str | None = None,
+        reverse: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        output_format: str = "table",
+        to_df: bool = False,
+    ) -> pd.DataFrame | None:
+        """List the datasets on this shelf. See `datashelf.ls`."""
+        with span("ls"):
+            return _ls(
+                shelf=self,
+                filter_tag=filter_tag,
+                name=name,
+                name_regex=name_regex,
+                since=since,
+                until=until,
+                sort=sort,
+                reverse=reverse,
+                limit=limit,
+                offset=offset,
+                output_format=output_format,
+                to_df=to_df,
+            )
+
+    def show(self, lookup_key: str) -> None:
+        """Print detailed metadata for a dataset. See `datashelf.show`."""
+        with span("show", lookup_key=lookup_key):
+            return _show(shelf=self, lookup_key=lookup_key)
+
+    def schema(self, lookup_key: str) -> ArtifactSummary:
+        """Print the columns and statistics of a dataset. See `datashelf.schema`."""
+        with span("schema", lookup_key=lookup_key):
+            return _schema(shelf=self, lookup_key=lookup_key)
+
+    def backfill_summaries(self, max_workers: int | None = None) -> int:
+        """Summarize datasets saved without one. See `datashelf.backfill_summaries`."""
+        with span("backfill_summaries"):
+            return _backfill_summaries(shelf=self, max_workers=max_workers)
+
+    def checkout(
+        self, lookup_key: str, dest: str | Path, mode: CheckoutMode | None = None
+    ) -> Path:
+        """Copy a stored artifact to a destination. See `datashelf.checkout`."""
+        with span("checkout", lookup_key=lookup_key):
+            return _checkout(shelf=self, lookup_key=lookup_key, dest=dest, mode=mode)
+
+    def checkout_many(
+        self,
+        lookup_keys: list[str],
+        dest_dir: str | Path,
+        mode: CheckoutMode | None = None,
+        max_workers: int | None = None,
+    ) -> list[Path]:
+        """Check out several artifacts into a directory. See `datashelf.checkout_many`."""
+        with span("checkout_many", items=len(lookup_keys)):
+            return _checkout_many(
+                shelf=self,
+                lookup_keys=lookup_keys,
+                dest_dir=dest_dir,
+                mode=mode,
+                max_workers=max_workers,
+            )
+
+    def push(
+        self,
+        lookup_keys: list[str] | None = None,
+        remote: str | Path | None = None,
+        max_workers: int | None = None,
+    ) -> TransferResult:
+        """Upload datasets to a remote store. See `datashelf.push`."""
+        with span("push"):
+            return _push(
+                shelf=self, lookup_keys=lookup_keys, remote=remote, max_workers=max_workers
+            )
+
+    def pull(
+        self,
+        lookup_keys: list[str] | None = None,
+        remote: str | Path | None = None,
+        max_workers: int | None = None,
+    ) -> TransferResult:
+        """Download datasets from a remote store. See `datashelf.pull`."""
+        with span("pull"):
+            return _pull(
+                shelf=self, lookup_keys=lookup_keys, remote=remote, max_workers=max_workers
+            )
+
+    def fsck(self, full: bool = False, max_workers: int | None = None) -> FsckResult:
+        """Check stored artifacts against their recorded hashes. See `datashelf.fsck`."""
+        with span("fsck"):
+            return _fsck(shelf=self, full=full, max_workers=max_workers)
+
+    def gc(self, dry_run: bool = False, min_age_hours: float = 1.0) -> GcResult:
+        """Delete stored files that no dataset needs. See `datashelf.gc`."""
+        with span("gc"):
+            return _gc(shelf=self, dry_run=dry_run, min_age_hours=min_age_hours)
+
+    def migrate_layout(self, max_workers: int | None = None) -> MigrateResult:
+        """Move artifacts to the configured layout. See `datashelf.migrate_layout`."""
+        with span("migrate_layout"):
+            return _migrate_layout(shelf=self, max_workers=max_workers)
+
+
+# =============================================================
+# MAIN FUNCTIONS
+# =============================================================
+def open_shelf(path: str | Path | None = None) -> Shelf:
+    """Open a datashelf repository, available as `datashelf.open()`.
+
+    Args:
+        path (str | Path | None, optional): Project directory containing a .datashelf
+            folder, or the .datashelf folder itself. Defaults to the DATASHELF_PATH
+            environment variable, else the nearest .datashelf folder found searching
+            upward from the current directory.
+
+    Raises:
+        FileNotFoundError: If no datashelf repository is found.
+
+    Returns:
+        Shelf: Handle on the repository.
+    """
+    if path is None:
+        return Shelf(datashelf_path=find_datashelf_path().resolve())
+
+    return Shelf(datashelf_path=resolve_datashelf_path(path=path))
+
+
+# =============================================================
+# HELPER FUNCTIONS
+# =============================================================
+def _default_shelf() -> Shelf:
+    """
+    The shelf used by the module-level functions. The repository found for a working
+    directory is remembered, and one Shelf is kept per repository, so repeated calls
+    neither walk the directory tree nor re-read the catalog.
+    """
+    key = (os.getcwd(), os.environ.get(DATASHELF_PATH_ENV))
+    datashelf_path = _ROOTS.get(key)
+
+    if datashelf_path is None or not datashelf_path.is_dir():
+        datashelf_path = find_datashelf_path().resolve()
+        _ROOTS[key] = datashelf_path
+
+    shelf = _SHELVES.get(datashelf_path)
+    if shelf is None:
+        shelf = _SHELVES.setdefault(datashelf_path, Shelf(datashelf_path=datashelf_path))
+
+    return shelf
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import pytest
+import yaml
 
 from datashelf import init, save
+from datashelf.core.metadata import load_metadata
 
 
 @pytest.fixture
@@ -19,6 +22,36 @@ def initialized_repo(tmp_path, monkeypatch):
     return tmp_path
 
 
+@pytest.fixture
+def set_config():
+    """
+    Return a helper that updates settings under `config` in a repository's
+    config.yaml.
+    """
+
+    def _set_config(datashelf_path: Path, **settings) -> None:
+        config_path = datashelf_path / "config.yaml"
+        config = yaml.safe_load(config_path.read_text())
+        config["config"].update(settings)
+        config_path.write_text(yaml.safe_dump(config, sort_keys=False))
+
+    return _set_config
+
+
+@pytest.fixture
+def make_frame():
+    """
+    Return a factory for seeded DataFrames with an integer `id` and a random
+    float `v` column.
+    """
+
+    def _frame(rows: int = 1_000, seed: int = 0) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        return pd.DataFrame({"id": np.arange(rows), "v": rng.random(rows)})
+
+    return _frame
+
+
 @pytest.fixture
 def sample_csv(initialized_repo: Path) -> Path:
     csv_path = initialized_repo / "people.csv"
@@ -35,9 +68,8 @@ def saved_artifact(initialized_repo: Path, sample_csv: Path):
         tag="raw",
     )
 
-    metadata_path = initialized_repo / ".datashelf" / "metadata.json"
-    with metadata_path.open("r", encoding="utf-8") as f:
-        metadata = json.load(f)
+    # Commits land in the metadata journal, so read the snapshot and journal together
+    metadata = load_metadata(initialized_repo / ".datashelf")
 
     entry = metadata["files"][0]
     return {
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+import yaml
+
+import datashelf
+from datashelf import acheckout, aload, asave
+from datashelf.core.config import get_async_max_concurrency
+from datashelf.core.metadata import load_metadata
+
+
+def test_concurrent_saves_all_commit(initialized_repo):
+    frames = [pd.DataFrame({"id": range(i, i + 50), "v": [str(i)] * 50}) for i in range(12)]
+
+    async def main():
+        async with datashelf.open_async(max_concurrency=4) as shelf:
+            await asyncio.gather(
+                *(
+                    shelf.save(df, name=f"part_{i}", message="", tag="raw")
+                    for i, df in enumerate(frames)
+                )
+            )
+            return await shelf.load("part_7", to_df=True)
+
+    df = asyncio.run(main())
+    files = load_metadata(initialized_repo / ".datashelf")["files"]
+
+    assert sorted(f["name"] for f in files) == sorted(f"part_{i}" for i in range(12))
+    assert len({f["file_hash"] for f in files}) == 12
+    pd.testing.assert_frame_equal(df, frames[7], check_dtype=False)
+
+
+def test_module_level_coroutines(initialized_repo, sample_csv):
+    async def main():
+        await asave(sample_csv, name="people", message="", tag="raw")
+        path = await acheckout("people", dest=initialized_repo / "out.parquet")
+        return path, await aload("people")
+
+    checked_out, stored = asyncio.run(main())
+
+    assert checked_out.read_bytes() == stored.read_bytes()
+
+
+def test_calls_are_limited_and_do_not_block_the_loop(initialized_repo):
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_ls(**kwargs):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    async def main():
+        shelf = datashelf.open_async(max_concurrency=2)
+        shelf.shelf.ls = slow_ls
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.gather(*(shelf.ls() for _ in range(6)))
+        task.cancel()
+        await shelf.aclose()
+        return ticks
+
+    ticks = asyncio.run(main())
+
+    assert peak == 2
+    assert ticks > 10
+
+
+def test_async_save_never_prompts(initialized_repo, sample_csv, monkeypatch, capsys):
+    datashelf.save(sample_csv, name="people", message="", tag="raw")
+    monkeypatch.setattr("builtins.input", lambda *_: pytest.fail("prompted"))
+
+    asyncio.run(asave(sample_csv, name="people_v2", message="", tag="processed"))
+
+    files = load_metadata(initialized_repo / ".datashelf")["files"]
+    assert [(f["name"], f["tag"]) for f in files] == [("people", "raw")]
+    assert "No changes made" in capsys.readouterr().out
+
+
+def test_invalid_concurrency_setting(initialized_repo):
+    datashelf_path = initialized_repo / ".datashelf"
+    config_path = datashelf_path / "config.yaml"
+    content = yaml.safe_load(config_path.read_text())
+    content["config"]["async_max_concurrency"] = 0
+    config_path.write_text(yaml.safe_dump(content, sort_keys=False))
+
+    with pytest.raises(ValueError, match="'async_max_concurrency' in config.yaml"):
+        get_async_max_concurrency(datashelf_path=datashelf_path)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pytest
+
+import datashelf
+from datashelf import load, save
+from datashelf.core.catalog import JsonCatalog, SqliteCatalog, open_catalog
+
+
+def test_open_catalog_defaults_to_json(initialized_repo):
+    catalog = open_catalog(initialized_repo / ".datashelf")
+
+    assert isinstance(catalog, JsonCatalog)
+
+
+def test_sqlite_catalog_migrates_existing_metadata(saved_artifact, set_config):
+    datashelf_path = saved_artifact["datashelf_path"]
+    entry = saved_artifact["entry"]
+    set_config(datashelf_path, catalog_backend="sqlite")
+
+    catalog = open_catalog(datashelf_path)
+
+    assert isinstance(catalog, SqliteCatalog)
+    assert (datashelf_path / "catalog.sqlite").exists()
+    assert catalog.entries() == [entry]
+    assert load(entry["file_hash"][:8]) == datashelf_path / entry["stored_path"]
+
+
+def test_sqlite_catalog_lookups_match_json_semantics(saved_artifact, set_config):
+    datashelf_path = saved_artifact["datashelf_path"]
+    entry = saved_artifact["entry"]
+    set_config(datashelf_path, catalog_backend="sqlite")
+
+    catalog = open_catalog(datashelf_path)
+
+    assert catalog.match("people_raw") == ([entry], [], [])
+    assert catalog.match(entry["file_hash"][:6]) == ([], [entry], [])
+    assert catalog.match(entry["file_hash"]) == ([], [], [entry])
+    assert catalog.entries(tags=["processed"]) == []
+
+
+def test_save_with_sqlite_catalog_adds_indexed_row(initialized_repo, sample_csv, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, catalog_backend="sqlite")
+
+    save(data=sample_csv, name="people_raw", message="tiny test dataset", tag="raw")
+
+    conn = sqlite3.connect(datashelf_path / "catalog.sqlite")
+    rows = conn.execute("SELECT name, tag FROM files").fetchall()
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT entry FROM files WHERE file_hash >= 'ab' AND file_hash < 'ac'"
+    ).fetchall()
+    conn.close()
+
+    assert rows == [("people_raw", "raw")]
+    assert any("idx_files_file_hash" in str(step) for step in plan)
+
+
+def test_sqlite_update_keeps_rows_that_share_a_hash(saved_artifact, set_config):
+    datashelf_path = saved_artifact["datashelf_path"]
+    entry = saved_artifact["entry"]
+    set_config(datashelf_path, catalog_backend="sqlite")
+    catalog = open_catalog(datashelf_path)
+
+    # A legacy duplicate, as migrated from an old metadata.json
+    duplicate = {**entry, "name": "people_copy", "tag": "processed"}
+    with sqlite3.connect(datashelf_path / "catalog.sqlite") as conn:
+        conn.execute(
+            "INSERT INTO files (file_hash, name, tag, datetime_added, entry) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                entry["file_hash"],
+                "people_copy",
+                "processed",
+                entry["datetime_added"],
+                json.dumps(duplicate),
+            ),
+        )
+    conn.close()
+
+    catalog.update(entry["file_hash"], message="checked")
+
+    assert [(e["name"], e["tag"], e["message"]) for e in catalog.entries()] == [
+        ("people_raw", "raw", "checked"),
+        ("people_copy", "processed", "checked"),
+    ]
+    catalog.close()
+
+
+def test_shelf_closes_catalog_when_backend_changes(saved_artifact, set_config):
+    datashelf_path = saved_artifact["datashelf_path"]
+    set_config(datashelf_path, catalog_backend="sqlite")
+    shelf = datashelf.open(datashelf_path)
+    sqlite_catalog = shelf.catalog
+
+    set_config(datashelf_path, catalog_backend="json")
+
+    assert isinstance(shelf.catalog, JsonCatalog)
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        sqlite_catalog.entries()
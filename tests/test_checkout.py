@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from datashelf import checkout
+import errno
+import os
+
+import pytest
+
+from datashelf import checkout, checkout_many, save
+from datashelf.core import filecopy
+from datashelf.core.filecopy import place_file
 
 
 def test_checkout_copies_artifact_to_destination(saved_artifact):
@@ -11,3 +18,118 @@ def test_checkout_copies_artifact_to_destination(saved_artifact):
     assert result == dest.resolve()
     assert dest.exists()
     assert dest.suffix == ".parquet"
+
+
+@pytest.mark.parametrize("mode", ["copy", "reflink", "hardlink"])
+def test_checkout_modes_produce_identical_file(saved_artifact, mode):
+    src = saved_artifact["datashelf_path"] / saved_artifact["entry"]["stored_path"]
+    dest = saved_artifact["project_root"] / f"people_{mode}.parquet"
+
+    checkout("people_raw", dest, mode=mode)
+
+    assert dest.read_bytes() == src.read_bytes()
+
+
+def test_checkout_hardlink_shares_inode(saved_artifact):
+    src = saved_artifact["datashelf_path"] / saved_artifact["entry"]["stored_path"]
+    dest = saved_artifact["project_root"] / "people_link.parquet"
+
+    checkout("people_raw", dest, mode="hardlink")
+
+    assert os.path.samefile(src, dest)
+
+
+def test_hardlink_falls_back_to_copy_across_devices(tmp_path, monkeypatch):
+    src = tmp_path / "src.parquet"
+    src.write_bytes(b"x" * 1000)
+
+    def cross_device_link(*args, **kwargs):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(filecopy.os, "link", cross_device_link)
+
+    used = place_file(src=src, dest=tmp_path / "dest.parquet", mode="hardlink")
+
+    assert used in ("copy", "reflink")
+    assert (tmp_path / "dest.parquet").read_bytes() == src.read_bytes()
+
+
+def test_copy_falls_back_when_kernel_copy_is_unsupported(tmp_path, monkeypatch):
+    src = tmp_path / "src.parquet"
+    src.write_bytes(os.urandom(100_000))
+
+    def unsupported(*args, **kwargs):
+        raise OSError(errno.ENOSYS, "Function not implemented")
+
+    monkeypatch.setattr(filecopy.os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(filecopy.os, "sendfile", unsupported, raising=False)
+
+    assert place_file(src=src, dest=tmp_path / "dest.parquet") == "copy"
+    assert (tmp_path / "dest.parquet").read_bytes() == src.read_bytes()
+
+
+def test_copy_falls_back_when_kernel_copy_copies_nothing(tmp_path, monkeypatch):
+    src = tmp_path / "src.parquet"
+    src.write_bytes(os.urandom(100_000))
+
+    monkeypatch.setattr(filecopy.os, "copy_file_range", lambda *a, **k: 0, raising=False)
+    monkeypatch.setattr(filecopy.os, "sendfile", lambda *a, **k: 0, raising=False)
+
+    assert place_file(src=src, dest=tmp_path / "dest.parquet") == "copy"
+    assert (tmp_path / "dest.parquet").read_bytes() == src.read_bytes()
+
+
+def test_checkout_many_writes_each_artifact_into_directory(saved_artifact):
+    other = saved_artifact["project_root"] / "other.csv"
+    other.write_text("id\n1\n2\n3\n", encoding="utf-8")
+    save(data=other, name="other_raw", message="", tag="raw")
+
+    dest_dir = saved_artifact["project_root"] / "exports"
+    paths = checkout_many(["people_raw", "other_raw"], dest_dir)
+
+    assert paths == [
+        (dest_dir / "people_raw.parquet").resolve(),
+        (dest_dir / "other_raw.parquet").resolve(),
+    ]
+    assert all(p.exists() for p in paths)
+
+
+def test_checkout_many_keeps_names_with_separators_inside_the_directory(saved_artifact):
+    root = saved_artifact["project_root"]
+    for name in ["other", "sales/2024", "../escape"]:
+        (root / "data.csv").write_text(f"id,name\n1,{name}\n", encoding="utf-8")
+        save(data=root / "data.csv", name=name, message="", tag="raw")
+
+    dest_dir = root / "out"
+    paths = checkout_many(["other", "sales/2024", "../escape"], dest_dir)
+
+    assert paths == [
+        (dest_dir / "other.parquet").resolve(),
+        (dest_dir / "sales_2024.parquet").resolve(),
+        (dest_dir / ".._escape.parquet").resolve(),
+    ]
+    assert sorted(p.name for p in dest_dir.iterdir()) == sorted(p.name for p in paths)
+    assert not (root / "escape.parquet").exists()
+
+    # Both keys would be written to sales_2024.parquet, so nothing is placed
+    (root / "data.csv").write_text("id,name\n1,sales_2024\n", encoding="utf-8")
+    save(data=root / "data.csv", name="sales_2024", message="", tag="raw")
+    with pytest.raises(ValueError, match="same directory"):
+        checkout_many(["other", "sales/2024", "sales_2024"], root / "again")
+
+    assert not (root / "again").exists()
+
+
+def test_checkout_many_writes_nothing_if_a_destination_exists(saved_artifact):
+    other = saved_artifact["project_root"] / "other.csv"
+    other.write_text("id\n1\n", encoding="utf-8")
+    save(data=other, name="other_raw", message="", tag="raw")
+
+    dest_dir = saved_artifact["project_root"] / "exports"
+    dest_dir.mkdir()
+    (dest_dir / "other_raw.parquet").write_bytes(b"")
+
+    with pytest.raises(FileExistsError):
+        checkout_many(["people_raw", "other_raw"], dest_dir)
+
+    assert not (dest_dir / "people_raw.parquet").exists()
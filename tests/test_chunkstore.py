@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+
+from datashelf import checkout, load, save
+from datashelf.core import chunkstore
+from datashelf.core.chunkstore import CHUNKS_DIR, iter_chunks
+from datashelf.core.metadata import load_metadata
+from datashelf.core.storage import LocalStorage
+
+
+def _enable_chunked_storage(datashelf_path: Path, avg_kb: int = 4) -> None:
+    config_path = datashelf_path / "config.yaml"
+    config = yaml.safe_load(config_path.read_text())
+    config["config"]["chunked_storage"] = True
+    config["config"]["chunk_avg_kb"] = avg_kb
+    config_path.write_text(yaml.safe_dump(config, sort_keys=False))
+
+
+def _chunk_files(datashelf_path: Path) -> set[str]:
+    return {p.name for p in (datashelf_path / CHUNKS_DIR).rglob("*") if p.is_file()}
+
+
+def test_chunks_reassemble_to_original_bytes(tmp_path):
+    data = os.urandom(300_000)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+
+    chunks = list(iter_chunks(file_path=path, avg_chunk_kb=8))
+
+    assert b"".join(chunks) == data
+    assert all(len(c) <= 8 * 1024 * 4 for c in chunks)
+
+
+def test_chunk_boundaries_do_not_depend_on_read_block(tmp_path, monkeypatch):
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(500_000))
+
+    expected = list(iter_chunks(file_path=path, avg_chunk_kb=8))
+    monkeypatch.setattr(chunkstore, "READ_BLOCK", 12_345)
+
+    assert list(iter_chunks(file_path=path, avg_chunk_kb=8)) == expected
+
+
+def test_insertion_only_changes_nearby_chunks(tmp_path):
+    data = os.urandom(1_000_000)
+    before, after = tmp_path / "before.bin", tmp_path / "after.bin"
+    before.write_bytes(data)
+    after.write_bytes(data[:400_000] + b"one new row" + data[400_000:])
+
+    old = list(iter_chunks(file_path=before, avg_chunk_kb=16))
+    new = list(iter_chunks(file_path=after, avg_chunk_kb=16))
+
+    assert len(set(old) & set(new)) >= len(old) - 2
+
+
+def test_interrupted_chunk_write_leaves_only_a_hidden_file(tmp_path, monkeypatch):
+    def interrupted(src, dst):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(os, "replace", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        chunkstore._write_chunk(datashelf_path=tmp_path, chunk_hash="ab" * 32, chunk=b"x")
+
+    (leftover,) = [p for p in (tmp_path / CHUNKS_DIR).rglob("*") if p.is_file()]
+    assert leftover.name.startswith(".")
+    assert list(LocalStorage(tmp_path).list(f"{CHUNKS_DIR}/")) == []
+
+
+def test_chunked_save_loads_and_checks_out_transparently(initialized_repo):
+    datashelf_path = initialized_repo / ".datashelf"
+    _enable_chunked_storage(datashelf_path)
+
+    df = pd.DataFrame({"id": range(5_000), "value": [i * 0.5 for i in range(5_000)]})
+    save(data=df, name="events", message="", tag="raw")
+
+    entry = load_metadata(datashelf_path)["files"][0]
+    assert entry["stored_path"].endswith(".manifest.json")
+    assert not (datashelf_path / "artifacts" / f"{entry['file_hash']}.parquet").exists()
+
+    pd.testing.assert_frame_equal(load("events", to_df=True), df, check_dtype=False)
+
+    dest = initialized_repo / "events.parquet"
+    checkout("events", dest)
+    assert dest.read_bytes() == load("events").read_bytes()
+
+
+@pytest.mark.parametrize("engine", ["fastparquet", "pyarrow"])
+def test_successive_versions_share_chunks(initialized_repo, engine):
+    datashelf_path = initialized_repo / ".datashelf"
+    _enable_chunked_storage(datashelf_path)
+    _set_engine(datashelf_path, engine)
+
+    df = pd.DataFrame({"id": range(200_000), "value": [i % 97 for i in range(200_000)]})
+    save(data=df, name="events_v1", message="", tag="raw")
+    first = _chunk_files(datashelf_path)
+
+    appended = pd.concat([df, pd.DataFrame({"id": [200_000], "value": [1]})])
+    save(data=appended, name="events_v2", message="", tag="raw")
+    added = _chunk_files(datashelf_path) - first
+
+    assert len(added) < len(first) / 2
+
+
+def _set_engine(datashelf_path: Path, engine: str) -> None:
+    config_path = datashelf_path / "config.yaml"
+    config = yaml.safe_load(config_path.read_text())
+    config["config"]["parquet_engine"] = engine
+    config_path.write_text(yaml.safe_dump(config, sort_keys=False))
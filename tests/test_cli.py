@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import datashelf
+from datashelf.core.summary import SUMMARIES_DIR
+
+PACKAGE_ROOT = Path(datashelf.__file__).resolve().parent.parent
+
+# Total self import time allowed for `datashelf list`, in microseconds. Importing
+# pandas alone costs well over this, so the budget catches regressions that pull
+# heavy dependencies back into the metadata-only commands.
+IMPORT_BUDGET_US = 250_000
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "fastparquet", "openpyxl"]
+
+
+def _run_cli_with_importtime(cwd: Path, *args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(PACKAGE_ROOT)}
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "datashelf.cli", *args],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def _parse_importtime(stderr: str) -> dict[str, int]:
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_us, _, module = line[len("import time:") :].split("|")
+        modules[module.strip()] = int(self_us)
+
+    return modules
+
+
+@pytest.mark.parametrize("command", [["list"], ["show", "people_raw"], ["load", "people_raw"]])
+def test_metadata_commands_do_not_import_heavy_dependencies(saved_artifact, command):
+    result = _run_cli_with_importtime(saved_artifact["project_root"], *command)
+    modules = _parse_importtime(result.stderr)
+
+    assert result.returncode == 0, result.stderr
+    for heavy in HEAVY_MODULES:
+        assert heavy not in modules
+
+
+def test_show_without_summary_does_not_import_heavy_dependencies(saved_artifact):
+    # Datasets saved before summaries were recorded, or pulled, have no summary
+    shutil.rmtree(saved_artifact["datashelf_path"] / SUMMARIES_DIR)
+
+    result = _run_cli_with_importtime(saved_artifact["project_root"], "show", "people_raw")
+    modules = _parse_importtime(result.stderr)
+
+    assert result.returncode == 0, result.stderr
+    assert "n/a" in result.stdout
+    for heavy in HEAVY_MODULES:
+        assert heavy not in modules
+    assert not (saved_artifact["datashelf_path"] / SUMMARIES_DIR).exists()
+
+
+def test_list_stays_within_import_budget(saved_artifact):
+    result = _run_cli_with_importtime(saved_artifact["project_root"], "list")
+    modules = _parse_importtime(result.stderr)
+
+    assert result.returncode == 0, result.stderr
+    assert sum(modules.values()) < IMPORT_BUDGET_US
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import importlib
+import os
+
+from datashelf import save
+from datashelf.core import hashing
+from datashelf.core.fingerprint import (
+    lookup_fingerprint,
+    record_fingerprint,
+    source_fingerprint,
+)
+
+CONVERSION = {"engine": "fastparquet", "stream": False}
+
+# `datashelf.save` resolves to the function, so patch through the module object
+save_module = importlib.import_module("datashelf.save")
+
+
+def test_unchanged_source_skips_conversion(saved_artifact, monkeypatch, capsys):
+    def fail(**_):
+        raise AssertionError("make_temp_parquet should not run for an unchanged source")
+
+    monkeypatch.setattr(save_module, "make_temp_parquet", fail)
+
+    save(
+        data=saved_artifact["csv_path"],
+        name="people_raw",
+        message="tiny test dataset",
+        tag="raw",
+    )
+
+    assert "already exists" in capsys.readouterr().out
+
+
+def test_modified_source_is_converted_again(saved_artifact, monkeypatch):
+    csv_path = saved_artifact["csv_path"]
+    csv_path.write_text("id,name\n1,Alice\n2,Bob\n3,Carol\n", encoding="utf-8")
+
+    calls = []
+    real = hashing.make_temp_parquet
+    monkeypatch.setattr(
+        save_module,
+        "make_temp_parquet",
+        lambda **kwargs: calls.append(kwargs) or real(**kwargs),
+    )
+
+    save(data=csv_path, name="people_v2", message="one more row", tag="raw")
+
+    assert len(calls) == 1
+
+
+def test_lookup_misses_when_any_field_differs(initialized_repo, sample_csv):
+    datashelf_path = initialized_repo / ".datashelf"
+    fingerprint = source_fingerprint(data_path=sample_csv)
+    record_fingerprint(
+        datashelf_path=datashelf_path,
+        fingerprint=fingerprint,
+        conversion=CONVERSION,
+        artifact_hash="abc123",
+    )
+
+    assert lookup_fingerprint(datashelf_path, fingerprint, CONVERSION) == "abc123"
+    assert lookup_fingerprint(datashelf_path, fingerprint, {**CONVERSION, "engine": "pyarrow"}) is None
+
+    stat = sample_csv.stat()
+    os.utime(sample_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert lookup_fingerprint(datashelf_path, source_fingerprint(sample_csv), CONVERSION) is None
+
+
+def test_fast_hash_detects_same_size_same_mtime_edit(initialized_repo, sample_csv):
+    datashelf_path = initialized_repo / ".datashelf"
+    fingerprint = source_fingerprint(data_path=sample_csv, fast_hash=True)
+    record_fingerprint(
+        datashelf_path=datashelf_path,
+        fingerprint=fingerprint,
+        conversion=CONVERSION,
+        artifact_hash="abc123",
+    )
+
+    stat = sample_csv.stat()
+    sample_csv.write_text("id,name\n1,Alice\n2,Rob\n", encoding="utf-8")
+    os.utime(sample_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    current = source_fingerprint(data_path=sample_csv, fast_hash=True)
+
+    assert lookup_fingerprint(datashelf_path, current, CONVERSION) is None
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import threading
+
+import pandas as pd
+import pytest
+
+from datashelf import save
+from datashelf.core import hashing
+from datashelf.core.config import get_hash_algorithm
+from datashelf.core.hashing import (
+    HashingSink,
+    hash_file,
+    make_temp_parquet,
+    new_hasher,
+    sha256_hex,
+)
+from datashelf.core.metadata import load_metadata
+
+
+@pytest.mark.parametrize("engine", ["fastparquet", "pyarrow"])
+def test_make_temp_parquet_hash_matches_file_on_disk(tmp_path, engine):
+    df = pd.DataFrame({"id": [1, 2, 3], "name": ["a", None, "c"]})
+
+    output_path, data_hash = make_temp_parquet(
+        data=df, output_path=tmp_path / "data.parquet", engine=engine
+    )
+
+    assert data_hash == sha256_hex(data_path=output_path)
+
+
+def test_sha256_hex_matches_hashlib_for_any_buffer_size(tmp_path):
+    path = tmp_path / "blob.bin"
+    payload = bytes(range(256)) * 1000
+    path.write_bytes(payload)
+
+    expected = hashlib.sha256(payload).hexdigest()
+
+    assert sha256_hex(data_path=path, chunk_size=7) == expected
+    assert sha256_hex(data_path=path) == expected
+
+
+def test_hashing_sink_refuses_to_seek():
+    sink = HashingSink(io.BytesIO())
+    sink.write(b"PAR1")
+
+    with pytest.raises(io.UnsupportedOperation):
+        sink.seek(0)
+
+    assert sink.tell() == 4
+    assert sink.hexdigest() == hashlib.sha256(b"PAR1").hexdigest()
+
+
+@pytest.mark.parametrize("size", [0, 100, 1024, 1025, 5000])
+def test_tree_hash_is_the_same_from_file_and_sink(tmp_path, monkeypatch, size):
+    # Small segments so the test covers several leaves and exact segment boundaries
+    monkeypatch.setattr(hashing, "TREE_SEGMENT_SIZE", 1024)
+    payload = bytes(i % 251 for i in range(size))
+    path = tmp_path / "blob.bin"
+    path.write_bytes(payload)
+
+    sink = HashingSink(io.BytesIO(), algorithm="blake2b-tree")
+    for start in range(0, size, 300):
+        sink.write(payload[start : start + 300])
+
+    assert sink.hexdigest() == hash_file(data_path=path, algorithm="blake2b-tree")
+
+
+def test_failed_write_stops_tree_hashing_threads(monkeypatch):
+    monkeypatch.setattr(hashing, "TREE_SEGMENT_SIZE", 1024)
+    threads = set(threading.enumerate())
+
+    with pytest.raises(RuntimeError, match="write failed"):
+        with HashingSink(io.BytesIO(), algorithm="blake2b-tree") as sink:
+            sink.write(b"x" * 20_000)
+            raise RuntimeError("write failed")
+
+    assert set(threading.enumerate()) <= threads
+
+
+def test_tree_hash_of_file_without_pread(tmp_path, monkeypatch):
+    monkeypatch.setattr(hashing, "TREE_SEGMENT_SIZE", 1024)
+    path = tmp_path / "blob.bin"
+    path.write_bytes(bytes(i % 251 for i in range(5000)))
+    expected = hash_file(data_path=path, algorithm="blake2b-tree")
+
+    # As on Windows
+    monkeypatch.delattr(hashing.os, "pread")
+
+    assert hash_file(data_path=path, algorithm="blake2b-tree") == expected
+
+
+def test_tree_hash_depends_on_content_and_differs_from_plain_blake2b(tmp_path):
+    path = tmp_path / "blob.bin"
+    path.write_bytes(b"datashelf")
+
+    tree_hash = hash_file(data_path=path, algorithm="blake2b-tree")
+
+    assert tree_hash != hash_file(data_path=path, algorithm="blake2b")
+    assert hash_file(data_path=path, algorithm="blake2b") == (
+        hashlib.blake2b(b"datashelf", digest_size=32).hexdigest()
+    )
+
+    path.write_bytes(b"datashelF")
+    assert hash_file(data_path=path, algorithm="blake2b-tree") != tree_hash
+
+
+def test_unknown_hash_algorithm_is_rejected(initialized_repo, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+
+    with pytest.raises(ValueError, match="Unsupported hash algorithm"):
+        new_hasher(algorithm="md5")
+
+    set_config(datashelf_path, hash_algorithm="md5")
+
+    with pytest.raises(ValueError, match="'hash_algorithm' in config.yaml"):
+        get_hash_algorithm(datashelf_path=datashelf_path)
+
+
+def test_entries_record_algorithm_and_dedupe_across_a_switch(
+    sample_csv, initialized_repo, set_config
+):
+    datashelf_path = initialized_repo / ".datashelf"
+    df = pd.DataFrame({"id": [1, 2, 3]})
+
+    save(data=df, name="first", message="", tag="raw")
+    set_config(datashelf_path, hash_algorithm="blake2b")
+    save(data=df, name="again", message="", tag="raw")
+    save(data=sample_csv, name="people", message="", tag="raw")
+
+    files = load_metadata(datashelf_path)["files"]
+
+    assert [f["name"] for f in files] == ["first", "people"]
+    assert files[0]["hash_algorithm"] == "sha256"
+    assert files[1]["hash_algorithm"] == "blake2b"
+    assert files[1]["file_hash"] == hash_file(
+        data_path=datashelf_path / files[1]["stored_path"], algorithm="blake2b"
+    )
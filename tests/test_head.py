@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+import datashelf
+from datashelf import head, save
+from datashelf.core import chunkstore
+from datashelf.core.chunkstore import read_manifest
+from datashelf.core.metadata import load_metadata
+
+
+@pytest.mark.parametrize("engine", ["fastparquet", "pyarrow"])
+def test_head_returns_first_rows_across_row_groups(
+    initialized_repo, engine, make_frame, set_config
+):
+    set_config(initialized_repo / ".datashelf", parquet_engine=engine)
+    df = make_frame()
+    df["s"] = [f"r{i}" for i in range(len(df))]
+    save(df, name="d", message="", tag="raw", write_options={"row_group_rows": 100})
+
+    pd.testing.assert_frame_equal(head("d", n=5), df.head(5), check_dtype=False)
+    pd.testing.assert_frame_equal(head("d", n=250), df.head(250), check_dtype=False)
+    pd.testing.assert_frame_equal(
+        head("d", n=3, columns=["s", "id"]), df[["s", "id"]].head(3), check_dtype=False
+    )
+    assert len(head("d", n=5_000)) == 1_000
+
+
+def test_head_of_zero_rows_keeps_columns(initialized_repo, make_frame):
+    save(make_frame(), name="d", message="", tag="raw")
+
+    empty = head("d", n=0)
+
+    assert empty.empty and list(empty.columns) == ["id", "v"]
+    with pytest.raises(ValueError, match="n must be zero or more"):
+        head("d", n=-1)
+
+
+def test_head_of_chunked_artifact_opens_only_the_chunks_it_needs(
+    initialized_repo, monkeypatch, make_frame, set_config
+):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, chunked_storage=True, chunk_avg_kb=4)
+    df = make_frame(rows=50_000)
+    save(df, name="chunked", message="", tag="raw", write_options={"row_group_rows": 5_000})
+    (entry,) = load_metadata(datashelf_path)["files"]
+    manifest = read_manifest(datashelf_path=datashelf_path, file_entry=entry)
+
+    opened = []
+    chunk_path = chunkstore._chunk_path
+
+    def tracking_chunk_path(datashelf_path, chunk_hash):
+        opened.append(chunk_hash)
+        return chunk_path(datashelf_path=datashelf_path, chunk_hash=chunk_hash)
+
+    monkeypatch.setattr(chunkstore, "_chunk_path", tracking_chunk_path)
+
+    pd.testing.assert_frame_equal(head("chunked", n=10), df.head(10), check_dtype=False)
+    assert 0 < len(set(opened)) < len(manifest["chunks"]) // 4
+
+
+def test_cli_head(initialized_repo, sample_csv):
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(datashelf.__file__))}
+    save(sample_csv, name="people", message="", tag="raw")
+
+    result = subprocess.run(
+        [sys.executable, "-m", "datashelf.cli", "head", "people", "-n", "1", "--columns", "name"],
+        cwd=initialized_repo,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0
+    assert "Alice" in result.stdout and "Bob" not in result.stdout
+    assert "id" not in result.stdout
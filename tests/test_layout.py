@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import datashelf
+from datashelf import checkout, gc, load, migrate_layout, save
+from datashelf.core.config import get_artifact_layout
+from datashelf.core.metadata import load_metadata
+from datashelf.core.storage import artifact_key
+
+
+def _stored_paths(datashelf_path: Path) -> dict[str, str]:
+    entries = datashelf.open(datashelf_path).catalog.entries()
+    return {f["name"]: f["stored_path"] for f in entries}
+
+
+def test_sharded_layout_fans_out_artifacts(initialized_repo, make_frame, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, artifact_layout="sharded")
+    df = make_frame()
+    save(df, name="sharded", message="", tag="raw")
+
+    (entry,) = load_metadata(datashelf_path)["files"]
+    file_hash = entry["file_hash"]
+    assert entry["stored_path"] == (
+        f"artifacts/{file_hash[:2]}/{file_hash[2:4]}/{file_hash}.parquet"
+    )
+
+    pd.testing.assert_frame_equal(load("sharded", to_df=True), df, check_dtype=False)
+    checkout("sharded", initialized_repo / "out.parquet")
+    assert (initialized_repo / "out.parquet").exists()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_migrate_layout_moves_artifacts_both_ways(
+    initialized_repo, backend, make_frame, set_config
+):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, catalog_backend=backend)
+    frames = {f"d{i}": make_frame(seed=i) for i in range(5)}
+    for name, df in frames.items():
+        save(df, name=name, message="", tag="raw")
+    flat = _stored_paths(datashelf_path)
+
+    set_config(datashelf_path, catalog_backend=backend, artifact_layout="sharded")
+    result = migrate_layout(max_workers=2)
+    sharded = _stored_paths(datashelf_path)
+
+    assert result["moved"] == 5 and result["missing"] == []
+    for name, stored_path in sharded.items():
+        assert stored_path == artifact_key(filename=Path(flat[name]).name, layout="sharded")
+        assert (datashelf_path / stored_path).is_file()
+        assert not (datashelf_path / flat[name]).exists()
+
+    for name, df in frames.items():
+        pd.testing.assert_frame_equal(load(name, to_df=True), df, check_dtype=False)
+
+    set_config(datashelf_path, catalog_backend=backend, artifact_layout="flat")
+    assert migrate_layout()["moved"] == 5
+    # Shard directories emptied by the move are removed
+    assert all(p.is_file() for p in (datashelf_path / "artifacts").iterdir())
+    assert migrate_layout()["moved"] == 0
+
+
+def test_interrupted_migration_is_resolved_and_completed(initialized_repo, make_frame, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    df = make_frame()
+    save(df, name="moved", message="", tag="raw")
+    stored_path = _stored_paths(datashelf_path)["moved"]
+
+    # The artifact was moved, but the catalog was not updated yet
+    target = artifact_key(filename=Path(stored_path).name, layout="sharded")
+    (datashelf_path / target).parent.mkdir(parents=True)
+    os.replace(datashelf_path / stored_path, datashelf_path / target)
+    past = os.stat(datashelf_path / target).st_mtime - 7200
+    os.utime(datashelf_path / target, (past, past))
+
+    pd.testing.assert_frame_equal(load("moved", to_df=True), df, check_dtype=False)
+    assert gc(min_age_hours=0)["removed"] == []
+
+    set_config(datashelf_path, artifact_layout="sharded")
+    migrate_layout()
+
+    assert _stored_paths(datashelf_path)["moved"] == target
+
+
+def test_migrate_layout_moves_manifests_of_chunked_artifacts(
+    initialized_repo, make_frame, set_config
+):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, chunked_storage=True, chunk_avg_kb=4)
+    df = make_frame(rows=20_000)
+    save(df, name="chunked", message="", tag="raw")
+
+    set_config(datashelf_path, chunked_storage=True, artifact_layout="sharded")
+    migrate_layout()
+
+    stored_path = _stored_paths(datashelf_path)["chunked"]
+    assert stored_path.count("/") == 3 and stored_path.endswith(".manifest.json")
+    pd.testing.assert_frame_equal(load("chunked", to_df=True), df, check_dtype=False)
+
+
+def test_invalid_artifact_layout(initialized_repo, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, artifact_layout="nested")
+
+    with pytest.raises(ValueError, match="'artifact_layout' in config.yaml"):
+        get_artifact_layout(datashelf_path=datashelf_path)
+
+
+def test_cli_migrate_layout(initialized_repo, sample_csv, set_config):
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(datashelf.__file__))}
+    save(sample_csv, name="people", message="", tag="raw")
+    set_config(initialized_repo / ".datashelf", artifact_layout="sharded")
+
+    result = subprocess.run(
+        [sys.executable, "-m", "datashelf.cli", "migrate-layout"],
+        cwd=initialized_repo,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0
+    assert "Moved 1 artifacts to the 'sharded' layout." in result.stdout
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from datashelf import load
+
+pa = pytest.importorskip("pyarrow")
+
+
+def test_load_as_arrow_returns_table(saved_artifact):
+    table = load("people_raw", as_arrow=True)
+
+    assert isinstance(table, pa.Table)
+    assert table.column_names == ["id", "name"]
+    assert table.num_rows == 2
+
+
+def test_load_memory_mapped_table_matches_regular_load(saved_artifact):
+    table = load("people_raw", as_arrow=True, memory_map=True)
+    df = load("people_raw", to_df=True, memory_map=True)
+
+    assert table.equals(load("people_raw", as_arrow=True))
+    assert isinstance(df, pd.DataFrame)
+    assert df["id"].tolist() == [1, 2]
+    assert df["name"].tolist() == ["Alice", "Bob"]
+
+
+def test_load_rejects_both_output_formats(saved_artifact):
+    with pytest.raises(ValueError):
+        load("people_raw", to_df=True, as_arrow=True)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from datashelf import cache_info, clear_cache, load, save
+from datashelf.core.config import get_df_cache_settings
+
+
+@pytest.fixture
+def cached_repo(initialized_repo, set_config):
+    clear_cache()
+    set_config(initialized_repo / ".datashelf", df_cache_mb=1)
+    yield initialized_repo
+    clear_cache()
+
+
+def test_repeated_loads_hit_the_cache(cached_repo, monkeypatch, make_frame):
+    save(make_frame(100), name="lookup", message="", tag="raw")
+
+    first = load("lookup", to_df=True)
+    monkeypatch.setattr(pd, "read_parquet", lambda *a, **k: pytest.fail("decoded again"))
+    second = load("lookup", to_df=True)
+
+    pd.testing.assert_frame_equal(first, second)
+    info = cache_info()
+    assert (info["hits"], info["misses"], info["entries"]) == (1, 1, 1)
+    assert 0 < info["bytes"] <= info["max_bytes"] == 1024 * 1024
+
+
+def test_columns_and_filters_are_part_of_the_key(cached_repo, make_frame):
+    save(make_frame(100), name="lookup", message="", tag="raw")
+
+    load("lookup", to_df=True)
+    only_id = load("lookup", to_df=True, columns=["id"])
+    filtered = load("lookup", to_df=True, filters=[("id", "<", 10)])
+    load("lookup", to_df=True, columns=["id"])
+
+    assert list(only_id.columns) == ["id"]
+    assert len(filtered) == 10
+    assert (cache_info()["hits"], cache_info()["misses"]) == (1, 3)
+
+
+def test_copy_mode_isolates_callers(cached_repo, make_frame):
+    save(make_frame(100), name="lookup", message="", tag="raw")
+
+    df = load("lookup", to_df=True)
+    df.loc[0, "v"] = -1.0
+    df["extra"] = 1
+
+    again = load("lookup", to_df=True)
+    assert again.loc[0, "v"] != -1.0
+    assert "extra" not in again.columns
+
+
+def test_readonly_mode_shares_data_but_rejects_writes(cached_repo, make_frame, set_config):
+    set_config(cached_repo / ".datashelf", df_cache_mb=1, df_cache_mode="readonly")
+    save(make_frame(100), name="lookup", message="", tag="raw")
+
+    first = load("lookup", to_df=True)
+    second = load("lookup", to_df=True)
+
+    assert np.shares_memory(first["v"].to_numpy(), second["v"].to_numpy())
+    with pytest.raises(ValueError, match="read-only"):
+        second.loc[0, "v"] = -1.0
+
+    second["extra"] = 1
+    assert "extra" not in load("lookup", to_df=True).columns
+
+
+def test_least_recently_used_frames_are_evicted(cached_repo, make_frame):
+    # Each frame holds ~160 KB, so six of them fit in the 1 MB budget
+    for i in range(8):
+        save(make_frame(10_000, seed=i), name=f"t{i}", message="", tag="raw")
+        load(f"t{i}", to_df=True)
+        load("t0", to_df=True)
+
+    info = cache_info()
+    assert info["evictions"] == 2
+    assert info["bytes"] <= info["max_bytes"]
+
+    hits = info["hits"]
+    load("t0", to_df=True)
+    load("t1", to_df=True)
+    assert cache_info()["hits"] == hits + 1
+
+
+def test_frames_larger_than_the_budget_are_not_cached(cached_repo, make_frame):
+    save(make_frame(100_000), name="big", message="", tag="raw")
+
+    load("big", to_df=True)
+
+    assert cache_info()["entries"] == 0 and cache_info()["evictions"] == 0
+
+
+def test_cache_is_off_by_default(initialized_repo, make_frame):
+    clear_cache()
+    save(make_frame(100), name="lookup", message="", tag="raw")
+
+    load("lookup", to_df=True)
+    load("lookup", to_df=True)
+
+    assert cache_info()["hits"] == 0 and cache_info()["entries"] == 0
+
+
+def test_invalid_cache_mode(initialized_repo, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, df_cache_mode="views")
+
+    with pytest.raises(ValueError, match="'df_cache_mode' in config.yaml"):
+        get_df_cache_settings(datashelf_path=datashelf_path)
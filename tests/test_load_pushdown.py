@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+import yaml
+
+from datashelf import load, save
+from datashelf.cli import _parse_where
+
+
+@pytest.fixture(params=["fastparquet", "pyarrow"])
+def events_artifact(initialized_repo, request):
+    config_path = initialized_repo / ".datashelf" / "config.yaml"
+    content = yaml.safe_load(config_path.read_text())
+    content["config"]["parquet_engine"] = request.param
+    config_path.write_text(yaml.safe_dump(content))
+
+    df = pd.DataFrame(
+        {
+            "id": range(10),
+            "date": [f"2024-01-{i + 1:02d}" for i in range(10)],
+            "value": [i * 1.5 for i in range(10)],
+            "label": [f"row{i}" for i in range(10)],
+        }
+    )
+    save(data=df, name="events", message="", tag="raw")
+    return df
+
+
+def test_load_reads_only_requested_columns(events_artifact):
+    df = load("events", to_df=True, columns=["id", "value"])
+
+    assert list(df.columns) == ["id", "value"]
+    assert len(df) == 10
+
+
+def test_load_filters_rows(events_artifact):
+    df = load(
+        "events",
+        to_df=True,
+        columns=["id", "date"],
+        filters=[("date", ">=", "2024-01-04"), ("date", "<", "2024-01-07")],
+    )
+
+    assert df["id"].tolist() == [3, 4, 5]
+
+
+def test_load_arrow_pushdown(events_artifact):
+    pytest.importorskip("pyarrow")
+
+    table = load("events", as_arrow=True, columns=["id"], filters=[("id", "in", [1, 8])])
+
+    assert table.column_names == ["id"]
+    assert table.column("id").to_pylist() == [1, 8]
+
+
+def test_columns_without_data_output_is_rejected(events_artifact):
+    with pytest.raises(ValueError):
+        load("events", columns=["id"])
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("date>=2024-01-01", ("date", ">=", "2024-01-01")),
+        ("id = 3", ("id", "==", 3)),
+        ("value<2.5", ("value", "<", 2.5)),
+        ("label != 'row 1'", ("label", "!=", "row 1")),
+        ("id in 1,2,3", ("id", "in", [1, 2, 3])),
+        ("label not in a,b", ("label", "not in", ["a", "b"])),
+    ],
+)
+def test_parse_where(expression, expected):
+    assert _parse_where(expression) == expected
+
+
+def test_parse_where_rejects_missing_operator():
+    with pytest.raises(ValueError):
+        _parse_where("date 2024-01-01")
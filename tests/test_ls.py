@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import datashelf
+from datashelf import ls, save
+
+
+def _populate(datashelf_path: Path) -> None:
+    added = {
+        "sales_2023": ("2023-12-31T23:00:00", "raw"),
+        "sales_2024": ("2024-01-15T08:30:00", "processed"),
+        "costs_2024": ("2024-01-31T18:00:00", "raw"),
+        "sales_q1": ("2024-02-01T00:00:00", "processed"),
+    }
+    for i, name in enumerate(added):
+        save(pd.DataFrame({"id": [i]}), name=name, message=f"load {i}", tag=added[name][1])
+
+    catalog = datashelf.open(datashelf_path).catalog
+    catalog.update_many(
+        {
+            f["file_hash"]: {"datetime_added": added[f["name"]][0]}
+            for f in catalog.entries()
+        }
+    )
+
+
+def _names(**kwargs) -> list[str]:
+    return ls(to_df=True, **kwargs)["name"].tolist()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_ls_filters_sorts_and_pages(initialized_repo, backend, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, catalog_backend=backend)
+    _populate(datashelf_path)
+
+    assert _names() == ["sales_2023", "sales_2024", "costs_2024", "sales_q1"]
+    assert _names(reverse=True) == ["sales_q1", "costs_2024", "sales_2024", "sales_2023"]
+    assert _names(name="sales_*") == ["sales_2023", "sales_2024", "sales_q1"]
+    assert _names(name_regex=r"20\d4$") == ["sales_2024", "costs_2024"]
+    assert _names(name="sales_*", filter_tag=["processed"]) == ["sales_2024", "sales_q1"]
+    # A date includes that whole day
+    assert _names(since="2024-01-01", until="2024-01-31") == ["sales_2024", "costs_2024"]
+    assert _names(until="2024-01-15T08:30:00") == ["sales_2023", "sales_2024"]
+
+    assert _names(sort="name") == ["costs_2024", "sales_2023", "sales_2024", "sales_q1"]
+    assert _names(sort="name", reverse=True, limit=2) == ["sales_q1", "sales_2024"]
+    assert _names(sort="name", limit=2, offset=1) == ["sales_2023", "sales_2024"]
+    assert _names(limit=1, offset=3) == ["sales_q1"]
+    assert _names(limit=0) == []
+
+
+def test_ls_to_df_parses_dates_for_vectorised_filtering(initialized_repo):
+    _populate(initialized_repo / ".datashelf")
+
+    df = ls(to_df=True)
+
+    assert list(df.columns) == [
+        "file_hash",
+        "name",
+        "tag",
+        "message",
+        "datetime_added",
+        "stored_path",
+        "hash_algorithm",
+    ]
+    assert pd.api.types.is_datetime64_any_dtype(df["datetime_added"])
+    assert df.loc[df["datetime_added"].dt.month == 1, "name"].tolist() == [
+        "sales_2024",
+        "costs_2024",
+    ]
+
+
+def test_ls_output_formats(initialized_repo, capsys):
+    _populate(initialized_repo / ".datashelf")
+    capsys.readouterr()
+
+    ls(output_format="json", sort="name", limit=2)
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["name"] for r in rows] == ["costs_2024", "sales_2023"]
+    assert rows[0]["datetime_added"] == "2024-01-31T18:00:00"
+
+    ls(output_format="csv", name="costs_*")
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("file_hash,name,tag,message,datetime_added")
+    assert len(lines) == 2 and ",costs_2024,raw,load 2," in lines[1]
+
+
+def test_ls_table_widths_come_from_first_rows(initialized_repo, capsys, monkeypatch):
+    from datashelf import inspect
+
+    monkeypatch.setattr(inspect, "WIDTH_SAMPLE", 1)
+    save(pd.DataFrame({"id": [0]}), name="short", message="", tag="raw")
+    save(pd.DataFrame({"id": [1]}), name="a_much_longer_name", message="", tag="raw")
+    capsys.readouterr()
+
+    ls()
+    lines = capsys.readouterr().out.splitlines()
+
+    assert len({len(line.rstrip()) for line in lines[2:]}) == 1
+    assert "a_much_longer_name" not in lines[3] and "..." in lines[3]
+
+
+def test_ls_rejects_invalid_arguments(initialized_repo):
+    with pytest.raises(ValueError, match="invalid sort field"):
+        ls(sort="size")
+    with pytest.raises(ValueError, match="invalid date"):
+        ls(since="last week")
+    with pytest.raises(ValueError, match="invalid regular expression"):
+        ls(name_regex="(")
+    with pytest.raises(ValueError, match="offset must be zero or more"):
+        ls(offset=-1)
+    with pytest.raises(ValueError, match="invalid output format"):
+        ls(output_format="xml")
+
+
+def test_cli_list_options(initialized_repo):
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(datashelf.__file__))}
+    _populate(initialized_repo / ".datashelf")
+
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "datashelf.cli", "list",
+            "--name", "sales_*", "--since", "2024-01-01",
+            "--sort", "datetime_added", "--reverse", "--format", "csv",
+        ],
+        cwd=initialized_repo,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    names = [line.split(",")[1] for line in result.stdout.splitlines()[1:]]
+    assert names == ["sales_q1", "sales_2024"]
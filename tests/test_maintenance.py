@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import datashelf
+from datashelf import fsck, gc, load, save
+from datashelf.core.metadata import load_metadata
+
+
+def _age(path: Path, hours: float = 2) -> None:
+    past = time.time() - hours * 3600
+    os.utime(path, (past, past))
+
+
+def _flip_byte(path: Path) -> None:
+    data = bytearray(path.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    stat = path.stat()
+    path.write_bytes(bytes(data))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def test_fsck_only_rehashes_changed_files(initialized_repo, make_frame, set_config):
+    save(make_frame(rows=5_000, seed=1), name="a", message="", tag="raw")
+    set_config(initialized_repo / ".datashelf", hash_algorithm="blake2b")
+    save(make_frame(rows=5_000, seed=2), name="b", message="", tag="raw")
+
+    first = fsck()
+    second = fsck()
+    full = fsck(full=True)
+
+    assert first["problems"] == [] and first["hashed"] == 2 and first["cached"] == 0
+    assert second["hashed"] == 0 and second["cached"] == 2
+    assert full["hashed"] == 2
+
+
+def test_fsck_reports_corrupt_and_missing_artifacts(initialized_repo, make_frame):
+    datashelf_path = initialized_repo / ".datashelf"
+    save(make_frame(rows=5_000, seed=1), name="a", message="", tag="raw")
+    save(make_frame(rows=5_000, seed=2), name="b", message="", tag="raw")
+    save(make_frame(rows=5_000, seed=3), name="c", message="", tag="raw")
+    fsck()
+
+    files = {f["name"]: f for f in load_metadata(datashelf_path)["files"]}
+    # Same size and modification time: only a full run reads the file again
+    _flip_byte(datashelf_path / files["a"]["stored_path"])
+    (datashelf_path / files["b"]["stored_path"]).unlink()
+
+    result = fsck(full=True)
+
+    assert {(p["name"], p["status"]) for p in result["problems"]} == {
+        ("a", "corrupt"),
+        ("b", "missing"),
+    }
+
+
+def test_fsck_checks_chunks_of_chunked_artifacts(initialized_repo, make_frame, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, chunked_storage=True, chunk_avg_kb=4)
+    save(make_frame(rows=20_000), name="chunked", message="", tag="raw")
+
+    assert fsck()["problems"] == []
+
+    chunk = next(p for p in (datashelf_path / "chunks").rglob("*") if p.is_file())
+    _flip_byte(chunk)
+    _age(chunk)
+
+    (problem,) = fsck()["problems"]
+    assert problem["status"] == "corrupt" and chunk.name in problem["detail"]
+
+
+def test_gc_sweeps_orphans_and_stale_temp_directories(initialized_repo, make_frame):
+    datashelf_path = initialized_repo / ".datashelf"
+    save(make_frame(rows=5_000), name="kept", message="", tag="raw")
+    kept = datashelf_path / load_metadata(datashelf_path)["files"][0]["stored_path"]
+    _age(kept)
+
+    orphan = datashelf_path / "artifacts" / f"{'0' * 64}.parquet"
+    orphan.write_bytes(b"x" * 1000)
+    materialized = datashelf_path / "materialized" / f"{'1' * 64}.parquet"
+    materialized.parent.mkdir()
+    materialized.write_bytes(b"x" * 500)
+    temp_dir = datashelf_path / "tmpabc123"
+    temp_dir.mkdir()
+    (temp_dir / "data.parquet").write_bytes(b"x" * 250)
+    recent_orphan = datashelf_path / "artifacts" / f"{'2' * 64}.parquet"
+    recent_orphan.write_bytes(b"x" * 10)
+
+    for path in (orphan, materialized, temp_dir / "data.parquet", temp_dir):
+        _age(path)
+
+    preview = gc(dry_run=True)
+    assert preview["bytes"] == 1750 and orphan.exists() and temp_dir.exists()
+
+    result = gc()
+
+    assert sorted(result["removed"]) == sorted(
+        [
+            f"artifacts/{orphan.name}",
+            f"materialized/{materialized.name}",
+            temp_dir.name,
+        ]
+    )
+    assert result["bytes"] == 1750
+    assert not orphan.exists() and not materialized.exists() and not temp_dir.exists()
+    assert kept.exists() and recent_orphan.exists()
+    assert load("kept", to_df=True).shape == (5_000, 2)
+
+
+def test_gc_keeps_temp_directories_still_being_written(initialized_repo):
+    datashelf_path = initialized_repo / ".datashelf"
+    temp_dir = datashelf_path / "tmpslow"
+    (temp_dir / "part").mkdir(parents=True)
+    (temp_dir / "part" / "data.parquet").write_bytes(b"x" * 100)
+    _age(temp_dir / "part")
+    _age(temp_dir)
+
+    # A long save only appends to its file, which leaves the directories' mtimes old
+    assert gc()["removed"] == [] and temp_dir.exists()
+
+    _age(temp_dir / "part" / "data.parquet")
+    _age(temp_dir / "part")
+    _age(temp_dir)
+
+    assert gc()["removed"] == [temp_dir.name]
+
+
+def test_gc_keeps_chunks_of_registered_manifests(initialized_repo, make_frame, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, chunked_storage=True, chunk_avg_kb=4)
+    df = make_frame(rows=20_000)
+    save(df, name="chunked", message="", tag="raw")
+
+    for path in datashelf_path.rglob("*"):
+        _age(path)
+
+    assert gc(min_age_hours=0)["removed"] == []
+    pd.testing.assert_frame_equal(load("chunked", to_df=True), df, check_dtype=False)
+
+
+def test_cli_fsck_exit_code_reflects_problems(initialized_repo, sample_csv):
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(datashelf.__file__))}
+    save(sample_csv, name="people", message="", tag="raw")
+
+    def run():
+        return subprocess.run(
+            [sys.executable, "-m", "datashelf.cli", "fsck"],
+            cwd=initialized_repo,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+    assert run().returncode == 0
+
+    entry = load_metadata(initialized_repo / ".datashelf")["files"][0]
+    (initialized_repo / ".datashelf" / entry["stored_path"]).unlink()
+    result = run()
+
+    assert result.returncode == 1
+    assert "missing" in result.stdout
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from datashelf.core.catalog import JsonCatalog
+from datashelf.core.metadata import (
+    JOURNAL_FILE,
+    compact_metadata,
+    create_file_entry,
+    load_metadata,
+    _read_json,
+)
+
+
+def _entry(i: int) -> dict:
+    return create_file_entry(
+        file_hash=f"{i:064x}",
+        name=f"dataset_{i}",
+        stored_path=f"artifacts/{i:064x}.parquet",
+        message="",
+        tag="raw",
+    )
+
+
+def _add_entries(datashelf_path, start: int, count: int) -> None:
+    for i in range(start, start + count):
+        JsonCatalog(datashelf_path).add(entry=_entry(i))
+
+
+def test_commits_append_to_journal_without_rewriting_snapshot(initialized_repo):
+    datashelf_path = initialized_repo / ".datashelf"
+    snapshot_before = (datashelf_path / "metadata.json").read_text()
+
+    JsonCatalog(datashelf_path).add(entry=_entry(1))
+    JsonCatalog(datashelf_path).update(file_hash=f"{1:064x}", tag="processed")
+
+    journal = (datashelf_path / JOURNAL_FILE).read_text().splitlines()
+
+    assert (datashelf_path / "metadata.json").read_text() == snapshot_before
+    assert [json.loads(line)["op"] for line in journal] == ["add", "update"]
+    assert load_metadata(datashelf_path)["files"][0]["tag"] == "processed"
+
+
+def test_compaction_folds_journal_into_snapshot(initialized_repo):
+    datashelf_path = initialized_repo / ".datashelf"
+    _add_entries(datashelf_path, start=0, count=3)
+
+    compact_metadata(datashelf_path)
+
+    assert (datashelf_path / JOURNAL_FILE).read_text() == ""
+    assert len(_read_json(datashelf_path / "metadata.json")["files"]) == 3
+    assert len(load_metadata(datashelf_path)["files"]) == 3
+
+
+def test_replay_is_idempotent_and_ignores_torn_trailing_line(initialized_repo):
+    datashelf_path = initialized_repo / ".datashelf"
+    _add_entries(datashelf_path, start=0, count=2)
+    journal = (datashelf_path / JOURNAL_FILE).read_bytes()
+
+    # Simulate a crash after the snapshot was written but before the journal was
+    # emptied, followed by an interrupted append
+    compact_metadata(datashelf_path)
+    (datashelf_path / JOURNAL_FILE).write_bytes(journal + b'{"op": "add", "ent')
+
+    assert len(load_metadata(datashelf_path)["files"]) == 2
+
+
+def test_concurrent_writers_do_not_lose_entries(initialized_repo):
+    datashelf_path = initialized_repo / ".datashelf"
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(_add_entries, datashelf_path, start, 25)
+            for start in range(0, 200, 25)
+        ]
+        for future in futures:
+            future.result()
+
+    files = load_metadata(datashelf_path)["files"]
+
+    assert len(files) == 200
+    assert len({f["file_hash"] for f in files}) == 200
+
+
+def test_duplicate_hash_from_another_writer_is_skipped(initialized_repo):
+    datashelf_path = initialized_repo / ".datashelf"
+    stale = JsonCatalog(datashelf_path)
+    assert stale.find_by_hash(f"{7:064x}") == []
+
+    JsonCatalog(datashelf_path).add(entry=_entry(7))
+    stale.add(entry=_entry(7))
+
+    assert len(load_metadata(datashelf_path)["files"]) == 1
+
+
+def test_journal_is_compacted_past_threshold(initialized_repo):
+    import yaml
+
+    datashelf_path = initialized_repo / ".datashelf"
+    config_path = datashelf_path / "config.yaml"
+    content = yaml.safe_load(config_path.read_text())
+    content["config"]["journal_compact_kb"] = 0
+    config_path.write_text(yaml.safe_dump(content))
+
+    JsonCatalog(datashelf_path).add(entry=_entry(1))
+
+    assert (datashelf_path / JOURNAL_FILE).read_text() == ""
+    assert len(_read_json(datashelf_path / "metadata.json")["files"]) == 1
+
+
+def test_commits_apply_events_through_the_hash_index(initialized_repo, monkeypatch):
+    from datashelf.core import catalog as catalog_module
+
+    datashelf_path = initialized_repo / ".datashelf"
+    catalog = JsonCatalog(datashelf_path)
+    catalog.add_many(entries=[_entry(i) for i in range(100)])
+
+    apply = catalog_module.apply_journal_event
+
+    def indexed_apply(metadata, event, index=None):
+        # Without an index every event would scan the whole catalog
+        assert index is not None
+        apply(metadata=metadata, event=event, index=index)
+
+    monkeypatch.setattr(catalog_module, "apply_journal_event", indexed_apply)
+
+    catalog.add_many(entries=[_entry(i) for i in range(95, 200)] + [_entry(150)])
+    catalog.update_many({f"{3:064x}": {"tag": "processed"}})
+    JsonCatalog(datashelf_path).add(entry=_entry(500))
+
+    assert len(catalog.entries()) == 201
+    assert catalog.find_by_hash(f"{3:064x}")[0]["tag"] == "processed"
+    assert catalog.find_by_hash(f"{500:064x}")[0]["name"] == "dataset_500"
+    assert len(load_metadata(datashelf_path)["files"]) == 201
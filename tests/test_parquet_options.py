@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import io
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+import yaml
+
+from datashelf import save
+from datashelf.core.config import get_parquet_write_options
+from datashelf.core.hashing import make_temp_parquet
+from datashelf.core.metadata import load_metadata
+from datashelf.core.parquet_options import DEFAULT_WRITE_OPTIONS, validate_write_options
+
+
+def _df(rows: int = 1_000) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"id": range(rows, 0, -1), "text": [f"row {i % 10}" for i in range(rows)]}
+    )
+
+
+@pytest.mark.parametrize("engine", ["fastparquet", "pyarrow"])
+def test_default_options_write_the_same_bytes_as_before(tmp_path, engine):
+    df = _df()
+    expected = io.BytesIO()
+    df.astype({"text": "string"}).to_parquet(expected, engine=engine, index=False)
+
+    output_path, _ = make_temp_parquet(
+        data=df, output_path=tmp_path / "data.parquet", engine=engine
+    )
+
+    assert output_path.read_bytes() == expected.getvalue()
+
+
+@pytest.mark.parametrize("engine", ["fastparquet", "pyarrow"])
+def test_codec_and_row_groups_are_applied(tmp_path, engine):
+    options = validate_write_options(
+        options={"compression": "zstd", "compression_level": 5, "row_group_rows": 250},
+        engine=engine,
+    )
+
+    output_path, _ = make_temp_parquet(
+        data=_df(),
+        output_path=tmp_path / "data.parquet",
+        engine=engine,
+        write_options=options,
+    )
+    metadata = pq.ParquetFile(output_path).metadata
+
+    assert metadata.num_row_groups == 4
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+
+
+def test_sort_by_sorts_rows_and_records_sorting_columns(tmp_path):
+    options = validate_write_options(options={"sort_by": ["id"]}, engine="pyarrow")
+
+    output_path, _ = make_temp_parquet(
+        data=_df(),
+        output_path=tmp_path / "data.parquet",
+        engine="pyarrow",
+        write_options=options,
+    )
+
+    assert pd.read_parquet(output_path)["id"].is_monotonic_increasing
+    sorting = pq.ParquetFile(output_path).metadata.row_group(0).sorting_columns
+    assert [s.column_index for s in sorting] == [0]
+
+
+def test_page_index_requires_pyarrow():
+    with pytest.raises(ValueError, match="pyarrow"):
+        validate_write_options(options={"write_page_index": True}, engine="fastparquet")
+
+
+def test_invalid_config_value_names_the_setting(initialized_repo, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, parquet_compression="brotli2")
+
+    with pytest.raises(ValueError, match="'compression' in config.yaml"):
+        get_parquet_write_options(datashelf_path=datashelf_path)
+
+
+def test_older_config_without_write_settings_uses_defaults(initialized_repo):
+    datashelf_path = initialized_repo / ".datashelf"
+    content = yaml.safe_load((datashelf_path / "config.yaml").read_text())
+    content["config"] = {
+        key: value
+        for key, value in content["config"].items()
+        if key == "parquet_engine" or not key.startswith("parquet_")
+    }
+    (datashelf_path / "config.yaml").write_text(yaml.safe_dump(content))
+
+    assert get_parquet_write_options(datashelf_path=datashelf_path) == DEFAULT_WRITE_OPTIONS
+
+
+def test_per_call_options_override_config_and_bypass_fingerprint(sample_csv, initialized_repo):
+    datashelf_path = initialized_repo / ".datashelf"
+
+    save(data=sample_csv, name="people", message="", tag="raw")
+    save(
+        data=sample_csv,
+        name="people_zstd",
+        message="",
+        tag="raw",
+        write_options={"compression": "zstd"},
+    )
+
+    files = load_metadata(datashelf_path)["files"]
+    assert [f["name"] for f in files] == ["people", "people_zstd"]
+    assert files[0]["file_hash"] != files[1]["file_hash"]
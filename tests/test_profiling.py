@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import datashelf
+from datashelf import add_span_hook, checkout, load, profile, remove_span_hook, save
+from datashelf.core.profiling import span
+
+
+def test_phases_of_save_load_and_checkout_are_reported(sample_csv, initialized_repo):
+    with profile() as p:
+        save(data=sample_csv, name="people", message="", tag="raw")
+        load("people", to_df=True)
+        checkout("people", dest=initialized_repo / "out.parquet")
+
+    by_name = {s["name"]: s for s in p.spans}
+
+    expected = [
+        "save",
+        "save.convert",
+        "convert.read",
+        "convert.write",
+        "save.store",
+        "metadata.commit",
+        "load",
+        "load.read",
+        "checkout",
+        "checkout.place",
+    ]
+    for phase in expected:
+        assert phase in by_name
+
+    assert by_name["save.convert"]["parent"] == "save"
+    assert by_name["convert.write"]["parent"] == "save.convert"
+    assert by_name["convert.read"]["attrs"]["rows"] == 2
+    assert by_name["load.read"]["attrs"]["rows"] == 2
+    assert by_name["checkout.place"]["attrs"]["bytes"] > 0
+
+    summary = p.summary()
+    assert "save.convert" in summary and "Self s" in summary
+
+
+def test_hooks_only_receive_spans_while_registered():
+    received = []
+    hook = add_span_hook(received.append)
+
+    with span("outer", rows=3) as attrs:
+        with span("inner"):
+            pass
+        attrs["bytes"] = 10
+
+    remove_span_hook(hook)
+
+    with span("after"):
+        pass
+
+    assert [s["name"] for s in received] == ["inner", "outer"]
+    assert received[1]["attrs"] == {"rows": 3, "bytes": 10}
+    assert received[0]["depth"] == 1 and received[1]["depth"] == 0
+
+
+def test_chrome_trace_has_complete_events(tmp_path):
+    with profile() as p:
+        with span("work", rows=1, path=tmp_path):
+            pass
+
+    trace = json.loads(p.write_chrome_trace(tmp_path / "trace.json").read_text())
+    (event,) = trace["traceEvents"]
+
+    assert event["ph"] == "X" and event["name"] == "work"
+    assert event["ts"] == 0 and event["dur"] >= 0
+    assert event["args"] == {"rows": 1, "path": str(tmp_path)}
+
+
+def test_cli_profile_prints_breakdown_to_stderr(sample_csv, initialized_repo):
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(datashelf.__file__))}
+    trace = initialized_repo / "save.json"
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "datashelf.cli",
+            "save",
+            str(sample_csv),
+            "people",
+            "--tag",
+            "raw",
+            "--profile",
+            "--trace",
+            str(trace),
+        ],
+        cwd=initialized_repo,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "save.convert" in result.stderr
+    assert "save.convert" not in result.stdout
+    assert json.loads(trace.read_text())["traceEvents"]
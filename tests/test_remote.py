@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+import datashelf
+from datashelf import init, push, save, load
+from datashelf.core import storage
+from datashelf.core.metadata import load_metadata
+from datashelf.core.storage import LocalStorage, RemoteBackedStorage, RemoteStorage
+
+# Bytes per part with transfer_part_mb: 0.001
+PART_SIZE = int(0.001 * 1024 * 1024)
+
+
+@pytest.fixture
+def other_repo(tmp_path):
+    project = tmp_path / "other"
+    project.mkdir()
+    init(custom_path=str(project))
+    return datashelf.open(project)
+
+
+def test_push_then_pull_only_transfers_missing(initialized_repo, other_repo, tmp_path, make_frame):
+    remote = tmp_path / "remote"
+    save(make_frame(rows=20_000, seed=1), name="a", message="", tag="raw")
+    save(make_frame(rows=20_000, seed=2), name="b", message="", tag="raw")
+
+    first = push(remote=remote)
+    again = push(remote=remote)
+    pulled = other_repo.pull(remote=remote)
+    pulled_again = other_repo.pull(remote=remote)
+
+    assert first["entries"] == 2 and first["objects"] == 2 and first["bytes"] > 0
+    assert again == {"entries": 0, "objects": 0, "bytes": 0}
+    assert pulled["entries"] == 2 and pulled["bytes"] == first["bytes"]
+    assert pulled_again == {"entries": 0, "objects": 0, "bytes": 0}
+
+    pd.testing.assert_frame_equal(
+        other_repo.load("b", to_df=True), load("b", to_df=True)
+    )
+
+
+def test_multipart_transfer_with_several_workers(
+    initialized_repo, other_repo, tmp_path, make_frame, set_config
+):
+    remote = tmp_path / "remote"
+    datashelf_path = initialized_repo / ".datashelf"
+    # ~1 KB parts, so the artifact is sent in many parts
+    set_config(datashelf_path, transfer_part_mb=0.001, transfer_workers=4)
+    set_config(other_repo.path, transfer_part_mb=0.001, transfer_workers=4)
+    save(make_frame(rows=20_000), name="big", message="", tag="raw")
+
+    push(lookup_keys=["big"], remote=remote)
+    other_repo.pull(lookup_keys=["big"], remote=remote)
+
+    stored_path = load_metadata(datashelf_path)["files"][0]["stored_path"]
+    original = (datashelf_path / stored_path).read_bytes()
+
+    assert len(original) > 50 * 1024
+    assert (remote / "objects" / stored_path).read_bytes() == original
+    assert (other_repo.path / stored_path).read_bytes() == original
+    assert not list((remote / "uploads").iterdir())
+
+
+def test_pull_without_pwrite(
+    initialized_repo, other_repo, tmp_path, monkeypatch, make_frame, set_config
+):
+    remote = tmp_path / "remote"
+    set_config(other_repo.path, transfer_part_mb=0.001, transfer_workers=4)
+    save(make_frame(rows=20_000), name="big", message="", tag="raw")
+    push(remote=remote)
+
+    # As on Windows
+    monkeypatch.delattr(storage.os, "pwrite")
+    other_repo.pull(remote=remote)
+
+    stored_path = load_metadata(initialized_repo / ".datashelf")["files"][0]["stored_path"]
+    assert (other_repo.path / stored_path).read_bytes() == (
+        remote / "objects" / stored_path
+    ).read_bytes()
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_pull_rejects_corrupt_remote_objects(
+    initialized_repo, other_repo, tmp_path, make_frame, set_config, chunked
+):
+    remote = tmp_path / "remote"
+    set_config(initialized_repo / ".datashelf", chunked_storage=chunked, chunk_avg_kb=4)
+    save(make_frame(rows=20_000), name="big", message="", tag="raw")
+    push(remote=remote)
+
+    objects = remote / "objects" / ("chunks" if chunked else "artifacts")
+    corrupt = next(p for p in sorted(objects.rglob("*")) if p.is_file())
+    data = bytearray(corrupt.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    corrupt.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="hashes to .* instead of"):
+        other_repo.pull(remote=remote)
+
+    # Intact objects keep their partial downloads for the next pull to resume
+    local = other_repo.path / corrupt.relative_to(remote / "objects")
+    assert other_repo.catalog.entries() == []
+    assert not local.exists()
+    assert not list(local.parent.glob(f".{local.name}.partial*"))
+
+
+def test_interrupted_pull_resumes_from_partial_download(
+    initialized_repo, other_repo, tmp_path, monkeypatch, make_frame, set_config
+):
+    remote = tmp_path / "remote"
+    set_config(other_repo.path, transfer_part_mb=0.001, transfer_workers=1)
+    save(make_frame(rows=20_000), name="big", message="", tag="raw")
+    pushed = push(remote=remote)
+
+    read_range = RemoteStorage.read_range
+    calls = 0
+
+    def failing_read_range(self, key, offset, length):
+        nonlocal calls
+        calls += 1
+        if calls > 10:
+            raise ConnectionError("connection reset")
+        return read_range(self, key, offset, length)
+
+    monkeypatch.setattr(RemoteStorage, "read_range", failing_read_range)
+    with pytest.raises(ConnectionError):
+        other_repo.pull(remote=remote)
+
+    # Nothing is registered or visible until the download completes
+    assert not other_repo.catalog.entries()
+    assert not list(other_repo.storage.list("artifacts/"))
+
+    monkeypatch.setattr(RemoteStorage, "read_range", read_range)
+    resumed = other_repo.pull(remote=remote)
+
+    assert resumed["entries"] == 1
+    assert resumed["bytes"] == pushed["bytes"] - 10 * PART_SIZE
+    pd.testing.assert_frame_equal(
+        other_repo.load("big", to_df=True), load("big", to_df=True)
+    )
+
+
+def test_interrupted_push_resumes_from_uploaded_parts(
+    initialized_repo, tmp_path, monkeypatch, make_frame, set_config
+):
+    remote = tmp_path / "remote"
+    set_config(initialized_repo / ".datashelf", transfer_part_mb=0.001, transfer_workers=1)
+    save(make_frame(rows=20_000), name="big", message="", tag="raw")
+
+    upload_part = RemoteStorage.upload_part
+    calls = 0
+
+    def failing_upload_part(self, upload_id, part_number, data):
+        nonlocal calls
+        calls += 1
+        if calls > 10:
+            raise ConnectionError("connection reset")
+        upload_part(self, upload_id, part_number, data)
+
+    monkeypatch.setattr(RemoteStorage, "upload_part", failing_upload_part)
+    with pytest.raises(ConnectionError):
+        push(remote=remote)
+
+    assert not RemoteStorage(remote).entries()
+    assert not list(RemoteStorage(remote).list())
+
+    monkeypatch.setattr(RemoteStorage, "upload_part", upload_part)
+    resumed = push(remote=remote)
+
+    entry = load_metadata(initialized_repo / ".datashelf")["files"][0]
+    size = (initialized_repo / ".datashelf" / entry["stored_path"]).stat().st_size
+    assert resumed["bytes"] == size - 10 * PART_SIZE
+
+
+def test_chunked_artifacts_share_chunks_on_the_remote(
+    initialized_repo, other_repo, tmp_path, make_frame, set_config
+):
+    remote = tmp_path / "remote"
+    set_config(initialized_repo / ".datashelf", chunked_storage=True, chunk_avg_kb=4)
+    df = make_frame(rows=20_000)
+    save(df, name="v1", message="", tag="raw")
+    push(remote=remote)
+
+    changed = df.copy()
+    changed.loc[19_990:, "v"] = 0.0
+    save(changed, name="v2", message="", tag="raw")
+    second = push(remote=remote)
+
+    assert 0 < second["objects"] < len(list(RemoteStorage(remote).list("chunks/")))
+
+    other_repo.pull(lookup_keys=["v2"], remote=remote)
+    pd.testing.assert_frame_equal(
+        other_repo.load("v2", to_df=True), load("v2", to_df=True)
+    )
+    assert [e["name"] for e in other_repo.catalog.entries()] == ["v2"]
+
+
+def test_remote_backend_writes_through_and_fetches_missing_artifacts(
+    initialized_repo, tmp_path, make_frame, set_config
+):
+    remote = tmp_path / "remote"
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, storage_backend="remote", remote_path=str(remote))
+
+    save(make_frame(rows=20_000), name="big", message="", tag="raw")
+    entry = load_metadata(datashelf_path)["files"][0]
+
+    assert [e["file_hash"] for e in RemoteStorage(remote).entries()] == [entry["file_hash"]]
+
+    (datashelf_path / entry["stored_path"]).unlink()
+    checked_out = datashelf.checkout("big", dest=initialized_repo / "big.parquet")
+
+    assert checked_out.read_bytes() == (remote / "objects" / entry["stored_path"]).read_bytes()
+
+
+def test_shelf_storage_follows_storage_backend(initialized_repo, tmp_path, set_config):
+    shelf = datashelf.open(initialized_repo)
+    assert type(shelf.storage) is LocalStorage
+
+    set_config(shelf.path, storage_backend="remote", remote_path=str(tmp_path / "remote"))
+
+    assert isinstance(shelf.storage, RemoteBackedStorage)
+    assert shelf.storage.root == shelf.path
+    assert shelf.storage.remote.root == (tmp_path / "remote").resolve()
+
+    set_config(shelf.path, storage_backend="local")
+    assert type(shelf.storage) is LocalStorage
+
+
+def test_remote_backend_requires_remote_path(initialized_repo, make_frame, set_config):
+    set_config(initialized_repo / ".datashelf", storage_backend="remote")
+
+    with pytest.raises(ValueError, match="'remote_path'"):
+        save(make_frame(rows=10), name="small", message="", tag="raw")
+
+
+def test_push_without_remote_is_an_error(initialized_repo):
+    with pytest.raises(ValueError, match="No remote store configured"):
+        push()
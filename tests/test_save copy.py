@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+from datashelf.core.metadata import load_metadata
 
 
 def test_save_creates_artifact_and_metadata_entry(initialized_repo, sample_csv):
@@ -14,10 +14,7 @@ def test_save_creates_artifact_and_metadata_entry(initialized_repo, sample_csv):
     )
 
     datashelf_path = initialized_repo / ".datashelf"
-    metadata_path = datashelf_path / "metadata.json"
-
-    with metadata_path.open("r", encoding="utf-8") as f:
-        metadata = json.load(f)
+    metadata = load_metadata(datashelf_path)
 
     assert len(metadata["files"]) == 1
 
@@ -51,8 +48,6 @@ def test_duplicate_save_with_same_tag_does_not_create_second_entry(
         tag="raw",
     )
 
-    metadata_path = initialized_repo / ".datashelf" / "metadata.json"
-    with metadata_path.open("r", encoding="utf-8") as f:
-        metadata = json.load(f)
+    metadata = load_metadata(initialized_repo / ".datashelf")
 
     assert len(metadata["files"]) == 1
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from datashelf import cli, save_many
+from datashelf.core.catalog import JsonCatalog
+from datashelf.core.metadata import load_metadata
+
+
+@pytest.fixture
+def csv_folder(initialized_repo):
+    folder = initialized_repo / "data"
+    folder.mkdir()
+    (folder / "a.csv").write_text("x\n1\n2\n", encoding="utf-8")
+    (folder / "b.csv").write_text("x\n3\n4\n", encoding="utf-8")
+    (folder / "a_copy.csv").write_text("x\n1\n2\n", encoding="utf-8")
+    return folder
+
+
+def test_save_many_commits_new_entries_once(csv_folder, monkeypatch):
+    commits = []
+    real_add_many = JsonCatalog.add_many
+    monkeypatch.setattr(
+        JsonCatalog,
+        "add_many",
+        lambda self, entries: commits.append(len(entries)) or real_add_many(self, entries),
+    )
+
+    results = save_many(
+        items=[
+            {"data": csv_folder / "a.csv", "name": "a", "message": "", "tag": "raw"},
+            {"data": csv_folder / "b.csv", "name": "b", "message": "", "tag": "raw"},
+            {"data": csv_folder / "a_copy.csv", "name": "a_copy", "message": "", "tag": "raw"},
+        ],
+        max_workers=2,
+    )
+
+    assert [r["status"] for r in results] == ["saved", "saved", "duplicate"]
+    assert commits == [2]
+
+    metadata = load_metadata(csv_folder.parent / ".datashelf")
+    assert [f["name"] for f in metadata["files"]] == ["a", "b"]
+
+
+def test_save_many_reports_existing_and_invalid_items(csv_folder):
+    save_many(items=[{"data": csv_folder / "a.csv", "name": "a", "message": "", "tag": "raw"}])
+
+    results = save_many(
+        items=[
+            {"data": csv_folder / "a.csv", "name": "a", "message": "", "tag": "raw"},
+            {"data": csv_folder / "a_copy.csv", "name": "a2", "message": "", "tag": "processed"},
+            {"data": csv_folder / "b.csv", "name": "b", "message": "", "tag": "not_a_tag"},
+        ]
+    )
+
+    assert [r["status"] for r in results] == ["exists", "tag_conflict", "error"]
+
+
+def test_cli_save_manifest(csv_folder, monkeypatch):
+    manifest = csv_folder / "manifest.yaml"
+    manifest.write_text(
+        "tag: raw\n"
+        "datasets:\n"
+        "  - path: a.csv\n"
+        "    name: a\n"
+        "  - path: b.csv\n"
+        "    name: b\n"
+        "    message: second file\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(sys, "argv", ["datashelf", "save", "--manifest", str(manifest)])
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+
+    metadata = load_metadata(csv_folder.parent / ".datashelf")
+    assert exit_info.value.code == 0
+    assert {f["name"]: f["message"] for f in metadata["files"]} == {"a": "", "b": "second file"}
+
+
+def test_cli_save_glob_names_files_after_stems(csv_folder, monkeypatch):
+    monkeypatch.setattr(
+        sys, "argv", ["datashelf", "save", str(csv_folder / "*.csv"), "raw_", "--tag", "raw"]
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+
+    metadata = load_metadata(csv_folder.parent / ".datashelf")
+    assert exit_info.value.code == 0
+    assert sorted(f["name"] for f in metadata["files"]) == ["raw_a", "raw_b"]
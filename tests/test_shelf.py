@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+import yaml
+
+import datashelf
+from datashelf.core import config as config_module
+from datashelf.core.catalog import JsonCatalog
+from datashelf.core.metadata import compact_metadata
+from datashelf.shelf import Shelf, _default_shelf
+
+
+def test_open_accepts_project_or_datashelf_directory(initialized_repo):
+    datashelf_path = (initialized_repo / ".datashelf").resolve()
+
+    assert datashelf.open(initialized_repo).path == datashelf_path
+    assert datashelf.open(datashelf_path).path == datashelf_path
+    assert datashelf.open().path == datashelf_path
+
+
+def test_open_raises_for_missing_repository(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        datashelf.open(tmp_path)
+
+
+def test_datashelf_path_environment_variable(
+    initialized_repo, tmp_path_factory, monkeypatch
+):
+    elsewhere = tmp_path_factory.mktemp("elsewhere")
+    monkeypatch.chdir(elsewhere)
+    monkeypatch.setenv("DATASHELF_PATH", str(initialized_repo))
+
+    assert datashelf.open().path == (initialized_repo / ".datashelf").resolve()
+
+    datashelf.save(pd.DataFrame({"a": [1]}), name="from_env", message="", tag="raw")
+    assert datashelf.load("from_env").exists()
+
+
+def test_shelf_methods_mirror_module_functions(initialized_repo, sample_csv, capsys):
+    shelf = datashelf.open()
+
+    shelf.save(sample_csv, name="people", message="tiny", tag="raw")
+    df = shelf.load("people", to_df=True)
+    shelf.ls()
+
+    assert list(df["name"]) == ["Alice", "Bob"]
+    assert "people" in capsys.readouterr().out
+
+
+def test_module_functions_reuse_one_shelf(initialized_repo):
+    assert _default_shelf() is _default_shelf()
+
+
+def test_config_is_parsed_once_until_it_changes(initialized_repo, monkeypatch):
+    datashelf_path = initialized_repo / ".datashelf"
+    calls = []
+    real_safe_load = yaml.safe_load
+
+    def counting_safe_load(stream):
+        calls.append(1)
+        return real_safe_load(stream)
+
+    monkeypatch.setattr(yaml, "safe_load", counting_safe_load)
+    config_module._CONFIG_CACHE.clear()
+
+    for _ in range(5):
+        config_module.get_parquet_engine(datashelf_path=datashelf_path)
+    assert len(calls) == 1
+
+    config_path = datashelf_path / "config.yaml"
+    config_path.write_text(config_path.read_text().replace("fastparquet", "pyarrow"))
+
+    assert config_module.get_parquet_engine(datashelf_path=datashelf_path) == "pyarrow"
+    assert len(calls) == 2
+
+
+def test_cached_config_cannot_be_changed_through_a_getter(initialized_repo, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, enforce_tags=True, allowed_tags=["raw"])
+
+    _, allowed_tags = config_module.get_config_tags_settings(datashelf_path=datashelf_path)
+    allowed_tags.append("clean")
+
+    assert config_module.get_config_tags_settings(datashelf_path=datashelf_path) == (
+        True,
+        ["raw"],
+    )
+
+
+def test_cached_catalog_sees_commits_from_other_handles(initialized_repo):
+    reader = datashelf.open()
+    writer = Shelf(reader.path)
+
+    assert reader.catalog.entries() == []
+
+    writer.save(pd.DataFrame({"a": [1, 2]}), name="first", message="", tag="raw")
+    assert [e["name"] for e in reader.catalog.entries()] == ["first"]
+    assert isinstance(reader.catalog, JsonCatalog)
+
+    # Snapshot rewrites (compaction) are picked up too
+    compact_metadata(reader.path)
+    writer.save(pd.DataFrame({"a": [3]}), name="second", message="", tag="raw")
+    assert [e["name"] for e in reader.catalog.entries()] == ["first", "second"]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from datashelf import load, save
+from datashelf.core import streaming
+from datashelf.core.hashing import sha256_hex
+from datashelf.core.streaming import stream_csv_to_parquet
+
+
+@pytest.fixture
+def mixed_csv(tmp_path):
+    # `score` only gains a missing value and `code` only turns non-numeric late in
+    # the file, so small chunks infer different dtypes than the file as a whole
+    lines = ["id,score,code,label"]
+    for i in range(50):
+        score = "" if i == 41 else str(i)
+        code = "x9" if i == 45 else str(i)
+        lines.append(f"{i},{score},{code},row{i}")
+
+    csv_path = tmp_path / "mixed.csv"
+    csv_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return csv_path
+
+
+@pytest.mark.parametrize("engine", ["fastparquet", "pyarrow"])
+def test_streamed_artifact_hash_is_independent_of_chunk_size(
+    mixed_csv, tmp_path, monkeypatch, engine
+):
+    hashes = set()
+    for chunk_rows in [3, 7, 1000]:
+        monkeypatch.setattr(streaming, "_estimate_chunk_rows", lambda **_: chunk_rows)
+        output_path = tmp_path / f"out_{chunk_rows}.parquet"
+
+        stream_csv_to_parquet(
+            data_path=mixed_csv,
+            output_path=output_path,
+            engine=engine,
+            memory_budget_mb=1,
+            row_group_size=10,
+        )
+        hashes.add(sha256_hex(data_path=output_path))
+
+    assert len(hashes) == 1
+
+
+@pytest.mark.parametrize("engine", ["fastparquet", "pyarrow"])
+def test_streamed_artifact_matches_full_read(mixed_csv, tmp_path, monkeypatch, engine):
+    monkeypatch.setattr(streaming, "_estimate_chunk_rows", lambda **_: 4)
+    output_path = tmp_path / "out.parquet"
+
+    stream_csv_to_parquet(
+        data_path=mixed_csv,
+        output_path=output_path,
+        engine=engine,
+        memory_budget_mb=1,
+        row_group_size=10,
+    )
+
+    streamed = pd.read_parquet(output_path, engine=engine)
+    expected = pd.read_csv(mixed_csv)
+
+    assert str(streamed["score"].dtype) == "float64"
+    assert not pd.api.types.is_numeric_dtype(streamed["code"])
+    assert streamed["id"].tolist() == expected["id"].tolist()
+    assert streamed["code"].tolist() == expected["code"].tolist()
+    assert streamed["score"].isna().sum() == 1
+
+
+def test_save_with_stream_registers_artifact(initialized_repo, mixed_csv):
+    save(data=mixed_csv, name="mixed", message="streamed", tag="raw", stream=True)
+
+    df = load("mixed", to_df=True)
+
+    assert len(df) == 50
+    assert list(df.columns) == ["id", "score", "code", "label"]
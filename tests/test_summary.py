@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import datashelf
+from datashelf import backfill_summaries, gc, save, schema, show
+from datashelf.core import chunkstore
+from datashelf.core.chunkstore import open_chunked, read_manifest, read_range
+from datashelf.core.metadata import load_metadata
+from datashelf.core.summary import SUMMARIES_DIR, read_summary, summary_key
+
+
+@pytest.mark.parametrize("engine", ["fastparquet", "pyarrow"])
+def test_save_records_summary(initialized_repo, engine, make_frame, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, parquet_engine=engine)
+    df = make_frame()
+    df["when"] = pd.date_range("2024-01-01", periods=len(df), freq="h")
+    df.loc[5, "v"] = np.nan
+    save(df, name="d", message="", tag="raw", write_options={"row_group_rows": 300})
+
+    (entry,) = load_metadata(datashelf_path)["files"]
+    summary = read_summary(datashelf_path=datashelf_path, file_hash=entry["file_hash"])
+
+    assert summary["rows"] == 1_000 and summary["row_groups"] == 4
+    assert summary["bytes"] == (datashelf_path / entry["stored_path"]).stat().st_size
+    columns = {c["name"]: c for c in summary["columns"]}
+    assert list(columns) == ["id", "v", "when"]
+    assert columns["id"]["dtype"] == "int64" and columns["v"]["dtype"] == "float64"
+    assert (columns["id"]["min"], columns["id"]["max"]) == (0, 999)
+    assert columns["v"]["null_count"] == 1
+    assert columns["when"]["min"] == "2024-01-01T00:00:00"
+
+
+def test_schema_backfills_missing_summaries_and_show_does_not(
+    initialized_repo, capsys, make_frame
+):
+    datashelf_path = initialized_repo / ".datashelf"
+    save(make_frame(seed=1), name="a", message="", tag="raw")
+    save(make_frame(seed=2), name="b", message="", tag="raw")
+    # As if saved before summaries were recorded
+    shutil.rmtree(datashelf_path / SUMMARIES_DIR)
+
+    show("a")
+    assert "Rows       n/a" in capsys.readouterr().out
+    assert not (datashelf_path / SUMMARIES_DIR).exists()
+
+    assert schema("a")["rows"] == 1_000
+    show("a")
+    assert "Rows       1,000" in capsys.readouterr().out
+    assert backfill_summaries() == 1
+    assert backfill_summaries() == 0
+    assert len(list((datashelf_path / SUMMARIES_DIR).rglob("*.json"))) == 2
+
+
+def test_chunked_summary_reads_only_the_last_chunks(
+    initialized_repo, monkeypatch, make_frame, set_config
+):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, chunked_storage=True, chunk_avg_kb=4)
+    save(make_frame(rows=20_000), name="chunked", message="", tag="raw")
+    (entry,) = load_metadata(datashelf_path)["files"]
+    manifest = read_manifest(datashelf_path=datashelf_path, file_entry=entry)
+    expected = read_summary(datashelf_path=datashelf_path, file_hash=entry["file_hash"])
+    (datashelf_path / summary_key(entry["file_hash"])).unlink()
+
+    opened = []
+    chunk_path = chunkstore._chunk_path
+
+    def tracking_chunk_path(datashelf_path, chunk_hash):
+        opened.append(chunk_hash)
+        return chunk_path(datashelf_path=datashelf_path, chunk_hash=chunk_hash)
+
+    monkeypatch.setattr(chunkstore, "_chunk_path", tracking_chunk_path)
+    assert schema("chunked") == expected
+    assert 0 < len(set(opened)) < len(manifest["chunks"]) // 2
+
+
+def test_read_range_of_chunked_artifact(initialized_repo, make_frame, set_config):
+    datashelf_path = initialized_repo / ".datashelf"
+    set_config(datashelf_path, chunked_storage=True, chunk_avg_kb=4)
+    save(make_frame(rows=20_000), name="chunked", message="", tag="raw")
+    (entry,) = load_metadata(datashelf_path)["files"]
+    manifest = read_manifest(datashelf_path=datashelf_path, file_entry=entry)
+    data = open_chunked(datashelf_path=datashelf_path, manifest=manifest).getvalue()
+
+    for offset, length in [(0, 10), (4000, 20_000), (len(data) - 100, 100), (7, 0)]:
+        assert read_range(datashelf_path, manifest, offset, length) == data[
+            offset : offset + length
+        ]
+
+
+def test_gc_removes_summaries_of_deleted_datasets(initialized_repo, make_frame):
+    datashelf_path = initialized_repo / ".datashelf"
+    save(make_frame(), name="kept", message="", tag="raw")
+    orphan = datashelf_path / summary_key("f" * 64)
+    orphan.parent.mkdir()
+    orphan.write_text("{}")
+    past = orphan.stat().st_mtime - 7200
+    os.utime(orphan, (past, past))
+
+    removed = gc()["removed"]
+
+    assert removed == [orphan.relative_to(datashelf_path).as_posix()]
+
+
+def test_cli_schema(initialized_repo, sample_csv):
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(datashelf.__file__))}
+    save(sample_csv, name="people", message="", tag="raw")
+
+    result = subprocess.run(
+        [sys.executable, "-m", "datashelf.cli", "schema", "people"],
+        cwd=initialized_repo,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0
+    assert "people" in result.stdout and "2 rows, 2 columns" in result.stdout
+    assert "int64" in result.stdout
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import datashelf
+from datashelf import load, save
+from datashelf.core import streaming
+from datashelf.core.hashing import sha256_hex
+from datashelf.core.metadata import load_metadata
+from datashelf.core.streaming import stream_xlsx_to_parquet
+
+
+@pytest.fixture
+def workbook(tmp_path) -> Path:
+    # `score` only gains a missing value, `code` only turns non-numeric and `flag` only
+    # has a gap late in the sheet, so small chunks infer different dtypes than the sheet
+    book = openpyxl.Workbook()
+    sheet = book.active
+    sheet.title = "Sales"
+    sheet.append(["id", "score", "code", "when", "flag", "id"])
+    for i in range(50):
+        sheet.append(
+            [
+                i,
+                None if i == 41 else i,
+                "x9" if i == 45 else i,
+                datetime(2024, 1, 1 + i % 28),
+                None if i == 47 else i % 2 == 0,
+                i * 10,
+            ]
+        )
+        if i == 20:
+            sheet.append([])
+    # A value past the header
+    sheet.append([50, 50, 50, datetime(2024, 2, 1), True, 500, "note"])
+
+    book.create_sheet("Costs").append(["item", "cost"])
+    for i in range(5):
+        book["Costs"].append([f"item{i}", i * 1.5])
+    book.create_sheet("Empty")
+
+    path = tmp_path / "book.xlsx"
+    book.save(path)
+    return path
+
+
+@pytest.mark.parametrize("engine", ["fastparquet", "pyarrow"])
+def test_streamed_xlsx_hash_is_independent_of_chunk_size(
+    workbook, tmp_path, monkeypatch, engine
+):
+    hashes = set()
+    for chunk_rows in [3, 7, 1000]:
+        monkeypatch.setattr(streaming, "_chunk_rows", lambda **_: chunk_rows)
+        output_path = tmp_path / f"out_{chunk_rows}.parquet"
+
+        stream_xlsx_to_parquet(
+            data_path=workbook,
+            output_path=output_path,
+            engine=engine,
+            memory_budget_mb=1,
+            row_group_size=10,
+        )
+        hashes.add(sha256_hex(data_path=output_path))
+
+    assert len(hashes) == 1
+    assert list(tmp_path.glob("*.rows")) == []
+
+
+def test_streamed_xlsx_infers_one_schema_for_the_sheet(workbook, tmp_path, monkeypatch):
+    monkeypatch.setattr(streaming, "_chunk_rows", lambda **_: 4)
+    output_path = tmp_path / "out.parquet"
+
+    stream_xlsx_to_parquet(
+        data_path=workbook,
+        output_path=output_path,
+        engine="pyarrow",
+        memory_budget_mb=1,
+        row_group_size=10,
+    )
+    df = pd.read_parquet(output_path)
+
+    assert list(df.columns) == ["id", "score", "code", "when", "flag", "id.1", "Unnamed: 6"]
+    assert len(df) == 51
+    assert str(df["id"].dtype) == "int64" and str(df["score"].dtype) == "float64"
+    assert not pd.api.types.is_numeric_dtype(df["code"]) and df["code"][45] == "x9"
+    assert pd.api.types.is_datetime64_any_dtype(df["when"])
+    # As pd.read_excel infers it
+    assert str(df["flag"].dtype) == "float64" and df["flag"].isna().sum() == 1
+    assert df["flag"][:3].tolist() == [1.0, 0.0, 1.0]
+    assert df["Unnamed: 6"].tolist()[-1] == "note"
+
+
+def test_save_xlsx_streams_first_sheet(initialized_repo, workbook):
+    save(workbook, name="sales", message="", tag="raw", write_options={"row_group_rows": 10})
+
+    df = load("sales", to_df=True)
+    expected = pd.read_excel(workbook).dropna(how="all").reset_index(drop=True)
+
+    assert df["id"].tolist() == expected["id"].tolist()
+    assert datashelf.schema("sales")["row_groups"] == 6
+
+
+def test_save_xlsx_sorted_reads_whole_sheet(initialized_repo, workbook):
+    save(workbook, name="sorted", message="", tag="raw", write_options={"sort_by": ["id.1"]})
+
+    df = load("sorted", to_df=True)
+
+    assert df["id.1"].is_monotonic_increasing and len(df) == 51
+
+
+def test_save_sheets_saves_each_sheet_as_a_dataset(initialized_repo, workbook):
+    results = save(workbook, name="book", message="", tag="raw", sheets="all")
+
+    assert [(r["name"], r["status"]) for r in results] == [
+        ("book_Sales", "saved"),
+        ("book_Costs", "saved"),
+        ("book_Empty", "saved"),
+    ]
+    assert load("book_Costs", to_df=True)["cost"].tolist() == [0, 1.5, 3, 4.5, 6]
+    assert load("book_Empty", to_df=True).empty
+
+    # Each sheet is fingerprinted on its own, so they are not mistaken for one another
+    again = save(workbook, name="book", message="", tag="raw", sheets=["Costs", "Sales"])
+    assert [r["status"] for r in again] == ["exists", "exists"]
+    assert again[0]["file_hash"] == results[1]["file_hash"]
+    assert len(load_metadata(initialized_repo / ".datashelf")["files"]) == 3
+
+
+def test_save_sheets_rejects_unknown_sheets_and_other_files(
+    initialized_repo, workbook, sample_csv
+):
+    with pytest.raises(ValueError, match="Sheet\\(s\\) not found.*Missing"):
+        save(workbook, name="book", message="", tag="raw", sheets=["Sales", "Missing"])
+
+    with pytest.raises(ValueError, match="only be selected when saving an .xlsx file"):
+        save(sample_csv, name="people", message="", tag="raw", sheets="all")
+
+
+def test_cli_save_sheets(initialized_repo, workbook):
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(datashelf.__file__))}
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "datashelf.cli",
+            "save",
+            str(workbook),
+            "book",
+            "--tag",
+            "raw",
+            "--sheets",
+            "Sales",
+            "Costs",
+        ],
+        cwd=initialized_repo,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    names = {f["name"] for f in load_metadata(initialized_repo / ".datashelf")["files"]}
+    assert names == {"book_Sales", "book_Costs"}